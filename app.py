@@ -1,6 +1,9 @@
 from flask import Flask, render_template
 from flask_cors import CORS
 import logging
+import os
+import threading
+import time
 from pathlib import Path
 import sys
 
@@ -10,14 +13,17 @@ sys.path.insert(0, str(Path(__file__).parent))
 # Importar configuración
 from config import FLASK_CONFIG, LOGGING_CONFIG
 
-# Importar servicios primero
+# Importar servicios primero (el entrenador, pandas y sklearn solo se
+# importan si hay que entrenar)
 from services.sentiment_analyzer import sentiment_analyzer
-from services.model_trainer import train_model
+from services.model_reloader import model_reloader
+from database.db_manager import db_manager
 
 # Importar rutas después
 from routes.user_routes import user_bp
 from routes.comment_routes import comment_bp
 from routes.analysis_routes import analysis_bp
+from routes.model_routes import model_bp
 
 # Configurar logging
 logging.basicConfig(
@@ -31,6 +37,15 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Estado de carga del modelo, reportado por /health/ready:
+# 'pending', 'loading', 'ready' o 'failed'
+startup_state = {
+    'model': 'pending',
+    'error': None,
+    'started_at': time.monotonic(),
+    'ready_after': None
+}
+
 def create_app():
     """Factory para crear la aplicación Flask"""
     app = Flask(__name__)
@@ -43,6 +58,12 @@ def create_app():
     app.register_blueprint(user_bp)
     app.register_blueprint(comment_bp)
     app.register_blueprint(analysis_bp)
+    app.register_blueprint(model_bp)
+    
+    # Cada worker sigue la versión activa del registro de modelos
+    @app.before_request
+    def start_model_reloader():
+        model_reloader.ensure_started()
     
     # Ruta principal
     @app.route('/')
@@ -53,10 +74,40 @@ def create_app():
     @app.route('/health')
     def health():
         """Health check endpoint"""
+        database = db_manager.health_check()
+        
+        if not database['healthy'] or startup_state['model'] == 'failed':
+            status = 'unhealthy'
+        elif startup_state['model'] != 'ready':
+            status = 'starting'
+        else:
+            status = 'healthy'
+        
+        return {
+            'status': status,
+            'model_trained': sentiment_analyzer.is_trained,
+            'model_state': startup_state['model'],
+            'database': database
+        }, 503 if status == 'unhealthy' else 200
+    
+    @app.route('/health/live')
+    def liveness():
+        """Liveness: the process is up and serving requests"""
+        return {'status': 'alive'}, 200
+    
+    @app.route('/health/ready')
+    def readiness():
+        """Readiness: the model is loaded and the database answers"""
+        database = db_manager.health_check()
+        ready = startup_state['model'] == 'ready' and database['healthy']
+        
         return {
-            'status': 'healthy',
-            'model_trained': sentiment_analyzer.is_trained
-        }
+            'ready': ready,
+            'model_state': startup_state['model'],
+            'model_error': startup_state['error'],
+            'ready_after_seconds': startup_state['ready_after'],
+            'database': database['healthy']
+        }, 200 if ready else 503
     
     return app
 
@@ -66,19 +117,50 @@ def initialize_system():
     logger.info("🚀 INICIANDO SISTEMA DE ANÁLISIS DE SENTIMIENTOS")
     logger.info("="*60)
     
+    startup_state['model'] = 'loading'
+    
     # Cargar o entrenar modelo
     logger.info("\n📊 Inicializando modelo de IA...")
-    if not sentiment_analyzer.load_model():
-        logger.info("No se encontró modelo entrenado, entrenando nuevo modelo...")
-        metrics = train_model()
-        logger.info(f"✓ Modelo entrenado con {metrics['test_accuracy']:.2%} de precisión")
-    else:
-        logger.info("✓ Modelo cargado exitosamente")
+    try:
+        if not sentiment_analyzer.load_model():
+            from services.training_jobs import training_jobs
+            
+            logger.info("No se encontró modelo entrenado, entrenando nuevo modelo...")
+            job = training_jobs.wait(training_jobs.submit()['id'])
+            if job['status'] != 'succeeded':
+                raise RuntimeError(f"Training failed: {job['error']}")
+            logger.info(f"✓ Modelo entrenado con {job['metrics']['test_accuracy']:.2%} de precisión")
+        else:
+            logger.info("✓ Modelo cargado exitosamente")
+    except Exception as e:
+        startup_state['model'] = 'failed'
+        startup_state['error'] = str(e)
+        raise
+    
+    startup_state['model'] = 'ready'
+    startup_state['ready_after'] = round(time.monotonic() - startup_state['started_at'], 3)
+    logger.info(f"Modelo listo en {startup_state['ready_after']}s")
     
     logger.info("\n" + "="*60)
     logger.info("✅ SISTEMA LISTO")
     logger.info("="*60)
 
+def initialize_in_background():
+    """
+    Inicializa el sistema en un hilo para que el servidor acepte
+    conexiones de inmediato; /health/ready responde 503 hasta que el
+    modelo está cargado
+    """
+    def run():
+        try:
+            initialize_system()
+        except Exception as e:
+            logger.error(f"❌ Error al inicializar el modelo: {e}")
+    
+    thread = threading.Thread(target=run, name='model-loader', daemon=True)
+    thread.start()
+    return thread
+
 def run_tests():
     """Ejecuta pruebas del sistema"""
     from tests.test_users import test_user_operations
@@ -101,8 +183,10 @@ def run_tests():
         logger.error(f"❌ Error en pruebas: {e}")
 
 if __name__ == '__main__':
-    # Inicializar sistema
-    initialize_system()
+    # Inicializar sistema en segundo plano, solo en el proceso que sirve
+    # (con debug, el proceso del reloader no carga el modelo)
+    if not FLASK_CONFIG['DEBUG'] or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        initialize_in_background()
     
     # Ejecutar pruebas (opcional, comentar si no se desea)
     # run_tests()
@@ -0,0 +1,81 @@
+"""Cold start: import time of the app and time until /health/live and /health/ready answer"""
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules app.py used to import eagerly
+EAGER_IMPORTS = 'import nltk, pandas, sklearn.model_selection, sklearn.metrics, scipy.optimize'
+
+def import_seconds(code, repeat=3):
+    """Best wall time of running code in a fresh interpreter"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def status(url):
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+def server_start_seconds(timeout=300):
+    """Seconds from launching app.py until it is live, then ready"""
+    port = free_port()
+    env = dict(os.environ, FLASK_DEBUG='False', FLASK_HOST='127.0.0.1', FLASK_PORT=str(port))
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, 'app.py'], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    live = ready = None
+    try:
+        while time.perf_counter() - start < timeout and ready is None:
+            elapsed = time.perf_counter() - start
+            if live is None and status(f'http://127.0.0.1:{port}/health/live') == 200:
+                live = elapsed
+            if live is not None and status(f'http://127.0.0.1:{port}/health/ready') == 200:
+                ready = elapsed
+            time.sleep(0.02)
+    finally:
+        process.terminate()
+        process.wait()
+    return live, ready
+
+def main():
+    baseline = import_seconds('pass')
+    app_import = import_seconds('import app')
+    eager = import_seconds(EAGER_IMPORTS)
+    live, ready = server_start_seconds()
+    
+    print("\n" + "="*70)
+    print(" "*24 + "COLD START BENCHMARK")
+    print("="*70)
+    print(f"{'Interpreter startup':<40} {baseline:>8.3f}s")
+    print(f"{'import app':<40} {app_import:>8.3f}s")
+    print(f"{'nltk + pandas + sklearn + scipy imports':<40} {eager:>8.3f}s  (no longer paid by import app)")
+    print("-"*70)
+    print(f"{'python app.py -> /health/live 200':<40} {live:>8.3f}s")
+    print(f"{'python app.py -> /health/ready 200':<40} {ready:>8.3f}s")
+    print("="*70 + "\n")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Latency of CommentController.create_comment: three round trips against one RETURNING statement"""
+import contextlib
+import io
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import controllers.comment_controller as comment_controller
+import models.comment as comment_model
+import models.user as user_model
+from controllers.comment_controller import CommentController
+from database.db_manager import DatabaseManager
+from models.comment import Comment
+from models.user import User
+from services.sentiment_analyzer import SentimentAnalyzer
+from services.model_trainer import ModelTrainer
+
+def legacy_create(user_id, text, sentiment=None, confidence=None):
+    """Previous Comment.create: check user, INSERT, then read the row back"""
+    if not text or len(text.strip()) < 3:
+        raise ValueError("The text must have at least 3 characters.")
+    
+    if not User.get_by_id(user_id):
+        raise ValueError("User not found")
+    
+    comment_id = comment_model.db_manager.execute_insert(
+        'INSERT INTO comments (user_id, _text, sentiment, confidence) VALUES (?, ?, ?, ?)',
+        (user_id, text, sentiment, confidence)
+    )
+    return Comment.get_by_id(comment_id)
+
+def measure(user_id, texts):
+    """Per-call latencies of create_comment in microseconds"""
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        result = CommentController.create_comment(user_id, text)
+        latencies.append((time.perf_counter() - start) * 1e6)
+        assert result['success'], result
+    return latencies
+
+def summary(latencies):
+    """Mean, median and 95th percentile"""
+    ordered = sorted(latencies)
+    return (
+        statistics.mean(ordered),
+        ordered[len(ordered) // 2],
+        ordered[int(len(ordered) * 0.95)]
+    )
+
+def main(n_comments=2000):
+    logging.disable(logging.CRITICAL)
+    
+    analyzer = SentimentAnalyzer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ModelTrainer(analyzer).train(dataset_path='missing_dataset.csv', save_model=False)
+    comment_controller.sentiment_analyzer = analyzer
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = DatabaseManager(Path(tmp_dir) / 'bench.db')
+        comment_model.db_manager = manager
+        user_model.db_manager = manager
+        
+        user = User.create("Bench User", "bench@test.com")
+        texts = [f"Comment {i}: great product, would buy again" for i in range(n_comments)]
+        # Warm up the result cache so only the database path is compared
+        measure(user.id, texts[:10])
+        
+        current_create = Comment.create
+        Comment.create = staticmethod(legacy_create)
+        before = summary(measure(user.id, texts))
+        Comment.create = staticmethod(current_create)
+        after = summary(measure(user.id, texts))
+        
+        manager.close()
+    
+    print("\n" + "="*70)
+    print(" "*18 + "CREATE COMMENT BENCHMARK")
+    print("="*70)
+    print(f"{'':<32} {'mean':>10} {'p50':>10} {'p95':>10}")
+    for name, values in (('Before (3 round trips)', before), ('After (INSERT ... RETURNING)', after)):
+        print(f"{name:<32} " + ' '.join(f"{value:>8.1f}us" for value in values))
+    print("-"*70)
+    print(f"{'Mean speedup':<32} {before[0] / after[0]:>10.2f}x")
+    print("="*70 + "\n")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Dataset load time: the previous read_csv against the pruned parse and the columnar copy"""
+import csv
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+from services import dataset_loader
+
+WORDS = "great terrible service product love hate slow fast price quality support delivery".split()
+LABELS = ['Positive', 'Negative', 'Neutral', 'Irrelevant']
+ENTITIES = ['Amazon', 'Google', 'Nvidia', 'Xbox', 'Borderlands', 'Facebook']
+
+def write_dataset(path, n_rows, seed=3):
+    """Kaggle-like CSV: id, entity, sentiment, tweet without a header"""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for i in range(n_rows):
+            tweet = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 40)))
+            writer.writerow((i, rng.choice(ENTITIES), rng.choice(LABELS), tweet if i % 100 else ''))
+
+def legacy_load(path):
+    df = pd.read_csv(path, names=["id", "entity", "sentiment", "tweet"])
+    df = df.dropna(subset=['tweet'])
+    return df[df['sentiment'].str.lower() != 'irrelevant']
+
+def best_of(function, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(n_rows=500000):
+    logging.disable(logging.CRITICAL)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / 'twitter_dataset.csv'
+        write_dataset(path, n_rows)
+        
+        legacy = best_of(lambda: legacy_load(path))
+        pruned = best_of(lambda: dataset_loader.read_csv(path))
+        chunked = best_of(lambda: dataset_loader.read_csv(path, chunk_rows=100000))
+        dataset_loader.load_dataset(path)
+        columnar = best_of(lambda: dataset_loader.load_dataset(path))
+        
+        legacy_memory = legacy_load(path).memory_usage(deep=True).sum()
+        memory = dataset_loader.load_dataset(path).memory_usage(deep=True).sum()
+    
+    print("\n" + "="*70)
+    print(" "*22 + "DATASET LOADING BENCHMARK")
+    print("="*70)
+    print(f"{n_rows} rows")
+    print(f"{'Previous read_csv + filters':<32} {legacy:>10.3f} s")
+    print(f"{'Pruned columns, categorical':<32} {pruned:>10.3f} s")
+    print(f"{'Pruned, chunks of 100000 rows':<32} {chunked:>10.3f} s")
+    print(f"{'Columnar copy':<32} {columnar:>10.3f} s")
+    print("-"*70)
+    print(f"{'Speedup (columnar copy)':<32} {legacy / columnar:>10.2f}x")
+    print(f"{'Memory':<32} {legacy_memory / 2**20:>7.1f} MB -> {memory / 2**20:.1f} MB")
+    print("="*70 + "\n")
+
+if __name__ == '__main__':
+    main()
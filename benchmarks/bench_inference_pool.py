@@ -0,0 +1,63 @@
+"""Batch analysis throughput: in-process analyze_batch against the inference process pool"""
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.inference_pool import InferencePool
+from services.sentiment_analyzer import SentimentAnalyzer
+from services.model_trainer import ModelTrainer
+
+WORDS = "great terrible service product love hate slow fast price quality support delivery".split()
+
+def make_texts(n):
+    """Distinct texts so the result cache never answers"""
+    return [
+        ' '.join(WORDS[(i * k) % 12] for k in range(1, 25)) + f" review number {i}"
+        for i in range(n)
+    ]
+
+def timed(analyze_batch, texts, batch_size):
+    """Texts per second over batches of batch_size"""
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        analyze_batch(texts[i:i + batch_size])
+    return len(texts) / (time.perf_counter() - start)
+
+def main(n_texts=20000, batch_size=1000):
+    logging.disable(logging.CRITICAL)
+    workers = os.cpu_count() or 1
+    
+    analyzer = SentimentAnalyzer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ModelTrainer(analyzer).train(dataset_path='missing_dataset.csv', save_model=False)
+    analyzer.result_cache = None
+    analyzer.shared_cache = None
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pool = InferencePool(analyzer, workers, artifact_dir=tmp_dir)
+        # Start the workers outside the measurement
+        pool.analyze_batch(make_texts(workers * 16))
+        
+        in_process = timed(analyzer.analyze_batch, make_texts(n_texts), batch_size)
+        pooled = timed(pool.analyze_batch, make_texts(n_texts), batch_size)
+        pool.shutdown()
+    
+    print("\n" + "="*70)
+    print(" "*20 + "INFERENCE POOL BENCHMARK")
+    print("="*70)
+    print(f"{n_texts} texts in batches of {batch_size}, {workers} workers")
+    print(f"{'In-process analyze_batch':<32} {in_process:>10.0f} texts/s")
+    print(f"{'Process pool':<32} {pooled:>10.0f} texts/s")
+    print("-"*70)
+    print(f"{'Speedup':<32} {pooled / in_process:>10.2f}x")
+    print("="*70 + "\n")
+
+if __name__ == '__main__':
+    main()
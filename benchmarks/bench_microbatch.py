@@ -0,0 +1,77 @@
+"""Throughput of concurrent /api/analyze calls: one analyze() per request against micro-batching"""
+import contextlib
+import io
+import logging
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.inference_scheduler import InferenceScheduler
+from services.sentiment_analyzer import SentimentAnalyzer
+from services.model_trainer import ModelTrainer
+
+WORDS = "great terrible service product love hate slow fast price quality support delivery".split()
+
+def make_texts(n):
+    """Distinct texts so the result cache never answers"""
+    return [f"{WORDS[i % 12]} {WORDS[(i * 7) % 12]} {WORDS[(i * 5) % 12]} review number {i}" for i in range(n)]
+
+def run(analyze, texts, n_threads):
+    """Requests per second and per-request latencies in milliseconds"""
+    chunks = [texts[i::n_threads] for i in range(n_threads)]
+    latencies = [[] for _ in range(n_threads)]
+    barrier = threading.Barrier(n_threads + 1)
+    
+    def worker(i):
+        barrier.wait()
+        for text in chunks[i]:
+            start = time.perf_counter()
+            analyze(text)
+            latencies[i].append((time.perf_counter() - start) * 1000)
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    flat = sorted(value for values in latencies for value in values)
+    return len(texts) / elapsed, statistics.mean(flat), flat[int(len(flat) * 0.95)]
+
+def main(n_requests=4000, n_threads=32):
+    logging.disable(logging.CRITICAL)
+    
+    analyzer = SentimentAnalyzer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ModelTrainer(analyzer).train(dataset_path='missing_dataset.csv', save_model=False)
+    analyzer.result_cache = None
+    analyzer.shared_cache = None
+    
+    scheduler = InferenceScheduler(analyzer, max_batch_size=64, max_wait_ms=2)
+    
+    direct = run(analyzer.analyze, make_texts(n_requests), n_threads)
+    batched = run(scheduler.analyze, make_texts(n_requests), n_threads)
+    stats = scheduler.stats()
+    
+    print("\n" + "="*70)
+    print(" "*20 + "MICRO-BATCHING BENCHMARK")
+    print("="*70)
+    print(f"{n_requests} requests from {n_threads} threads")
+    print(f"{'':<28} {'req/s':>10} {'mean':>10} {'p95':>10}")
+    for name, (throughput, mean, p95) in (('Direct analyze()', direct), ('Micro-batched', batched)):
+        print(f"{name:<28} {throughput:>10.0f} {mean:>8.2f}ms {p95:>8.2f}ms")
+    print("-"*70)
+    print(f"{'Throughput speedup':<28} {batched[0] / direct[0]:>10.2f}x")
+    print(f"{'Mean batch size':<28} {stats['mean_batch_size']:>10}")
+    print(f"{'Queueing delay p95':<28} {stats['queue_delay_ms']['p95']:>8.2f}ms")
+    print("="*70 + "\n")
+
+if __name__ == '__main__':
+    main()
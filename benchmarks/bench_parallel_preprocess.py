@@ -0,0 +1,58 @@
+"""Training preprocessing time: serial preprocess() against the chunked process-parallel stage"""
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.text_processor import text_processor
+
+WORDS = (
+    "great terrible service product love hate slow fast price quality support delivery "
+    "running amazing disappointed recommended waited broken happily"
+).split()
+
+def make_tweets(n, seed=7):
+    """Tweet-like texts with tags, URLs and rare words that miss the stem table"""
+    rng = random.Random(seed)
+    return [
+        ' '.join(rng.choice(WORDS) for _ in range(14))
+        + f" @user{i} #tag{i % 50} http://t.co/{i} unusualword{rng.randint(0, 20000)}ing"
+        for i in range(n)
+    ]
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main(n_texts=100000, chunk_size=2000):
+    logging.disable(logging.CRITICAL)
+    workers = os.cpu_count() or 1
+    tweets = make_tweets(n_texts)
+    text_processor.set_stem_table(text_processor.build_stem_table(tweets))
+    
+    # Starts the forkserver outside the measurement
+    text_processor.preprocess_parallel(tweets[:2 * chunk_size], workers=2, chunk_size=chunk_size)
+    
+    serial, serial_seconds = timed(lambda: [text_processor.preprocess(text) for text in tweets])
+    parallel, parallel_seconds = timed(
+        text_processor.preprocess_parallel, tweets, workers=workers, chunk_size=chunk_size
+    )
+    assert parallel == serial
+    
+    print("\n" + "="*70)
+    print(" "*18 + "PARALLEL PREPROCESSING BENCHMARK")
+    print("="*70)
+    print(f"{n_texts} texts in chunks of {chunk_size}, {workers} workers")
+    print(f"{'Serial preprocess()':<32} {serial_seconds:>10.2f} s")
+    print(f"{'preprocess_parallel()':<32} {parallel_seconds:>10.2f} s")
+    print("-"*70)
+    print(f"{'Speedup':<32} {serial_seconds / parallel_seconds:>10.2f}x")
+    print("="*70 + "\n")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Per-text cost of the fused tokenizer against the reference pipeline"""
+import contextlib
+import io
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.sentiment_analyzer import SentimentAnalyzer
+from services.model_trainer import ModelTrainer
+from utils.text_processor import text_processor
+
+WORDS = (
+    'love hate great awful product service game phone update today played '
+    'bought store amazing terrible release version company recommend'
+).split()
+
+def build_tweets(size, seed=7):
+    """Synthetic tweets with mentions, hashtags, URLs and punctuation"""
+    rng = random.Random(seed)
+    tweets = []
+    for _ in range(size):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+        tweets.append(
+            f"@user{rng.randint(0, 99)} " + ' '.join(words).capitalize()
+            + f"!! #{rng.choice(WORDS)} https://t.co/{rng.randint(0, 10**6)}"
+        )
+    return tweets
+
+def per_text_us(function, texts):
+    """Average microseconds per text"""
+    start = time.perf_counter()
+    for text in texts:
+        function(text)
+    return (time.perf_counter() - start) / len(texts) * 1e6
+
+def main():
+    logging.disable(logging.INFO)
+    
+    analyzer = SentimentAnalyzer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ModelTrainer(analyzer).train(dataset_path='missing_dataset.csv', save_model=False)
+    vectorizer = analyzer.vectorizer
+    compiled = analyzer.compiled
+    
+    tweets = build_tweets(5000)
+    
+    timings = {
+        'preprocess()': per_text_us(text_processor.preprocess, tweets),
+        'tokenize_fused()': per_text_us(text_processor.tokenize_fused, tweets),
+        'preprocess + vectorizer.transform': per_text_us(
+            lambda text: vectorizer.transform([text_processor.preprocess(text)]), tweets
+        ),
+        'tokenize_fused + transform_words': per_text_us(
+            lambda text: compiled.transform_words([text_processor.tokenize_fused(text)]), tweets
+        )
+    }
+    
+    print("\n" + "="*70)
+    print(" "*22 + "TOKENIZER BENCHMARK")
+    print("="*70)
+    for name, value in timings.items():
+        print(f"{name:<40} {value:>10.1f} us/text")
+    print("-"*70)
+    print(f"{'Preprocessing speedup':<40} {timings['preprocess()'] / timings['tokenize_fused()']:>10.2f}x")
+    print(f"{'Preprocessing + vectorizing speedup':<40} "
+          f"{timings['preprocess + vectorizer.transform'] / timings['tokenize_fused + transform_words']:>10.2f}x")
+    print("="*70 + "\n")
+
+if __name__ == '__main__':
+    main()
@@ -7,16 +7,108 @@ BASE_DIR = Path(__file__).resolve().parent
 # Database configuration
 DATABASE_CONFIG = {
     'name': 'sentiment_analysis.db',
-    'path': BASE_DIR / 'data' / 'sentiment_analysis.db'
+    'path': BASE_DIR / 'data' / 'sentiment_analysis.db',
+    # Persistent connections shared by the request threads
+    'pool_size': int(os.getenv('DB_POOL_SIZE', 8)),
+    # Seconds to wait for a free connection
+    'pool_timeout': 10.0,
+    # Idle seconds after which a connection is checked before reuse
+    'health_check_interval': 30.0,
+    # Applied to every new connection
+    'pragmas': {
+        'journal_mode': 'WAL',       # Readers do not block the writer
+        'synchronous': 'NORMAL',     # Safe with WAL, fsync only at checkpoints
+        'busy_timeout': 5000,        # Milliseconds to wait for a lock
+        'cache_size': -16000,        # Page cache in KiB (16 MB)
+        'mmap_size': 268435456,      # Memory-mapped reads (256 MB)
+        'foreign_keys': 'ON'
+    }
 }
 
 # SVM configuration
 MODEL_CONFIG = {
     'model_path': BASE_DIR / 'data' / 'sentiment_model.pkl',
     'vectorizer_path': BASE_DIR / 'data' / 'vectorizer.pkl',
+    # NumPy-only linear kernel exported at the end of training, an
+    # artifact directory memory-mapped by every worker process
+    'compiled_path': BASE_DIR / 'data' / 'sentiment_model',
+    # Versioned models, the ACTIVE one is served (the two paths above are
+    # only read when nothing was activated yet)
+    'registry_path': BASE_DIR / 'data' / 'models',
+    # Seconds between checks of the registry's ACTIVE version by each worker
+    'reload_interval': float(os.getenv('MODEL_RELOAD_INTERVAL', 2)),
+    # Inference path: 'compiled' (NumPy kernel) or 'sklearn'
+    'inference': os.getenv('MODEL_INFERENCE', 'compiled'),
     'max_features': 5000,
     'test_size': 0.2,
-    'random_state': 42
+    'random_state': 42,
+    # Training backend: 'svc' (libsvm), 'linear_svc' (liblinear) or 'sgd'
+    'backend': os.getenv('MODEL_BACKEND', 'svc'),
+    # Probabilities: 'native' (backend predict_proba), 'temperature' or 'sigmoid'
+    'calibration': os.getenv('MODEL_CALIBRATION', 'native'),
+    # Share of the training split held out to fit temperature/sigmoid
+    'calibration_size': 0.2
+}
+
+# Analysis result cache
+CACHE_CONFIG = {
+    'enabled': os.getenv('RESULT_CACHE', 'True') == 'True',
+    'maxsize': int(os.getenv('RESULT_CACHE_SIZE', 10000)),
+    # Seconds before an entry expires, None keeps entries until evicted
+    'ttl': float(os.getenv('RESULT_CACHE_TTL')) if os.getenv('RESULT_CACHE_TTL') else None,
+    # SQLite cache shared by every worker process and kept across restarts
+    'shared_enabled': os.getenv('SHARED_RESULT_CACHE', 'False') == 'True',
+    'shared_path': BASE_DIR / 'data' / 'analysis_cache.db',
+    'shared_maxsize': int(os.getenv('SHARED_RESULT_CACHE_SIZE', 200000))
+}
+
+# Background training jobs (POST /api/model/train)
+TRAINING_CONFIG = {
+    # One JSON status file per job, plus the job's model until it is activated
+    'jobs_dir': BASE_DIR / 'data' / 'training_jobs',
+    # Preprocessed texts and TF-IDF matrix of recent datasets, so a
+    # retrain on the same data goes straight to fitting
+    'feature_cache': os.getenv('TRAINING_FEATURE_CACHE', 'True') == 'True',
+    'feature_cache_dir': BASE_DIR / 'data' / 'feature_cache',
+    'feature_cache_size': int(os.getenv('TRAINING_FEATURE_CACHE_SIZE', 4)),
+    # Smaller datasets are rebuilt faster than they are read back
+    'feature_cache_min_rows': int(os.getenv('TRAINING_FEATURE_CACHE_MIN_ROWS', 1000))
+}
+
+# Micro-batching of single-text /api/analyze requests
+INFERENCE_CONFIG = {
+    'batching': os.getenv('INFERENCE_BATCHING', 'True') == 'True',
+    # A batch is flushed at this size...
+    'max_batch_size': int(os.getenv('INFERENCE_MAX_BATCH_SIZE', 64)),
+    # ...or this long after its first request
+    'max_wait_ms': float(os.getenv('INFERENCE_MAX_WAIT_MS', 2)),
+    # Worker processes scoring batches, 0 scores in the server process
+    'processes': int(os.getenv('INFERENCE_PROCESSES', 0))
+}
+
+# Shadow scoring of a candidate model on live traffic
+SHADOW_CONFIG = {
+    # Fraction of requests also scored by the shadow model, unless set
+    # when enabling it
+    'sample_rate': float(os.getenv('SHADOW_SAMPLE_RATE', 0.1)),
+    # Texts waiting for the shadow model, more are dropped
+    'queue_size': int(os.getenv('SHADOW_QUEUE_SIZE', 2048)),
+    # Texts scored per shadow batch
+    'max_batch_size': int(os.getenv('SHADOW_MAX_BATCH_SIZE', 256))
+}
+
+# Keyset pagination of the list endpoints
+PAGINATION_CONFIG = {
+    'default_limit': 50,
+    'max_limit': 500
+}
+
+# Sentiment trends endpoint
+TRENDS_CONFIG = {
+    # Buckets returned when from/to are missing
+    'default_buckets': 48,
+    # Largest time range per request, in buckets
+    'max_buckets': 5000
 }
 
 # Flask configuration
@@ -24,14 +116,26 @@ FLASK_CONFIG = {
     'DEBUG': os.getenv('FLASK_DEBUG', 'True') == 'True',
     'HOST': os.getenv('FLASK_HOST', '0.0.0.0'),
     'PORT': int(os.getenv('FLASK_PORT', 5000)),
-    'SECRET_KEY': os.getenv('SECRET_KEY', 'dev-secret')
+    'SECRET_KEY': os.getenv('SECRET_KEY', 'dev-secret'),
+    # Pre-fork server (python manage.py serve)
+    'WORKERS': int(os.getenv('FLASK_WORKERS', os.cpu_count() or 1)),
+    'GRACEFUL_TIMEOUT': float(os.getenv('FLASK_GRACEFUL_TIMEOUT', 30))
 }
 
 # NLP configuration
 NLP_CONFIG = {
     'language': 'english',
     'min_text_length': 3,
-    'max_text_length': 5000
+    'max_text_length': 5000,
+    # LRU memo of stems for words missing from the model's stem table
+    'stem_cache_size': 50000,
+    # Most frequent training words stored in the precomputed stem table
+    'stem_table_size': 100000,
+    # Processes preprocessing large text collections (training, bulk
+    # scoring), 1 preprocesses in the calling process
+    'preprocess_workers': int(os.getenv('PREPROCESS_WORKERS', os.cpu_count() or 1)),
+    # Texts sent to a worker at a time, smaller inputs are not split
+    'preprocess_chunk_size': int(os.getenv('PREPROCESS_CHUNK_SIZE', 2000))
 }
 
 # Logging configuration
@@ -45,7 +149,13 @@ LOGGING_CONFIG = {
 DATASET_CONFIG = {
     'path': BASE_DIR / 'data' / 'datasets' / 'twitter_dataset.csv',
     'text_column': 'text',
-    'sentiment_column': 'sentiment'
+    'sentiment_column': 'sentiment',
+    # Columnar copy next to the CSV (<name>.csv.npz), reused while the
+    # CSV is unchanged
+    'columnar_cache': os.getenv('DATASET_COLUMNAR_CACHE', 'True') == 'True',
+    # Larger CSVs are parsed in chunks of chunk_rows rows
+    'chunked_above_bytes': int(os.getenv('DATASET_CHUNKED_ABOVE_BYTES', 512 * 1024 * 1024)),
+    'chunk_rows': int(os.getenv('DATASET_CHUNK_ROWS', 200000))
 }
 
 def init_directories():
@@ -1,10 +1,16 @@
 from models.comment import Comment
 from services.sentiment_analyzer import sentiment_analyzer
-from utils.validators import validate_text_length
+from services.inference_pool import inference_pool
+from utils.validators import parse_user_id, validate_text_length
+from utils.pagination import paginate, parse_limit
 import logging
 
 logger = logging.getLogger(__name__)
 
+def comment_cursor(comment):
+    """Keyset pagination position of a comment"""
+    return comment.analysis_date, comment.id
+
 class CommentController:
     @staticmethod
     def create_comment(user_id, text):
@@ -44,7 +50,8 @@ class CommentController:
                     'probabilities': {
                         k: round(v * 100, 2)
                         for k, v in analysis['probabilities'].items()
-                    }
+                    },
+                    'model_version': analysis['model_version']
                 },
                 'message': 'Comment created and analyzed succesfully'
             }
@@ -62,6 +69,91 @@ class CommentController:
                 'error': f'Server error: {str(e)}'
             }
     
+    @staticmethod
+    def create_comments(items):
+        """
+        Creates and analyzes several comments at once
+        
+        Every item is validated like create_comment. The valid texts are
+        analyzed with one batched call and stored in one transaction.
+        
+        Args:
+            items (list): Dicts with user_id and text
+            
+        Returns:
+            dict: Operation result with one status per item
+        """
+        try:
+            results = [None] * len(items)
+            user_ids = {}
+            valid_indexes = []
+            
+            for i, item in enumerate(items):
+                if not isinstance(item, dict) or not item.get('user_id') or not item.get('text'):
+                    results[i] = {'index': i, 'success': False, 'error': 'user_id and text are required'}
+                    continue
+                
+                try:
+                    user_id = parse_user_id(item['user_id'])
+                except ValueError as e:
+                    results[i] = {'index': i, 'success': False, 'error': str(e)}
+                    continue
+                
+                if not isinstance(item['text'], str):
+                    results[i] = {'index': i, 'success': False, 'error': 'Text must be a string'}
+                    continue
+                
+                is_valid, error = validate_text_length(item['text'])
+                if not is_valid:
+                    results[i] = {'index': i, 'success': False, 'error': error}
+                    continue
+                
+                valid_indexes.append(i)
+                user_ids[i] = user_id
+            
+            analyses = (inference_pool or sentiment_analyzer).analyze_batch([items[i]['text'] for i in valid_indexes])
+            
+            comments = Comment.create_many([
+                (user_ids[i], items[i]['text'], analysis['sentiment'], analysis['confidence'])
+                for i, analysis in zip(valid_indexes, analyses)
+            ])
+            
+            for i, analysis, comment in zip(valid_indexes, analyses, comments):
+                if isinstance(comment, str):
+                    results[i] = {'index': i, 'success': False, 'error': comment}
+                    continue
+                
+                results[i] = {
+                    'index': i,
+                    'success': True,
+                    'data': comment.to_dict(),
+                    'analysis': {
+                        'sentiment': analysis['sentiment'],
+                        'confidence': round(analysis['confidence'] * 100, 2),
+                        'probabilities': {
+                            k: round(v * 100, 2)
+                            for k, v in analysis['probabilities'].items()
+                        },
+                        'model_version': analysis['model_version']
+                    }
+                }
+            
+            created = sum(1 for result in results if result['success'])
+            
+            return {
+                'success': True,
+                'data': results,
+                'created': created,
+                'failed': len(items) - created
+            }
+            
+        except Exception as e:
+            logger.error(f"Error when creating comments: {e}")
+            return {
+                'success': False,
+                'error': f'Server error: {str(e)}'
+            }
+    
     @staticmethod
     def get_comment(comment_id):
         """
@@ -95,20 +187,28 @@ class CommentController:
             }
     
     @staticmethod
-    def get_all_comments():
+    def get_all_comments(limit=None, after=None):
         """
-        Gets all comments
+        Gets one page of comments, newest first
+        
+        Args:
+            limit (int): Page size, default from PAGINATION_CONFIG
+            after (tuple): Decoded cursor of the previous page
         
         Returns:
-            dict: Operation result
+            dict: Operation result with the next page cursor
         """
         try:
-            comments = Comment.get_all()
+            limit = parse_limit(limit)
+            comments, next_cursor = paginate(
+                Comment.get_all(limit + 1, after), limit, comment_cursor
+            )
             
             return {
                 'success': True,
                 'data': [comment.to_dict() for comment in comments],
-                'count': len(comments)
+                'count': len(comments),
+                'next_cursor': next_cursor
             }
             
         except Exception as e:
@@ -119,23 +219,29 @@ class CommentController:
             }
     
     @staticmethod
-    def get_user_comments(user_id):
+    def get_user_comments(user_id, limit=None, after=None):
         """
-        Gets comments from a user
+        Gets one page of comments from a user
         
         Args:
             user_id (int)
+            limit (int)
+            after (tuple): Decoded cursor of the previous page
             
         Returns:
-            dict: Operation result
+            dict: Operation result with the next page cursor
         """
         try:
-            comments = Comment.get_by_user(user_id)
+            limit = parse_limit(limit)
+            comments, next_cursor = paginate(
+                Comment.get_by_user(user_id, limit + 1, after), limit, comment_cursor
+            )
             
             return {
                 'success': True,
                 'data': [comment.to_dict() for comment in comments],
-                'count': len(comments)
+                'count': len(comments),
+                'next_cursor': next_cursor
             }
             
         except Exception as e:
@@ -146,23 +252,29 @@ class CommentController:
             }
     
     @staticmethod
-    def get_comments_by_sentiment(sentiment):
+    def get_comments_by_sentiment(sentiment, limit=None, after=None):
         """
-        Gets comments by sentiment
+        Gets one page of comments by sentiment
         
         Args:
             sentiment (str)
+            limit (int)
+            after (tuple): Decoded cursor of the previous page
             
         Returns:
-            dict: Operation result
+            dict: Operation result with the next page cursor
         """
         try:
-            comments = Comment.get_by_sentiment(sentiment)
+            limit = parse_limit(limit)
+            comments, next_cursor = paginate(
+                Comment.get_by_sentiment(sentiment, limit + 1, after), limit, comment_cursor
+            )
             
             return {
                 'success': True,
                 'data': [comment.to_dict() for comment in comments],
-                'count': len(comments)
+                'count': len(comments),
+                'next_cursor': next_cursor
             }
             
         except Exception as e:
@@ -201,6 +313,39 @@ class CommentController:
             
         except Exception as e:
             logger.error(f"Error when getting statistics: {e}")
+            return {
+                'success': False,
+                'error': 'Server error'
+            }
+    
+    @staticmethod
+    def get_trends(bucket, start, end):
+        """
+        Gets sentiment trends per time bucket
+        
+        Args:
+            bucket (str): 'minute', 'hour' or 'day'
+            start (str): First date (UTC)
+            end (str): Last date (UTC)
+        
+        Returns:
+            dict: Operation result
+        """
+        try:
+            trends = Comment.get_trends(bucket, start, end)
+            
+            return {
+                'success': True,
+                'data': {
+                    'bucket': bucket,
+                    'from': start,
+                    'to': end,
+                    'buckets': trends
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Error when getting trends: {e}")
             return {
                 'success': False,
                 'error': 'Server error'
@@ -1,5 +1,6 @@
 from models.user import User
 from utils.validators import validate_user_data
+from utils.pagination import paginate, parse_limit
 import logging
 
 logger = logging.getLogger(__name__)
@@ -80,20 +81,29 @@ class UserController:
             }
     
     @staticmethod
-    def get_all_users():
+    def get_all_users(limit=None, after=None):
         """
-        Gets all users
+        Gets one page of users, newest first
+        
+        Args:
+            limit (int): Page size, default from PAGINATION_CONFIG
+            after (tuple): Decoded cursor of the previous page
         
         Returns:
-            dict: Operation result
+            dict: Operation result with the next page cursor
         """
         try:
-            users = User.get_all()
+            limit = parse_limit(limit)
+            users, next_cursor = paginate(
+                User.get_all(limit + 1, after), limit,
+                lambda user: (user.register_date, user.id)
+            )
             
             return {
                 'success': True,
                 'data': [user.to_dict() for user in users],
-                'count': len(users)
+                'count': len(users),
+                'next_cursor': next_cursor
             }
             
         except Exception as e:
@@ -128,6 +138,12 @@ class UserController:
                 'message': 'User deleted succesfully'
             }
             
+        except ValueError as e:
+            logger.warning(f"User {user_id} not deleted: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
         except Exception as e:
             logger.error(f"Error when deleting user: {e}")
             return {
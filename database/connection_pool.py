@@ -0,0 +1,182 @@
+import os
+import sqlite3
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available in time"""
+
+class ConnectionPool:
+    """
+    Bounded pool of persistent SQLite connections
+    
+    Connections are created lazily up to max_size and reused in LIFO
+    order, so a hot connection keeps its page cache. Each connection gets
+    the configured pragmas once when it is opened. Idle connections are
+    checked with a cheap query before being handed out again, and the pool
+    is rebuilt after a fork since SQLite connections cannot cross it.
+    """
+    
+    def __init__(self, db_path, max_size=8, timeout=10.0, pragmas=None, health_check_interval=30.0):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = pragmas or {}
+        self.health_check_interval = health_check_interval
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._pid = os.getpid()
+        self._condition = threading.Condition()
+    
+    def _connect(self):
+        """Opens a connection and applies the pragmas"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name}={value}')
+        return conn
+    
+    def _check_fork(self):
+        """Forgets connections inherited from the parent process"""
+        if self._pid != os.getpid():
+            self._idle = []
+            self._size = 0
+            self._pid = os.getpid()
+    
+    def acquire(self):
+        """
+        Takes a connection from the pool, opening one if below max_size
+        
+        Returns:
+            sqlite3.Connection
+        
+        Raises:
+            PoolTimeoutError: Every connection stayed busy for timeout seconds
+        """
+        deadline = time.monotonic() + self.timeout
+        
+        with self._condition:
+            self._check_fork()
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn, last_used = None, None
+                    break
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(f"No database connection available after {self.timeout}s")
+                self._condition.wait(remaining)
+        
+        if conn is not None and time.monotonic() - last_used > self.health_check_interval:
+            if not self._is_healthy(conn):
+                logger.warning("Discarding unhealthy database connection")
+                self._close_quietly(conn)
+                conn = None
+        
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+        return conn
+    
+    def release(self, conn, discard=False):
+        """
+        Returns a connection to the pool
+        
+        Args:
+            conn (sqlite3.Connection)
+            discard (bool): Close it instead, e.g. after an unexpected error
+        """
+        if not discard and conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                discard = True
+        
+        with self._condition:
+            if self._pid != os.getpid():
+                return
+            
+            if discard or self._closed:
+                self._size -= 1
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+    
+    def _is_healthy(self, conn):
+        """Runs a trivial query on the connection"""
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def _close_quietly(self, conn):
+        """Closes a connection ignoring errors"""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    
+    def health_check(self):
+        """
+        Checks that the database answers through a pooled connection
+        
+        Returns:
+            dict: Status, pool usage and the journal mode in effect
+        """
+        try:
+            conn = self.acquire()
+        except Exception as e:
+            return {'healthy': False, 'error': str(e)}
+        
+        try:
+            journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+            self.release(conn)
+        except sqlite3.Error as e:
+            self.release(conn, discard=True)
+            return {'healthy': False, 'error': str(e)}
+        
+        stats = self.stats()
+        stats['healthy'] = True
+        stats['journal_mode'] = journal_mode
+        return stats
+    
+    def stats(self):
+        """Returns open, idle and in-use connection counts"""
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'open': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle)
+            }
+    
+    def close_all(self):
+        """Closes idle connections, in-use ones are closed when released"""
+        with self._condition:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._close_quietly(conn)
+            self._size -= len(self._idle)
+            self._idle = []
+            self._condition.notify_all()
+        logger.info("Database connection pool closed")
@@ -1,30 +1,69 @@
+import atexit
 import sqlite3
 from contextlib import contextmanager
 from config import DATABASE_CONFIG
+from database.connection_pool import ConnectionPool
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Time buckets of the trend rollups: name -> strftime format of the bucket start
+TREND_BUCKETS = {
+    'minute': '%Y-%m-%d %H:%M:00',
+    'hour': '%Y-%m-%d %H:00:00',
+    'day': '%Y-%m-%d 00:00:00'
+}
+
+# Rollup tables maintained by triggers: key column -> SQL expression on a comment row
+ROLLUPS = {
+    'comment_stats': {'sentiment': '{row}.sentiment'},
+    **{
+        f'comment_trends_{bucket}': {
+            'bucket_start': f"strftime('{bucket_format}', {{row}}.analysis_date)",
+            'sentiment': '{row}.sentiment'
+        }
+        for bucket, bucket_format in TREND_BUCKETS.items()
+    }
+}
+
 class DatabaseManager:
-    def __init__(self):
-        self.db_path = str(DATABASE_CONFIG['path'])
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or DATABASE_CONFIG['path'])
+        self.pool = ConnectionPool(
+            self.db_path,
+            max_size=DATABASE_CONFIG['pool_size'],
+            timeout=DATABASE_CONFIG['pool_timeout'],
+            pragmas=DATABASE_CONFIG['pragmas'],
+            health_check_interval=DATABASE_CONFIG['health_check_interval']
+        )
         self.init_database()
     
     @contextmanager
     def get_connection(self):
-        """Context manager for BD connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Context manager for BD connections, borrowed from the pool"""
+        conn = self.pool.acquire()
+        discard = False
 
         try:
             yield conn
             conn.commit()
         except Exception as e:
-            conn.rollback()
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                discard = True
             logger.error(f"Error in BD transaction: {e}")
             raise
         finally:
-            conn.close()
+            self.pool.release(conn, discard=discard)
+
+    def health_check(self):
+        """Checks the database through the connection pool"""
+        return self.pool.health_check()
+    
+    def close(self):
+        """Closes every pooled connection"""
+        self.pool.close_all()
 
     def init_database(self):
         """Initializes database tables"""
@@ -55,16 +94,184 @@ class DatabaseManager:
             ''')
 
             # Indexes to optimize queries
+            # Composite indexes matching the keyset pagination order, they
+            # replace the single-column user and sentiment indexes
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_comments_user ON comments(user_id)
+                CREATE INDEX IF NOT EXISTS idx_comments_date ON comments(analysis_date, id)
             ''')
             
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_comments_sentiment ON comments(sentiment)
+                CREATE INDEX IF NOT EXISTS idx_comments_user_date ON comments(user_id, analysis_date, id)
             ''')
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_comments_sentiment_date ON comments(sentiment, analysis_date, id)
+            ''')
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_users_register_date ON users(register_date, id)
+            ''')
+            
+            cursor.execute('DROP INDEX IF EXISTS idx_comments_user')
+            cursor.execute('DROP INDEX IF EXISTS idx_comments_sentiment')
+            
+            self._init_rollups(cursor)
 
             logger.info("Database initialized correctly.")
     
+    def _init_rollups(self, cursor):
+        """
+        Creates the rollup tables of comments and their triggers
+        
+        The triggers keep counts and confidence sums up to date on every
+        insert, delete and re-score, so statistics and trends never scan
+        comments. Rollups missing from an existing database are backfilled
+        the first time.
+        """
+        for table, keys in ROLLUPS.items():
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            exists = cursor.fetchone() is not None
+            
+            key_columns = ', '.join(keys)
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    {' '.join(f'{key} TEXT NOT NULL,' for key in keys)}
+                    total INTEGER NOT NULL,
+                    confidence_sum REAL NOT NULL,
+                    confidence_count INTEGER NOT NULL,
+                    PRIMARY KEY ({key_columns})
+                )
+            ''')
+            
+            def key_values(row):
+                return [expression.format(row=row) for expression in keys.values()]
+            
+            new_values = key_values('NEW')
+            old_values = key_values('OLD')
+            add_new = f'''
+                INSERT INTO {table} ({key_columns}, total, confidence_sum, confidence_count)
+                SELECT {', '.join(new_values)}, 1, COALESCE(NEW.confidence, 0), NEW.confidence IS NOT NULL
+                WHERE {' AND '.join(f'{value} IS NOT NULL' for value in new_values)}
+                ON CONFLICT ({key_columns}) DO UPDATE SET
+                    total = total + 1,
+                    confidence_sum = confidence_sum + excluded.confidence_sum,
+                    confidence_count = confidence_count + excluded.confidence_count;
+            '''
+            old_row = ' AND '.join(f'{key} = {value}' for key, value in zip(keys, old_values))
+            remove_old = f'''
+                UPDATE {table} SET
+                    total = total - 1,
+                    confidence_sum = confidence_sum - COALESCE(OLD.confidence, 0),
+                    confidence_count = confidence_count - (OLD.confidence IS NOT NULL)
+                WHERE {old_row};
+                DELETE FROM {table} WHERE {old_row} AND total <= 0;
+            '''
+            
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_insert
+                AFTER INSERT ON comments
+                BEGIN {add_new} END
+            ''')
+            
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_delete
+                AFTER DELETE ON comments
+                BEGIN {remove_old} END
+            ''')
+            
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_update
+                AFTER UPDATE OF sentiment, confidence, analysis_date ON comments
+                BEGIN {remove_old} {add_new} END
+            ''')
+            
+            if not exists:
+                self._rebuild_rollup(cursor, table)
+    
+    def _aggregate_query(self, table):
+        """Full aggregate of comments grouped like a rollup table"""
+        keys = ROLLUPS[table]
+        values = [expression.format(row='comments') for expression in keys.values()]
+        return f'''
+            SELECT {', '.join(f'{value} AS {key}' for key, value in zip(keys, values))},
+                   COUNT(*) AS total,
+                   COALESCE(SUM(confidence), 0) AS confidence_sum,
+                   COUNT(confidence) AS confidence_count
+            FROM comments
+            WHERE {' AND '.join(f'{value} IS NOT NULL' for value in values)}
+            GROUP BY {', '.join(values)}
+        '''
+    
+    def _rebuild_rollup(self, cursor, table):
+        """Recomputes a rollup table from the comments table"""
+        cursor.execute(f'DELETE FROM {table}')
+        cursor.execute(f'''
+            INSERT INTO {table} ({', '.join(ROLLUPS[table])}, total, confidence_sum, confidence_count)
+            {self._aggregate_query(table)}
+        ''')
+    
+    def rebuild_rollups(self, tables=None):
+        """
+        Recomputes rollup tables in one transaction
+        
+        Args:
+            tables (list): Rollup tables, all of them when None
+        """
+        tables = tables or list(ROLLUPS)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            for table in tables:
+                self._rebuild_rollup(cursor, table)
+        logger.info(f"Rollups rebuilt: {', '.join(tables)}")
+    
+    def verify_rollup(self, table, tolerance=1e-6):
+        """
+        Compares a rollup table with a full aggregate of the comments table
+        
+        Args:
+            table (str): Rollup table
+            tolerance (float): Allowed drift of the confidence sums
+        
+        Returns:
+            list: One dict per key that does not match, empty when consistent
+        """
+        keys = list(ROLLUPS[table])
+        metrics = ('total', 'confidence_sum', 'confidence_count')
+        
+        def by_key(rows):
+            return {
+                tuple(row[key] for key in keys): tuple(row[metric] for metric in metrics)
+                for row in rows
+            }
+        
+        with self.get_connection() as conn:
+            # Both reads see the same snapshot
+            conn.execute('BEGIN')
+            rollup = by_key(conn.execute(f'SELECT * FROM {table}'))
+            actual = by_key(conn.execute(self._aggregate_query(table)))
+        
+        mismatches = []
+        for key in sorted(set(rollup) | set(actual)):
+            expected = actual.get(key, (0, 0.0, 0))
+            stored = rollup.get(key, (0, 0.0, 0))
+            if (stored[0] != expected[0] or stored[2] != expected[2]
+                    or abs(stored[1] - expected[1]) > tolerance * max(1.0, abs(expected[1]))):
+                mismatches.append({
+                    **dict(zip(keys, key)),
+                    'rollup': dict(zip(metrics, stored)),
+                    'actual': dict(zip(metrics, expected))
+                })
+        return mismatches
+    
+    def rebuild_comment_stats(self):
+        """Recomputes the comment statistics rollup"""
+        self.rebuild_rollups(['comment_stats'])
+    
+    def verify_comment_stats(self, tolerance=1e-6):
+        """Compares the comment statistics rollup with the comments table"""
+        return self.verify_rollup('comment_stats', tolerance)
+    
     def execute_query(self, query, params=None):
         """Executes a SELECT query and returns results"""
         with self.get_connection() as conn:
@@ -97,4 +304,5 @@ class DatabaseManager:
             return cursor.rowcount
     
 # Global instance
-db_manager = DatabaseManager()
\ No newline at end of file
+db_manager = DatabaseManager()
+atexit.register(db_manager.close)
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""Command line tasks for the sentiment analysis system"""
+import argparse
+import logging
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import LOGGING_CONFIG
+
+logging.basicConfig(
+    level=getattr(logging, LOGGING_CONFIG['level']),
+    format=LOGGING_CONFIG['format']
+)
+
+def compare_backends(args):
+    """Compares training time and accuracy of every backend"""
+    from services.model_trainer import compare_backends
+    compare_backends(args.dataset)
+
+def convert_model(args):
+    """Converts a pickled model into the mmap artifact directory"""
+    from config import MODEL_CONFIG
+    from services.sentiment_analyzer import SentimentAnalyzer
+    
+    source = Path(args.source) if args.source else MODEL_CONFIG['model_path']
+    output = Path(args.output) if args.output else MODEL_CONFIG['compiled_path']
+    
+    analyzer = SentimentAnalyzer()
+    analyzer.load_pickle(source)
+    compiled = analyzer.compiled
+    
+    compiled.save(output)
+    print(f"Converted {source} -> {output} (model version {compiled.fingerprint()})")
+
+def stats(args):
+    """Verifies or rebuilds the comment statistics rollup"""
+    from database.db_manager import db_manager
+    
+    if args.action == 'rebuild':
+        db_manager.rebuild_comment_stats()
+    
+    mismatches = db_manager.verify_comment_stats()
+    if not mismatches:
+        print("Comment statistics are consistent")
+        return
+    
+    for mismatch in mismatches:
+        print(f"{mismatch['sentiment']}: rollup {mismatch['rollup']} != actual {mismatch['actual']}")
+    print("Run 'python manage.py stats rebuild' to fix them")
+    sys.exit(1)
+
+def trends_backfill(args):
+    """Recomputes the trend rollups from the existing comments"""
+    from database.db_manager import db_manager, TREND_BUCKETS
+    
+    buckets = args.bucket or list(TREND_BUCKETS)
+    db_manager.rebuild_rollups([f'comment_trends_{bucket}' for bucket in buckets])
+    
+    for bucket in buckets:
+        mismatches = db_manager.verify_rollup(f'comment_trends_{bucket}')
+        print(f"{bucket}: {'consistent' if not mismatches else f'{len(mismatches)} mismatches'}")
+
+def models(args):
+    """Lists, activates or rolls back registered model versions"""
+    from services.model_registry import model_registry
+    
+    if args.action == 'list':
+        for metadata in model_registry.list():
+            accuracy = (metadata.get('metrics') or {}).get('test_accuracy')
+            print(f"{'*' if metadata['active'] else ' '} {metadata['version']}  {metadata['created_at']}  "
+                  f"{metadata['backend']:<10}  accuracy {accuracy if accuracy is not None else '-'}  "
+                  f"dataset {metadata['dataset_hash'] or '-'}")
+        return
+    
+    if args.action == 'import':
+        # Registers the model saved at the MODEL_CONFIG paths
+        from config import MODEL_CONFIG
+        from services.sentiment_analyzer import SentimentAnalyzer
+        
+        analyzer = SentimentAnalyzer()
+        if MODEL_CONFIG['model_path'].exists():
+            analyzer.load_pickle(MODEL_CONFIG['model_path'])
+        elif MODEL_CONFIG['compiled_path'].exists():
+            analyzer.load_compiled(MODEL_CONFIG['compiled_path'])
+        else:
+            print("No saved model to import")
+            sys.exit(1)
+        metadata = model_registry.register(analyzer)
+        model_registry.activate(metadata['version'])
+    elif args.action == 'activate':
+        if not args.version:
+            print("activate needs a version")
+            sys.exit(1)
+        try:
+            metadata = model_registry.activate(args.version)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+    else:
+        try:
+            metadata = model_registry.rollback()
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+    
+    print(f"Active model version: {metadata['version']} (workers switch within MODEL_CONFIG reload_interval)")
+
+def serve(args):
+    """Runs the pre-fork production server"""
+    from server import serve
+    serve(args.host, args.port, args.workers)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    parser_compare = subparsers.add_parser(
+        'compare-backends',
+        help='Compare training time of the model backends'
+    )
+    parser_compare.add_argument('--dataset', default=None, help='CSV dataset path')
+    parser_compare.set_defaults(func=compare_backends)
+    
+    parser_convert = subparsers.add_parser(
+        'convert-model',
+        help='Convert a .pkl model into the mmap artifact format'
+    )
+    parser_convert.add_argument('--source', default=None, help='Model file (default: MODEL_CONFIG model_path)')
+    parser_convert.add_argument('--output', default=None, help='Artifact directory (default: MODEL_CONFIG compiled_path)')
+    parser_convert.set_defaults(func=convert_model)
+    
+    parser_stats = subparsers.add_parser(
+        'stats',
+        help='Check the comment statistics rollup against the comments table'
+    )
+    parser_stats.add_argument('action', choices=['verify', 'rebuild'])
+    parser_stats.set_defaults(func=stats)
+    
+    parser_trends = subparsers.add_parser(
+        'trends-backfill',
+        help='Rebuild the per-minute/hour/day trend rollups from existing comments'
+    )
+    parser_trends.add_argument('--bucket', action='append', choices=['minute', 'hour', 'day'],
+                               help='Bucket to rebuild, repeatable (default: all)')
+    parser_trends.set_defaults(func=trends_backfill)
+    
+    parser_models = subparsers.add_parser(
+        'models',
+        help='List, activate or roll back model versions of the registry'
+    )
+    parser_models.add_argument('action', choices=['list', 'activate', 'rollback', 'import'])
+    parser_models.add_argument('version', nargs='?', help='Version to activate')
+    parser_models.set_defaults(func=models)
+    
+    parser_serve = subparsers.add_parser(
+        'serve',
+        help='Run the pre-fork production server (SIGHUP reloads the model, SIGTERM stops)'
+    )
+    parser_serve.add_argument('--host', default=None, help='Bind address (default: FLASK_CONFIG HOST)')
+    parser_serve.add_argument('--port', type=int, default=None, help='Port (default: FLASK_CONFIG PORT)')
+    parser_serve.add_argument('--workers', type=int, default=None, help='Worker processes (default: FLASK_CONFIG WORKERS)')
+    parser_serve.set_defaults(func=serve)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
-from database.db_manager import db_manager
-from models.user import User
+import sqlite3
+from database.db_manager import db_manager, TREND_BUCKETS
+from utils.pagination import keyset_filter, limit_clause
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,23 +25,102 @@ class Comment:
         if not text or len(text.strip()) < 3:
             raise ValueError("The text must have at least 3 characters.")
         
-        user = User.get_by_id(user_id)
-        if not user:
-            raise ValueError("User not found")
-        
+        # One statement: the foreign key rejects unknown users and
+        # RETURNING gives back the stored row with its id and date
         query = '''
             INSERT INTO comments 
             (user_id, _text, sentiment, confidence)
             VALUES (?, ?, ?, ?)
+            RETURNING *
         '''
         
-        comment_id = db_manager.execute_insert(
-            query, 
-            (user_id, text, sentiment, confidence)
+        try:
+            with db_manager.get_connection() as conn:
+                row = conn.execute(query, (user_id, text, sentiment, confidence)).fetchone()
+        except sqlite3.IntegrityError as e:
+            if 'FOREIGN KEY constraint failed' in str(e):
+                raise ValueError("User not found")
+            raise
+        
+        logger.info(f"Comment created: ID {row['id']} - sentiment: {sentiment}")
+        return Comment(
+            id=row['id'],
+            user_id=row['user_id'],
+            text=row['_text'],
+            sentiment=row['sentiment'],
+            confidence=row['confidence'],
+            analysis_date=row['analysis_date']
         )
+    
+    @staticmethod
+    def create_many(rows):
+        """
+        Creates several comments in a single transaction
+        
+        Users are validated with one set-based query and every valid row
+        is inserted with one executemany.
+        
+        Args:
+            rows (list): (user_id, text, sentiment, confidence) tuples,
+                         user_id an int
+        
+        Returns:
+            list: A Comment for every created row, or the error message
+                  of the rows that were rejected, in the same order
+        """
+        results = [None] * len(rows)
+        
+        for i, (user_id, text, _, _) in enumerate(rows):
+            if not text or len(text.strip()) < 3:
+                results[i] = "The text must have at least 3 characters."
         
-        logger.info(f"Comment created: ID {comment_id} - sentiment: {sentiment}")
-        return Comment.get_by_id(comment_id)
+        user_ids = list({row[0] for i, row in enumerate(rows) if results[i] is None})
+        
+        with db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            # Take the write lock first so the inserted ids are consecutive
+            cursor.execute('BEGIN IMMEDIATE')
+            
+            existing = set()
+            for start in range(0, len(user_ids), 500):
+                chunk = user_ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f'SELECT id FROM users WHERE id IN ({placeholders})', chunk)
+                existing.update(row['id'] for row in cursor.fetchall())
+            
+            inserted = []
+            for i, row in enumerate(rows):
+                if results[i] is not None:
+                    continue
+                if row[0] not in existing:
+                    results[i] = "User not found"
+                else:
+                    inserted.append(i)
+            
+            if inserted:
+                cursor.executemany(
+                    'INSERT INTO comments (user_id, _text, sentiment, confidence) VALUES (?, ?, ?, ?)',
+                    [rows[i] for i in inserted]
+                )
+                last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+                first_id = last_id - len(inserted) + 1
+                
+                cursor.execute(
+                    'SELECT * FROM comments WHERE id BETWEEN ? AND ? ORDER BY id',
+                    (first_id, last_id)
+                )
+                for i, row in zip(inserted, cursor.fetchall()):
+                    results[i] = Comment(
+                        id=row['id'],
+                        user_id=row['user_id'],
+                        text=row['_text'],
+                        sentiment=row['sentiment'],
+                        confidence=row['confidence'],
+                        analysis_date=row['analysis_date']
+                    )
+        
+        logger.info(f"Comments created: {len(inserted)}/{len(rows)}")
+        return results
     
     @staticmethod
     def get_by_id(comment_id):
@@ -61,15 +141,25 @@ class Comment:
         return None
     
     @staticmethod
-    def get_all():
-        """Gets all comments"""
-        query = '''
+    def get_all(limit=None, after=None):
+        """
+        Gets comments, newest first
+        
+        Args:
+            limit (int): Maximum comments, all when None
+            after (tuple): Decoded cursor (analysis_date, id) of the previous page
+        """
+        condition, params = keyset_filter(after, 'c.analysis_date', 'c.id')
+        limit_sql, limit_params = limit_clause(limit)
+        query = f'''
             SELECT c.*, u.name, u.email
             FROM comments c
             JOIN users u ON c.user_id = u.id
-            ORDER BY c.analysis_date DESC
+            WHERE {condition}
+            ORDER BY c.analysis_date DESC, c.id DESC
+            {limit_sql}
         '''
-        results = db_manager.execute_query(query)
+        results = db_manager.execute_query(query, params + limit_params)
         
         comments = []
         for row in results:
@@ -89,14 +179,17 @@ class Comment:
         return comments
     
     @staticmethod
-    def get_by_user(user_id):
-        """Gets all comments from an user"""
-        query = '''
-            SELECT * FROM comentarios 
-            WHERE user_id = ?
-            ORDER BY analysis_date DESC
+    def get_by_user(user_id, limit=None, after=None):
+        """Gets comments from an user, newest first"""
+        condition, params = keyset_filter(after, 'analysis_date', 'id')
+        limit_sql, limit_params = limit_clause(limit)
+        query = f'''
+            SELECT * FROM comments 
+            WHERE user_id = ? AND {condition}
+            ORDER BY analysis_date DESC, id DESC
+            {limit_sql}
         '''
-        results = db_manager.execute_query(query, (user_id,))
+        results = db_manager.execute_query(query, [user_id] + params + limit_params)
         
         return [
             Comment(
@@ -111,14 +204,17 @@ class Comment:
         ]
     
     @staticmethod
-    def get_by_sentiment(sentiment):
-        """Gets comments by sentiment"""
-        query = '''
+    def get_by_sentiment(sentiment, limit=None, after=None):
+        """Gets comments by sentiment, newest first"""
+        condition, params = keyset_filter(after, 'analysis_date', 'id')
+        limit_sql, limit_params = limit_clause(limit)
+        query = f'''
             SELECT * FROM comments 
-            WHERE sentiment = ?
-            ORDER BY analysis_date DESC
+            WHERE sentiment = ? AND {condition}
+            ORDER BY analysis_date DESC, id DESC
+            {limit_sql}
         '''
-        results = db_manager.execute_query(query, (sentiment,))
+        results = db_manager.execute_query(query, [sentiment] + params + limit_params)
         
         return [
             Comment(
@@ -134,27 +230,55 @@ class Comment:
     
     @staticmethod
     def get_statistics():
-        """Gets stadistics about comments"""
-        query = '''
-            SELECT 
-                sentiment,
-                COUNT(*) as total,
-                AVG(confidence) as confidence_mean
-            FROM comments
-            WHERE sentiment IS NOT NULL
-            GROUP BY sentiment
-        '''
+        """Gets stadistics about comments from the trigger-maintained rollup"""
+        query = 'SELECT sentiment, total, confidence_sum, confidence_count FROM comment_stats'
         results = db_manager.execute_query(query)
         
         stats = {}
         for row in results:
+            confidence_mean = row['confidence_sum'] / row['confidence_count'] if row['confidence_count'] else 0.0
             stats[row['sentiment']] = {
                 'total': row['total'],
-                'confidence_mean': round(row['confidence_mean'] * 100, 2)
+                'confidence_mean': round(confidence_mean * 100, 2)
             }
         
         return stats
     
+    @staticmethod
+    def get_trends(bucket, start, end):
+        """
+        Gets sentiment counts per time bucket from the trend rollups
+        
+        Args:
+            bucket (str): 'minute', 'hour' or 'day'
+            start (str): First date, floored to its bucket
+            end (str): Last date
+        
+        Returns:
+            list: One dict per non-empty bucket, oldest first
+        """
+        query = f'''
+            SELECT bucket_start, sentiment, total, confidence_sum, confidence_count
+            FROM comment_trends_{bucket}
+            WHERE bucket_start BETWEEN strftime(?, ?) AND ?
+            ORDER BY bucket_start
+        '''
+        results = db_manager.execute_query(query, (TREND_BUCKETS[bucket], start, end))
+        
+        trends = []
+        for row in results:
+            if not trends or trends[-1]['bucket_start'] != row['bucket_start']:
+                trends.append({'bucket_start': row['bucket_start'], 'total': 0, 'by_sentiment': {}})
+            
+            confidence_mean = row['confidence_sum'] / row['confidence_count'] if row['confidence_count'] else 0.0
+            trends[-1]['total'] += row['total']
+            trends[-1]['by_sentiment'][row['sentiment']] = {
+                'total': row['total'],
+                'confidence_mean': round(confidence_mean * 100, 2)
+            }
+        
+        return trends
+    
     def to_dict(self):
         """Converts the comment to a dictionary"""
         data = {
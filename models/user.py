@@ -1,5 +1,7 @@
+import sqlite3
 from database.db_manager import db_manager
 from utils.validators import validate_email, validate_name
+from utils.pagination import keyset_filter, limit_clause
 import logging
 
 logger = logging.getLogger(__name__)
@@ -67,10 +69,23 @@ class User:
         return None
 
     @staticmethod
-    def get_all():
-        """Gets all users"""
-        query = 'SELECT * FROM users ORDER BY register_date DESC'
-        results = db_manager.execute_query(query)
+    def get_all(limit=None, after=None):
+        """
+        Gets users, newest first
+        
+        Args:
+            limit (int): Maximum users, all when None
+            after (tuple): Decoded cursor (register_date, id) of the previous page
+        """
+        condition, params = keyset_filter(after, 'register_date', 'id')
+        limit_sql, limit_params = limit_clause(limit)
+        query = f'''
+            SELECT * FROM users
+            WHERE {condition}
+            ORDER BY register_date DESC, id DESC
+            {limit_sql}
+        '''
+        results = db_manager.execute_query(query, params + limit_params)
 
         return [
             User (
@@ -84,9 +99,19 @@ class User:
     
     @staticmethod
     def delete(user_id):
-        """Deletes an user"""
+        """
+        Deletes an user
+        
+        Raises:
+            ValueError: The user still has comments
+        """
         query = 'DELETE FROM users WHERE id = ?'
-        rows_affected = db_manager.execute_delete(query, (user_id,))
+        try:
+            rows_affected = db_manager.execute_delete(query, (user_id,))
+        except sqlite3.IntegrityError as e:
+            if 'FOREIGN KEY constraint failed' in str(e):
+                raise ValueError("The user has comments")
+            raise
         logger.info(f"User {user_id} deleted")
         return rows_affected > 0
     
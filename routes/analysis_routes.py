@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify
 from services.sentiment_analyzer import sentiment_analyzer
+from services.inference_scheduler import inference_scheduler
+from services.inference_pool import inference_pool
+from config import INFERENCE_CONFIG
 from utils.validators import validate_text_length
 import logging
 
@@ -22,7 +25,10 @@ def analyze_text():
         return jsonify({'error': error}), 400
     
     try:
-        result = sentiment_analyzer.analyze(text)
+        if INFERENCE_CONFIG['batching']:
+            result = inference_scheduler.analyze(text)
+        else:
+            result = sentiment_analyzer.analyze(text)
         
         return jsonify({
             'sentiment': result['sentiment'],
@@ -31,9 +37,10 @@ def analyze_text():
                 k: round(v * 100, 2)
                 for k, v in result['probabilities'].items()
             },
-            'original_text': result['original_text']
+            'original_text': result['original_text'],
+            'model_version': result['model_version']
         }), 200
-        
+    
     except Exception as e:
         logger.error(f"Error when analyzing text: {e}")
         return jsonify({'error': str(e)}), 500
@@ -55,29 +62,45 @@ def analyze_batch():
         return jsonify({'error': '100 texts maximum per request'}), 400
     
     try:
-        results = []
+        results = [None] * len(texts)
+        valid_indexes = []
         
-        for text in texts:
+        for i, text in enumerate(texts):
             # Validar cada text
-            is_valid, error = validate_text_length(text)
+            if isinstance(text, str):
+                is_valid, error = validate_text_length(text)
+            else:
+                is_valid, error = False, 'Text must be a string'
+            
             if is_valid:
-                result = sentiment_analyzer.analyze(text)
-                results.append({
-                    'text': text,
-                    'sentiment': result['sentiment'],
-                    'confidence': round(result['confidence'] * 100, 2)
-                })
+                valid_indexes.append(i)
             else:
-                results.append({
+                results[i] = {
                     'text': text,
                     'error': error
-                })
+                }
+        
+        analyses = (inference_pool or sentiment_analyzer).analyze_batch([texts[i] for i in valid_indexes])
+        
+        for i, result in zip(valid_indexes, analyses):
+            if 'error' in result:
+                results[i] = {
+                    'text': texts[i],
+                    'error': result['error']
+                }
+            else:
+                results[i] = {
+                    'text': texts[i],
+                    'sentiment': result['sentiment'],
+                    'confidence': round(result['confidence'] * 100, 2),
+                    'model_version': result['model_version']
+                }
         
         return jsonify({
             'results': results,
             'total': len(results)
         }), 200
-        
+    
     except Exception as e:
         logger.error(f"Error analyzing batch: {e}")
         return jsonify({'error': str(e)}), 500
@@ -86,4 +109,27 @@ def analyze_batch():
 def get_model_info():
     """Endpoint to get model information"""
     info = sentiment_analyzer.get_model_info()
-    return jsonify(info), 200
\ No newline at end of file
+    return jsonify(info), 200
+
+@analysis_bp.route('/cache', methods=['GET'])
+def get_cache_stats():
+    """Endpoint to get result cache statistics"""
+    stats = sentiment_analyzer.get_cache_stats()
+    return jsonify(stats), 200
+
+@analysis_bp.route('/scheduler', methods=['GET'])
+def get_scheduler_stats():
+    """Endpoint to get micro-batching scheduler statistics"""
+    stats = inference_scheduler.stats()
+    stats['enabled'] = INFERENCE_CONFIG['batching']
+    return jsonify(stats), 200
+
+@analysis_bp.route('/pool', methods=['GET'])
+def get_pool_stats():
+    """Endpoint to get inference process pool statistics"""
+    if inference_pool is None:
+        return jsonify({'enabled': False}), 200
+    
+    stats = inference_pool.stats()
+    stats['enabled'] = True
+    return jsonify(stats), 200
@@ -1,8 +1,12 @@
 from flask import Blueprint, request, jsonify
 from controllers.comment_controller import CommentController
+from utils.pagination import parse_page_args
+from utils.time_buckets import parse_trend_args
 
 comment_bp = Blueprint('comments', __name__, url_prefix='/api/comments')
 
+MAX_BATCH_COMMENTS = 5000
+
 @comment_bp.route('', methods=['POST'])
 def create_comment():
     """Endpoint to create and analyze a comment"""
@@ -24,15 +28,44 @@ def create_comment():
     else:
         return jsonify(result), 400
 
+@comment_bp.route('/batch', methods=['POST'])
+def create_comments():
+    """Endpoint to create and analyze several comments at once"""
+    data = request.json
+    
+    if not data or not data.get('comments'):
+        return jsonify({'error': 'Comments field is required'}), 400
+    
+    comments = data['comments']
+    
+    if not isinstance(comments, list):
+        return jsonify({'error': 'comments must be a list'}), 400
+    
+    if len(comments) > MAX_BATCH_COMMENTS:
+        return jsonify({'error': f'{MAX_BATCH_COMMENTS} comments maximum per request'}), 400
+    
+    result = CommentController.create_comments(comments)
+    
+    if not result['success']:
+        return jsonify(result), 500
+    
+    return jsonify(result), 201 if result['created'] else 400
+
 @comment_bp.route('', methods=['GET'])
 def get_all_comments():
-    """Endpoint to list all comments"""
-    result = CommentController.get_all_comments()
+    """Endpoint to list comments, one page per request"""
+    try:
+        limit, after = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    result = CommentController.get_all_comments(limit, after)
     
     if result['success']:
         return jsonify({
             'comments': result['data'],
-            'total': result['count']
+            'total': result['count'],
+            'next_cursor': result['next_cursor']
         }), 200
     else:
         return jsonify(result), 500
@@ -50,12 +83,18 @@ def get_comment(comment_id):
 @comment_bp.route('/user/<int:user_id>', methods=['GET'])
 def get_user_comments(user_id):
     """Endpoint to get comments from a user"""
-    result = CommentController.get_user_comments(user_id)
+    try:
+        limit, after = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    result = CommentController.get_user_comments(user_id, limit, after)
     
     if result['success']:
         return jsonify({
             'comments': result['data'],
-            'total': result['count']
+            'total': result['count'],
+            'next_cursor': result['next_cursor']
         }), 200
     else:
         return jsonify(result), 500
@@ -63,13 +102,19 @@ def get_user_comments(user_id):
 @comment_bp.route('/sentiment/<string:sentiment>', methods=['GET'])
 def get_comments_by_sentiment(sentiment):
     """Endpoint to filter comments by sentiment"""
-    result = CommentController.get_comments_by_sentiment(sentiment)
+    try:
+        limit, after = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    result = CommentController.get_comments_by_sentiment(sentiment, limit, after)
     
     if result['success']:
         return jsonify({
             'comments': result['data'],
             'total': result['count'],
-            'sentiment': sentiment
+            'sentiment': sentiment,
+            'next_cursor': result['next_cursor']
         }), 200
     else:
         return jsonify(result), 500
@@ -79,6 +124,21 @@ def get_statistics():
     """Endpoint to get statistics from comments"""
     result = CommentController.get_statistics()
     
+    if result['success']:
+        return jsonify(result['data']), 200
+    else:
+        return jsonify(result), 500
+
+@comment_bp.route('/trends', methods=['GET'])
+def get_trends():
+    """Endpoint to get sentiment counts per minute, hour or day"""
+    try:
+        bucket, start, end = parse_trend_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    result = CommentController.get_trends(bucket, start, end)
+    
     if result['success']:
         return jsonify(result['data']), 200
     else:
@@ -0,0 +1,117 @@
+from flask import Blueprint, request, jsonify
+from config import SHADOW_CONFIG
+from services.sentiment_analyzer import BACKENDS, sentiment_analyzer
+from services.training_jobs import training_jobs
+from services.model_registry import model_registry
+from services.model_reloader import model_reloader
+import logging
+
+logger = logging.getLogger(__name__)
+
+model_bp = Blueprint('model', __name__, url_prefix='/api/model')
+
+@model_bp.route('/train', methods=['POST'])
+def train():
+    """Endpoint to start a background training job"""
+    data = request.get_json(silent=True) or {}
+    backend = data.get('backend')
+    
+    if backend is not None and backend not in BACKENDS:
+        return jsonify({'error': f"backend must be one of: {', '.join(BACKENDS)}"}), 400
+    
+    try:
+        job = training_jobs.submit(backend)
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    except Exception as e:
+        logger.error(f"Error starting training job: {e}")
+        return jsonify({'error': str(e)}), 500
+    
+    return jsonify(job), 202
+
+@model_bp.route('/jobs', methods=['GET'])
+def list_jobs():
+    """Endpoint to list recent training jobs"""
+    return jsonify({'jobs': training_jobs.list()}), 200
+
+@model_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Endpoint to get the progress and metrics of a training job"""
+    job = training_jobs.get(job_id)
+    
+    if job is None:
+        return jsonify({'error': 'Training job not found'}), 404
+    
+    return jsonify(job), 200
+
+@model_bp.route('/versions', methods=['GET'])
+def list_versions():
+    """Endpoint to list the registered model versions"""
+    return jsonify({
+        **model_reloader.stats(),
+        'versions': model_registry.list()
+    }), 200
+
+@model_bp.route('/activate', methods=['POST'])
+def activate_version():
+    """Endpoint to make every worker load a registered version"""
+    data = request.get_json(silent=True) or {}
+    version = data.get('version')
+    
+    if not version:
+        return jsonify({'error': 'Version field is required'}), 400
+    
+    try:
+        metadata = model_registry.activate(version)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    
+    model_reloader.reload_now()
+    return jsonify(metadata), 202
+
+@model_bp.route('/rollback', methods=['POST'])
+def rollback_version():
+    """Endpoint to re-activate the previously active version"""
+    try:
+        metadata = model_registry.rollback()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 409
+    
+    model_reloader.reload_now()
+    return jsonify(metadata), 202
+
+@model_bp.route('/shadow', methods=['GET'])
+def get_shadow():
+    """Endpoint to compare the shadow model with the primary one"""
+    return jsonify(sentiment_analyzer.get_shadow_stats()), 200
+
+@model_bp.route('/shadow', methods=['POST'])
+def start_shadow():
+    """Endpoint to score a sample of live requests with a candidate version"""
+    data = request.get_json(silent=True) or {}
+    version = data.get('version')
+    sample_rate = data.get('sample_rate', SHADOW_CONFIG['sample_rate'])
+    
+    if not version:
+        return jsonify({'error': 'Version field is required'}), 400
+    
+    if not isinstance(sample_rate, (int, float)) or isinstance(sample_rate, bool):
+        return jsonify({'error': 'Sample rate must be a number'}), 400
+    
+    if model_registry.get(version) is None:
+        return jsonify({'error': f'Unknown model version: {version}'}), 404
+    
+    try:
+        shadow = model_registry.set_shadow(version, float(sample_rate))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    model_reloader.reload_now()
+    return jsonify(shadow), 202
+
+@model_bp.route('/shadow', methods=['DELETE'])
+def stop_shadow():
+    """Endpoint to stop shadow scoring"""
+    model_registry.set_shadow(None)
+    model_reloader.reload_now()
+    return jsonify({'enabled': False}), 202
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from controllers.user_controller import UserController
+from utils.pagination import parse_page_args
 
 user_bp = Blueprint('users', __name__, url_prefix='/api/users')
 
@@ -23,13 +24,19 @@ def create_user():
 
 @user_bp.route('', methods=['GET'])
 def get_all_users():
-    """Endpoint for listing all users"""
-    result = UserController.get_all_users()
+    """Endpoint for listing users, one page per request"""
+    try:
+        limit, after = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    result = UserController.get_all_users(limit, after)
     
     if result['success']:
         return jsonify({
             'users': result['data'],
-            'total': result['count']
+            'total': result['count'],
+            'next_cursor': result['next_cursor']
         }), 200
     else:
         return jsonify(result), 500
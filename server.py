@@ -0,0 +1,257 @@
+"""Pre-fork production server: loads the model once, then forks the workers"""
+import os
+import signal
+import socket
+import threading
+import time
+from werkzeug.serving import make_server
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A worker dying sooner than this after its start is respawned with a delay
+MIN_WORKER_LIFETIME = 1.0
+
+class _ActiveRequests:
+    """
+    Counts the requests a threaded werkzeug server is handling
+    
+    werkzeug runs each connection on a daemon thread that serve_forever
+    does not wait for, so the worker waits on this count before exiting.
+    A request is counted when it is accepted, before its thread starts,
+    and released once its connection is closed.
+    """
+    
+    def __init__(self, server):
+        self._count = 0
+        self._condition = threading.Condition()
+        self._process_request = server.process_request
+        self._process_request_thread = server.process_request_thread
+        server.process_request = self.process_request
+        server.process_request_thread = self.process_request_thread
+    
+    def process_request(self, request, client_address):
+        with self._condition:
+            self._count += 1
+        try:
+            self._process_request(request, client_address)
+        except BaseException:
+            self._release()
+            raise
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            self._process_request_thread(request, client_address)
+        finally:
+            self._release()
+    
+    def _release(self):
+        with self._condition:
+            self._count -= 1
+            self._condition.notify_all()
+    
+    def wait(self, timeout):
+        """
+        Waits until no request is in flight
+        
+        Returns:
+            int: Requests still in flight when the timeout expired
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._count == 0, timeout)
+            return self._count
+
+class PreforkServer:
+    """
+    Serves a WSGI app from N forked worker processes
+    
+    The parent binds the listening socket and loads the app (model
+    included) before forking, so every worker inherits both: the socket
+    is shared and the model pages are shared copy-on-write. Each worker
+    runs a threaded werkzeug server on the inherited socket.
+    
+    Signals to the parent:
+        SIGHUP: calls on_reload, then replaces the workers one by one
+        SIGTERM, SIGINT: stops the workers gracefully and exits
+    Dead workers are respawned. A stopping worker stops accepting, then
+    finishes its in-flight requests for up to graceful_timeout.
+    """
+    
+    def __init__(self, app, host, port, workers, on_reload=None, graceful_timeout=30.0):
+        self.app = app
+        self.workers = workers
+        self.on_reload = on_reload
+        self.graceful_timeout = graceful_timeout
+        self.socket = socket.create_server((host, port), backlog=128)
+        self.socket.set_inheritable(True)
+        self.host, self.port = self.socket.getsockname()[:2]
+        self._children = {}
+        self._stopping = False
+        self._reload_requested = False
+    
+    def run(self):
+        """Forks the workers and supervises them until SIGTERM or SIGINT"""
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGHUP, self._request_reload)
+        
+        logger.info(f"Pre-fork server on http://{self.host}:{self.port} with {self.workers} workers")
+        for _ in range(self.workers):
+            self._spawn()
+        
+        try:
+            while not self._stopping:
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self._reload()
+                self._reap(respawn=True)
+                time.sleep(0.1)
+        finally:
+            self._stop_all()
+            self.socket.close()
+            logger.info("Pre-fork server stopped")
+    
+    def _request_stop(self, signum, frame):
+        self._stopping = True
+    
+    def _request_reload(self, signum, frame):
+        self._reload_requested = True
+    
+    def _spawn(self):
+        """Forks one worker process"""
+        pid = os.fork()
+        if pid == 0:
+            self._worker()
+        self._children[pid] = time.monotonic()
+        logger.info(f"Worker {pid} started")
+        return pid
+    
+    def _worker(self):
+        """Worker process body, never returns"""
+        status = 0
+        try:
+            # The parent handles Ctrl+C and reloads for the whole group
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            
+            server = make_server(self.host, self.port, self.app, threaded=True, fd=self.socket.fileno())
+            active = _ActiveRequests(server)
+            signal.signal(
+                signal.SIGTERM,
+                lambda signum, frame: threading.Thread(target=server.shutdown, daemon=True).start()
+            )
+            server.serve_forever()
+            
+            # No new connections are accepted, let the in-flight ones finish
+            remaining = active.wait(self.graceful_timeout)
+            if remaining:
+                logger.warning(f"Worker {os.getpid()} exiting with {remaining} requests in flight")
+            server.server_close()
+        except Exception as e:
+            logger.error(f"Worker {os.getpid()} failed: {e}")
+            status = 1
+        finally:
+            logging.shutdown()
+            os._exit(status)
+    
+    def _reap(self, respawn):
+        """Collects exited workers, replacing them when respawn is set"""
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._children.clear()
+                return
+            if pid == 0:
+                return
+            
+            started = self._children.pop(pid, None)
+            if started is None:
+                continue
+            
+            if respawn and not self._stopping:
+                logger.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, respawning")
+                if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                    time.sleep(MIN_WORKER_LIFETIME)
+                self._spawn()
+    
+    def _reload(self):
+        """Reloads the app state in the parent, then rolls the workers"""
+        logger.info("Reloading")
+        if self.on_reload is not None:
+            try:
+                self.on_reload()
+            except Exception as e:
+                logger.error(f"Reload failed, keeping the current workers: {e}")
+                return
+        
+        # Start each replacement before stopping an old worker, so the
+        # socket always has someone accepting
+        for old_pid in list(self._children):
+            self._spawn()
+            self._terminate([old_pid])
+    
+    def _terminate(self, pids):
+        """Stops workers gracefully, killing those still running after the timeout"""
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        
+        deadline = time.monotonic() + self.graceful_timeout
+        remaining = set(pids)
+        while remaining and time.monotonic() < deadline:
+            for pid in list(remaining):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    remaining.discard(pid)
+                    self._children.pop(pid, None)
+            if remaining:
+                time.sleep(0.05)
+        
+        for pid in remaining:
+            logger.warning(f"Worker {pid} did not stop in {self.graceful_timeout}s, killing it")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self._children.pop(pid, None)
+    
+    def _stop_all(self):
+        """Stops every worker"""
+        self._terminate(list(self._children))
+
+def serve(host=None, port=None, workers=None):
+    """
+    Production entry point: initializes the system once, then pre-forks
+    
+    Args:
+        host (str): Bind address, FLASK_CONFIG['HOST'] by default
+        port (int): Port, FLASK_CONFIG['PORT'] by default
+        workers (int): Worker processes, FLASK_CONFIG['WORKERS'] by default
+    """
+    from config import FLASK_CONFIG
+    from app import create_app, initialize_system
+    from services.sentiment_analyzer import sentiment_analyzer
+    
+    initialize_system()
+    app = create_app()
+    
+    def reload_model():
+        if not sentiment_analyzer.load_model():
+            raise RuntimeError("No trained model found")
+    
+    server = PreforkServer(
+        app,
+        host or FLASK_CONFIG['HOST'],
+        FLASK_CONFIG['PORT'] if port is None else port,
+        workers or FLASK_CONFIG['WORKERS'],
+        on_reload=reload_model,
+        graceful_timeout=FLASK_CONFIG['GRACEFUL_TIMEOUT']
+    )
+    server.run()
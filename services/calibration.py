@@ -0,0 +1,92 @@
+import numpy as np
+from scipy.optimize import minimize, minimize_scalar
+from services.linear_kernel import expit
+
+CALIBRATIONS = ('native', 'temperature', 'sigmoid')
+
+def fit_calibration(kind, scores, y_index):
+    """
+    Fits a closed-form calibration on held-out class scores
+
+    Args:
+        kind (str): 'temperature' or 'sigmoid'
+        scores (ndarray): (n_samples, n_columns) class scores, one column for binary models
+        y_index (ndarray): True class index of every sample
+
+    Returns:
+        dict: Calibration parameters
+    """
+    if kind == 'temperature':
+        return fit_temperature(scores, y_index)
+    if kind == 'sigmoid':
+        return fit_sigmoid(scores, y_index)
+    raise ValueError(f"Unknown calibration: {kind}")
+
+def fit_temperature(scores, y_index):
+    """Fits the softmax temperature minimizing the held-out log loss"""
+    if scores.shape[1] == 1:
+        scores = np.column_stack([np.zeros(len(scores)), scores[:, 0]])
+    rows = np.arange(len(y_index))
+
+    def log_loss(log_temperature):
+        logits = scores / np.exp(log_temperature)
+        logits = logits - logits.max(axis=1, keepdims=True)
+        log_norm = np.log(np.exp(logits).sum(axis=1))
+        return np.mean(log_norm - logits[rows, y_index])
+
+    result = minimize_scalar(log_loss, bounds=(-5, 5), method='bounded')
+    return {'temperature': [float(np.exp(result.x))]}
+
+def fit_sigmoid(scores, y_index):
+    """
+    Fits one Platt sigmoid per class column (one-vs-rest)
+
+    Binary models have a single column for the positive class.
+    """
+    a = []
+    b = []
+    for column in range(scores.shape[1]):
+        positive_class = 1 if scores.shape[1] == 1 else column
+        slope, offset = _fit_platt(scores[:, column], y_index == positive_class)
+        a.append(slope)
+        b.append(offset)
+    return {'a': a, 'b': b}
+
+def _fit_platt(f, positive):
+    """Platt scaling: P(positive | f) = 1 / (1 + exp(a * f + b))"""
+    n_positive = positive.sum()
+    n_negative = len(positive) - n_positive
+
+    # Platt's smoothed targets avoid overfitting small held-out sets
+    target = np.where(positive, (n_positive + 1.0) / (n_positive + 2.0), 1.0 / (n_negative + 2.0))
+
+    def loss(params):
+        a, b = params
+        z = a * f + b
+        p = expit(-z)
+        value = np.sum(np.logaddexp(0, z) - (1 - target) * z)
+        gradient = target - p
+        return value, np.array([np.dot(gradient, f), gradient.sum()])
+
+    prior = np.log((n_negative + 1.0) / (n_positive + 1.0))
+    result = minimize(loss, x0=np.array([0.0, prior]), jac=True, method='L-BFGS-B')
+    return float(result.x[0]), float(result.x[1])
+
+def brier_score(probabilities, y_index):
+    """Multiclass Brier score: mean squared error against one-hot labels"""
+    one_hot = np.zeros_like(probabilities)
+    one_hot[np.arange(len(y_index)), y_index] = 1
+    return float(np.mean(np.sum((probabilities - one_hot) ** 2, axis=1)))
+
+def expected_calibration_error(probabilities, y_index, n_bins=10):
+    """Expected calibration error of the top-class confidence"""
+    confidence = probabilities.max(axis=1)
+    correct = probabilities.argmax(axis=1) == y_index
+    bins = np.minimum((confidence * n_bins).astype(int), n_bins - 1)
+
+    error = 0.0
+    for b in range(n_bins):
+        in_bin = bins == b
+        if in_bin.any():
+            error += in_bin.mean() * abs(correct[in_bin].mean() - confidence[in_bin].mean())
+    return float(error)
@@ -0,0 +1,155 @@
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from config import DATASET_CONFIG
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columns of the Kaggle CSV, which has no header row
+CSV_COLUMNS = ['id', 'entity', 'sentiment', 'tweet']
+
+# Bumped when the columnar copy layout changes
+COLUMNAR_FORMAT = 1
+
+def columnar_path(path):
+    """Columnar copy of a CSV, stored next to it"""
+    path = Path(path)
+    return path.with_name(f'{path.name}.npz')
+
+def read_csv(path, chunk_rows=None):
+    """
+    Reads the labelled texts of a dataset CSV
+    
+    Only the sentiment and tweet columns are parsed, with the labels as a
+    categorical. Rows without text or label and 'irrelevant' rows are
+    dropped. With chunk_rows the file is read and filtered chunk by
+    chunk, so only the kept columns and rows are ever in memory.
+    
+    Args:
+        path (Path): CSV file
+        chunk_rows (int): Rows per chunk, None reads the file at once
+    
+    Returns:
+        DataFrame: sentiment (category) and tweet columns
+    """
+    reader = pd.read_csv(
+        path,
+        names=CSV_COLUMNS,
+        usecols=['sentiment', 'tweet'],
+        dtype={'sentiment': 'category', 'tweet': str},
+        chunksize=chunk_rows
+    )
+    chunks = [reader] if chunk_rows is None else reader
+    
+    frames = []
+    for chunk in chunks:
+        chunk = chunk.dropna(subset=['sentiment', 'tweet'])
+        # Lowercases the few categories, not every row
+        sentiment = chunk['sentiment']
+        irrelevant = [label for label in sentiment.cat.categories if label.lower() == 'irrelevant']
+        frames.append(chunk[~sentiment.isin(irrelevant)])
+    
+    if len(frames) == 1:
+        df = frames[0]
+    else:
+        # Chunks have their own categories, merged into one set
+        sentiment = pd.api.types.union_categoricals([frame['sentiment'] for frame in frames])
+        df = pd.DataFrame({
+            'sentiment': sentiment,
+            'tweet': pd.concat([frame['tweet'] for frame in frames], ignore_index=True)
+        })
+    
+    df = df.reset_index(drop=True)
+    df['sentiment'] = df['sentiment'].cat.remove_unused_categories()
+    return df
+
+def save_columnar(path, df, source_stat):
+    """
+    Writes the columnar copy of a loaded dataset
+    
+    Labels are stored as category codes, texts as one UTF-8 buffer plus
+    offsets, so the copy loads without pickle or a CSV parser.
+    """
+    encoded = [text.encode('utf-8') for text in df['tweet']]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(text) for text in encoded], out=offsets[1:])
+    
+    tmp_path = path.with_name(f'{path.name}.tmp-{os.getpid()}')
+    with open(tmp_path, 'wb') as f:
+        np.savez(
+            f,
+            format=np.array(COLUMNAR_FORMAT),
+            source_size=np.array(source_stat.st_size),
+            source_mtime_ns=np.array(source_stat.st_mtime_ns),
+            categories=np.array(df['sentiment'].cat.categories, dtype=str),
+            codes=df['sentiment'].cat.codes.to_numpy(),
+            text=np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            offsets=offsets
+        )
+    os.replace(tmp_path, path)
+
+def load_columnar(path, source_stat):
+    """Loads a columnar copy, None when it is missing or older than the CSV"""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if (int(data['format']) != COLUMNAR_FORMAT
+                    or int(data['source_size']) != source_stat.st_size
+                    or int(data['source_mtime_ns']) != source_stat.st_mtime_ns):
+                return None
+            categories = data['categories'].tolist()
+            codes = data['codes']
+            buffer = data['text'].tobytes()
+            offsets = data['offsets'].tolist()
+    except FileNotFoundError:
+        return None
+    
+    tweets = [buffer[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+    return pd.DataFrame({
+        'sentiment': pd.Categorical.from_codes(codes, categories),
+        'tweet': pd.Series(tweets, dtype=str)
+    })
+
+def load_dataset(path=None):
+    """
+    Loads a dataset CSV through its columnar copy
+    
+    The copy is reused while the CSV keeps its size and modification
+    time, otherwise the CSV is parsed again and the copy rewritten.
+    
+    Args:
+        path (Path): CSV file, DATASET_CONFIG['path'] by default
+    
+    Returns:
+        DataFrame: sentiment (category) and tweet columns
+    
+    Raises:
+        FileNotFoundError: The CSV does not exist
+    """
+    path = Path(path or DATASET_CONFIG['path'])
+    source_stat = path.stat()
+    cache_path = columnar_path(path)
+    
+    if DATASET_CONFIG['columnar_cache']:
+        try:
+            df = load_columnar(cache_path, source_stat)
+        except Exception as e:
+            logger.warning(f"Columnar copy {cache_path} unreadable, parsing the CSV: {e}")
+            df = None
+        if df is not None:
+            logger.info(f"Dataset loaded from columnar copy {cache_path}")
+            return df
+    
+    chunk_rows = None
+    if source_stat.st_size > DATASET_CONFIG['chunked_above_bytes']:
+        chunk_rows = DATASET_CONFIG['chunk_rows']
+    df = read_csv(path, chunk_rows)
+    
+    if DATASET_CONFIG['columnar_cache']:
+        try:
+            save_columnar(cache_path, df, source_stat)
+        except OSError as e:
+            logger.warning(f"Columnar copy {cache_path} not written: {e}")
+    
+    return df
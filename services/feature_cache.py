@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+from pathlib import Path
+import scipy.sparse
+import sklearn
+from config import MODEL_CONFIG, NLP_CONFIG
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bumped when preprocessing or the entry layout changes
+FEATURE_CACHE_FORMAT = 1
+
+class FeatureCache:
+    """
+    On-disk cache of the training features of a dataset
+    
+    Preprocessing and fitting the vectorizer only depend on the dataset
+    and the preprocessing settings, so a retrain with other classifier
+    settings can skip them. An entry is a directory named after its key:
+        
+        <root>/<key>/features.npz        TF-IDF matrix (scipy sparse)
+        <root>/<key>/processed_texts.txt one preprocessed text per line
+        <root>/<key>/vectorizer.pkl      fitted vectorizer and stem table
+        <root>/<key>/metadata.json       dataset hash, settings, build time
+    
+    Only the max_entries most recently used entries are kept.
+    """
+    
+    def __init__(self, root, max_entries=4, min_rows=1000):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.min_rows = min_rows
+    
+    def key(self, dataset_hash):
+        """Cache key of a dataset under the current preprocessing settings"""
+        settings = self.settings()
+        settings['dataset_hash'] = dataset_hash
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+    
+    def settings(self):
+        """Everything besides the data that the cached features depend on"""
+        return {
+            'format': FEATURE_CACHE_FORMAT,
+            'language': NLP_CONFIG['language'],
+            'stem_table_size': NLP_CONFIG['stem_table_size'],
+            'max_features': MODEL_CONFIG['max_features'],
+            'sklearn': sklearn.__version__
+        }
+    
+    def load(self, key, n_rows):
+        """
+        Loads an entry
+        
+        Args:
+            key (str): Cache key
+            n_rows (int): Rows of the dataset, checked against the matrix
+        
+        Returns:
+            dict: stem_table, processed_texts, vectorizer, X and
+            build_seconds, None on a miss
+        """
+        path = self.root / key
+        if not path.exists():
+            return None
+        
+        try:
+            X = scipy.sparse.load_npz(path / 'features.npz')
+            processed_texts = (path / 'processed_texts.txt').read_text(encoding='utf-8').split('\n')
+            with open(path / 'vectorizer.pkl', 'rb') as f:
+                fitted = pickle.load(f)
+            metadata = json.loads((path / 'metadata.json').read_text(encoding='utf-8'))
+        except Exception as e:
+            logger.warning(f"Feature cache entry {key} unreadable, rebuilding it: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        
+        if X.shape[0] != n_rows or len(processed_texts) != n_rows:
+            logger.warning(f"Feature cache entry {key} does not match the dataset, rebuilding it")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        
+        # Marks the entry as recently used for the eviction
+        os.utime(path)
+        return {
+            'stem_table': fitted['stem_table'],
+            'processed_texts': processed_texts,
+            'vectorizer': fitted['vectorizer'],
+            'X': X,
+            'build_seconds': metadata['build_seconds']
+        }
+    
+    def save(self, key, dataset_hash, features, build_seconds):
+        """
+        Stores the features of a dataset, replacing any previous entry
+        
+        Args:
+            key (str): Cache key
+            dataset_hash (str): Fingerprint of the dataset
+            features (dict): stem_table, processed_texts, vectorizer and X
+            build_seconds (float): Time it took to build them
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / f'.{key}.tmp-{os.getpid()}'
+        if tmp_path.exists():
+            shutil.rmtree(tmp_path)
+        tmp_path.mkdir()
+        
+        # Processed texts are space-separated words, never newlines
+        scipy.sparse.save_npz(tmp_path / 'features.npz', features['X'].tocsr())
+        (tmp_path / 'processed_texts.txt').write_text('\n'.join(features['processed_texts']), encoding='utf-8')
+        with open(tmp_path / 'vectorizer.pkl', 'wb') as f:
+            pickle.dump({'vectorizer': features['vectorizer'], 'stem_table': features['stem_table']}, f)
+        (tmp_path / 'metadata.json').write_text(json.dumps({
+            'key': key,
+            'dataset_hash': dataset_hash,
+            'rows': features['X'].shape[0],
+            'build_seconds': build_seconds,
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()),
+            'settings': self.settings()
+        }, indent=2), encoding='utf-8')
+        
+        path = self.root / key
+        shutil.rmtree(path, ignore_errors=True)
+        try:
+            tmp_path.rename(path)
+        except OSError:
+            # Stored concurrently by another process
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        
+        self._evict()
+    
+    def _evict(self):
+        """Removes the least recently used entries beyond max_entries"""
+        entries = sorted(
+            (path for path in self.root.iterdir() if path.is_dir() and not path.name.startswith('.')),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True
+        )
+        for path in entries[self.max_entries:]:
+            shutil.rmtree(path, ignore_errors=True)
+            logger.info(f"Feature cache entry {path.name} evicted")
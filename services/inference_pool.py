@@ -0,0 +1,217 @@
+import math
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import INFERENCE_CONFIG
+from services.sentiment_analyzer import SentimentAnalyzer, sentiment_analyzer
+from utils.processes import pool_context
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Analyzer of a pool worker process, loaded once by _init_worker
+_worker_analyzer = None
+
+def _init_worker(artifact_path):
+    """Loads the memory-mapped model artifact in a new worker process"""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer()
+    _worker_analyzer.load_compiled(artifact_path)
+
+def _analyze_chunk(texts):
+    """Analyzes a chunk of texts in a worker process"""
+    return _worker_analyzer.analyze_batch(texts)
+
+class InferencePool:
+    """
+    Runs analyze_batch on a pool of worker processes
+    
+    Preprocessing is pure Python and holds the GIL, so threads of one
+    process use a single core. Batches are split into chunks scored in
+    parallel by the workers, and results are returned in input order.
+    Every worker memory-maps the same compiled artifact, so the model
+    pages are shared between processes instead of copied. A registered
+    model is mapped from its registry version directory. Any other model
+    is saved once to a directory private to the serving process, under
+    artifact_dir (the system temp directory by default), so concurrent
+    pools never write the same path.
+    
+    The pool is restarted when the analyzer's model version changes, and
+    when a worker dies, in which case the batch is retried once. Batches
+    already submitted to the previous pool finish on its workers, and its
+    artifact is kept until they are done.
+    """
+    
+    def __init__(self, analyzer, max_workers, artifact_dir=None, min_chunk_size=16):
+        self.analyzer = analyzer
+        self.max_workers = max_workers
+        self.artifact_dir = Path(artifact_dir) if artifact_dir else None
+        self.min_chunk_size = min_chunk_size
+        self._executor = None
+        self._model_version = None
+        self._active = None
+        self._artifact_path = None
+        self._scratch_dir = None
+        self._retiring = {}
+        self._pid = None
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._texts = 0
+        self._restarts = 0
+    
+    def analyze_batch(self, texts):
+        """
+        Analizes multiple texts on the worker processes
+        
+        Args:
+            texts (list)
+        
+        Returns:
+            list: One dict per text, in the same order
+        """
+        if not self.analyzer.is_trained:
+            raise Exception("The model hasn't trained yet")
+        
+        if not texts:
+            return []
+        
+        chunk_size = max(self.min_chunk_size, math.ceil(len(texts) / self.max_workers))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        
+        executor = self._get_executor()
+        primary = self._active
+        try:
+            chunk_results = list(executor.map(_analyze_chunk, chunks))
+        except BrokenProcessPool as e:
+            logger.error(f"Inference worker died, restarting pool: {e}")
+            self._restart(executor)
+            chunk_results = list(self._get_executor().map(_analyze_chunk, chunks))
+        
+        with self._lock:
+            self._batches += 1
+            self._texts += len(texts)
+        
+        results = [result for chunk in chunk_results for result in chunk]
+        
+        # Workers have no shadow model: the processed texts are their words
+        shadow = self.analyzer.shadow
+        if shadow is not None and shadow.sample():
+            scored = [result for result in results if 'error' not in result]
+            shadow.offer(
+                primary,
+                [result['processed_text'].split() for result in scored],
+                [result['sentiment'] for result in scored]
+            )
+        
+        return results
+    
+    def _get_executor(self):
+        """Returns the running pool, (re)starting it for a new model or process"""
+        with self._lock:
+            if (self._executor is None or self._pid != os.getpid()
+                    or self._model_version != self.analyzer.model_version):
+                self._start()
+            return self._executor
+    
+    def _start(self):
+        """Starts worker processes on an up-to-date model artifact"""
+        if self._executor is not None and self._pid == os.getpid():
+            # Chunks queued by batches in flight still run on the old workers
+            retired = self._executor
+            self._retiring[retired] = self._artifact_path
+            threading.Thread(target=self._retire, args=(retired,), daemon=True).start()
+        else:
+            # Forked: the parent's private directory and pools are not ours
+            self._scratch_dir = None
+            self._retiring = {}
+        
+        active = self.analyzer.active
+        self._artifact_path = self._artifact(active)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=pool_context(),
+            initializer=_init_worker,
+            initargs=(str(self._artifact_path),)
+        )
+        self._model_version = active.version
+        self._active = active
+        self._pid = os.getpid()
+        self._remove_stale_artifacts()
+        logger.info(f"Inference pool started: {self.max_workers} workers, model {self._model_version}")
+    
+    def _artifact(self, active):
+        """Path of the active model's artifact, saved first if unregistered"""
+        registered = self.analyzer.registry.path(active.version) / 'model'
+        if registered.exists():
+            return registered
+        
+        if self._scratch_dir is None:
+            root = self.artifact_dir or Path(tempfile.gettempdir())
+            root.mkdir(parents=True, exist_ok=True)
+            self._scratch_dir = Path(tempfile.mkdtemp(prefix=f'inference-pool-{os.getpid()}-', dir=root))
+        
+        path = self._scratch_dir / active.version
+        if not path.exists():
+            active.compiled.save(path)
+        return path
+    
+    def _retire(self, executor):
+        """Waits for the chunks queued on a replaced pool, then deletes its artifact"""
+        executor.shutdown(wait=True)
+        with self._lock:
+            self._retiring.pop(executor, None)
+            self._remove_stale_artifacts()
+    
+    def _remove_stale_artifacts(self):
+        """Deletes saved artifacts no pool maps anymore, mapped pages stay valid"""
+        if self._scratch_dir is None:
+            return
+        in_use = {self._artifact_path.name}
+        in_use.update(path.name for path in self._retiring.values())
+        for path in self._scratch_dir.iterdir():
+            # <version> links to the <version>@<fingerprint> directory
+            if path.name.split('@')[0] in in_use:
+                continue
+            if path.is_symlink():
+                path.unlink()
+            else:
+                shutil.rmtree(path, ignore_errors=True)
+    
+    def _restart(self, broken):
+        """Replaces a broken pool, once when several callers saw it break"""
+        with self._lock:
+            if self._executor is broken:
+                self._restarts += 1
+                self._start()
+    
+    def shutdown(self):
+        """Stops the worker processes and deletes the saved artifacts"""
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                if self._scratch_dir is not None:
+                    shutil.rmtree(self._scratch_dir, ignore_errors=True)
+            self._executor = None
+            self._scratch_dir = None
+            self._retiring = {}
+    
+    def stats(self):
+        """Returns pool size, restarts and throughput counters"""
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'running': self._executor is not None,
+                'model_version': self._model_version,
+                'batches': self._batches,
+                'texts': self._texts,
+                'restarts': self._restarts
+            }
+
+# Global instance, None when INFERENCE_CONFIG['processes'] is 0
+inference_pool = InferencePool(
+    sentiment_analyzer, INFERENCE_CONFIG['processes']
+) if INFERENCE_CONFIG['processes'] else None
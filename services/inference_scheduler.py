@@ -0,0 +1,159 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from config import INFERENCE_CONFIG
+from services.sentiment_analyzer import sentiment_analyzer
+from services.inference_pool import inference_pool
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# Recent queueing delays kept for the percentiles
+DELAY_WINDOW = 10000
+
+class InferenceScheduler:
+    """
+    Collects concurrent single-text requests into vectorized batches
+    
+    Callers block on analyze() while a background thread drains the
+    queue: a batch is flushed when it reaches max_batch_size or when
+    max_wait_ms has passed since its first request, and is scored with
+    one analyze_batch call. Every caller gets its own result back.
+    """
+    
+    def __init__(self, analyzer, max_batch_size=64, max_wait_ms=2.0):
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._batches = 0
+        self._requests = 0
+        self._histogram = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._delays = deque(maxlen=DELAY_WINDOW)
+    
+    def analyze(self, text, timeout=None):
+        """
+        Analyzes one text as part of the next batch
+        
+        Args:
+            text (str)
+            timeout (float): Seconds to wait for the result
+        
+        Returns:
+            dict: Same result as SentimentAnalyzer.analyze
+        """
+        result = self.submit(text).result(timeout)
+        if 'error' in result:
+            raise ValueError(result['error'])
+        return result
+    
+    def submit(self, text):
+        """Queues a text and returns a Future of its analysis"""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        return future
+    
+    def _ensure_worker(self):
+        """Starts the batching thread, again in a forked child"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='inference-scheduler', daemon=True)
+                self._thread.start()
+    
+    def _run(self):
+        """Worker loop: collect a batch, score it, resolve the futures"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            self._process(batch)
+    
+    def _process(self, batch):
+        """Scores one batch and hands every caller its result"""
+        started = time.perf_counter()
+        texts = [text for text, _, _ in batch]
+        
+        try:
+            results = self.analyzer.analyze_batch(texts)
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            results = None
+        
+        if results is not None:
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+        
+        with self._lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._histogram[self._bucket_index(len(batch))] += 1
+            self._delays.extend(started - queued_at for _, _, queued_at in batch)
+    
+    def _bucket_index(self, size):
+        """Histogram bucket of a batch size"""
+        for index, upper in enumerate(BATCH_SIZE_BUCKETS):
+            if size <= upper:
+                return index
+        return len(BATCH_SIZE_BUCKETS)
+    
+    def stats(self):
+        """Returns the batch size distribution and queueing delays"""
+        with self._lock:
+            delays = sorted(self._delays)
+            labels = []
+            lower = 1
+            for upper in BATCH_SIZE_BUCKETS:
+                labels.append(str(upper) if upper == lower else f'{lower}-{upper}')
+                lower = upper + 1
+            labels.append(f'{lower}+')
+            
+            def percentile(q):
+                return round(delays[min(int(len(delays) * q), len(delays) - 1)] * 1000, 3) if delays else 0.0
+            
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000,
+                'batches': self._batches,
+                'requests': self._requests,
+                'mean_batch_size': round(self._requests / self._batches, 2) if self._batches else 0.0,
+                'batch_size_histogram': dict(zip(labels, self._histogram)),
+                'queue_delay_ms': {
+                    'mean': round(sum(delays) / len(delays) * 1000, 3) if delays else 0.0,
+                    'p50': percentile(0.5),
+                    'p95': percentile(0.95),
+                    'p99': percentile(0.99),
+                    'max': round(delays[-1] * 1000, 3) if delays else 0.0
+                },
+                'queued': self._queue.qsize()
+            }
+
+# Global instance
+inference_scheduler = InferenceScheduler(
+    inference_pool or sentiment_analyzer,
+    max_batch_size=INFERENCE_CONFIG['max_batch_size'],
+    max_wait_ms=INFERENCE_CONFIG['max_wait_ms']
+)
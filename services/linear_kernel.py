@@ -0,0 +1,576 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+import numpy as np
+
+# TfidfVectorizer default: words of two or more word characters
+DEFAULT_TOKEN_PATTERN = r'(?u)\b\w\w+\b'
+
+# Probability clipping used by libsvm for the pairwise Platt estimates
+LIBSVM_MIN_PROB = 1e-7
+
+# Bumped when the layout of the artifact directory changes
+ARTIFACT_FORMAT_VERSION = 2
+
+def expit(x):
+    """Numerically stable logistic function"""
+    return np.exp(-np.logaddexp(0, -x))
+
+def libsvm_pairwise_coupling(pairwise, n_classes):
+    """
+    Multiclass probabilities from pairwise estimates (libsvm method 2)
+    
+    Vectorized over rows, it follows libsvm's multiclass_probability
+    iteration step by step so the result matches SVC.predict_proba.
+    
+    Args:
+        pairwise (ndarray): (n_samples, n_classes, n_classes) with r[i, j] = P(i | i or j)
+        n_classes (int)
+    
+    Returns:
+        ndarray: (n_samples, n_classes) probabilities
+    """
+    n_samples = pairwise.shape[0]
+    r = pairwise
+    
+    Q = -r.transpose(0, 2, 1) * r
+    diagonal = np.einsum('nji,nji->ni', r, r) - np.einsum('nii,nii->ni', r, r)
+    idx = np.arange(n_classes)
+    Q[:, idx, idx] = diagonal
+    
+    p = np.full((n_samples, n_classes), 1.0 / n_classes)
+    active = np.ones(n_samples, dtype=bool)
+    eps = 0.005 / n_classes
+    
+    for _ in range(max(100, n_classes)):
+        Qp = np.einsum('nij,nj->ni', Q, p)
+        pQp = np.einsum('ni,ni->n', p, Qp)
+        max_error = np.max(np.abs(Qp - pQp[:, None]), axis=1)
+        active &= max_error >= eps
+        if not active.any():
+            break
+        
+        for t in range(n_classes):
+            diff = np.where(active, (-Qp[:, t] + pQp) / Q[:, t, t], 0.0)
+            p[:, t] += diff
+            pQp = (pQp + diff * (diff * Q[:, t, t] + 2 * Qp[:, t])) / (1 + diff) ** 2
+            Qp = (Qp + diff[:, None] * Q[:, t, :]) / (1 + diff)[:, None]
+            p /= (1 + diff)[:, None]
+    
+    return p
+
+def apply_calibration(kind, params, scores, n_classes):
+    """
+    Closed-form class probabilities from per-class scores
+    
+    Args:
+        kind (str): 'sigmoid', 'logistic' or 'temperature'
+        params (dict): Calibration parameters
+        scores (ndarray): (n_samples, n_columns) scores, one column for binary models
+        n_classes (int)
+    
+    Returns:
+        ndarray: (n_samples, n_classes) probabilities
+    """
+    if kind == 'temperature':
+        if scores.shape[1] == 1:
+            scores = np.column_stack([np.zeros(len(scores)), scores[:, 0]])
+        logits = scores / params['temperature'][0]
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp_logits = np.exp(logits)
+        return exp_logits / exp_logits.sum(axis=1, keepdims=True)
+    
+    if kind == 'sigmoid':
+        positive = expit(-(scores * params['a'] + params['b']))
+    elif kind == 'logistic':
+        positive = expit(scores)
+    else:
+        raise ValueError(f"Unknown calibration: {kind}")
+    
+    if n_classes == 2:
+        return np.column_stack([1 - positive[:, 0], positive[:, 0]])
+    
+    totals = positive.sum(axis=1, keepdims=True)
+    uniform = totals[:, 0] == 0
+    totals[uniform] = 1
+    probabilities = positive / totals
+    probabilities[uniform] = 1.0 / n_classes
+    return probabilities
+
+class CompiledModel:
+    """
+    Linear scoring kernel exported from a trained vectorizer + classifier
+    
+    Holds plain NumPy arrays (coefficients, intercepts, IDF, vocabulary and
+    calibration parameters), so inference needs neither sklearn nor scipy:
+    TF-IDF rows are built directly, scored with one sparse dot product and
+    turned into probabilities in closed form.
+    
+    Schemes:
+        'ovr': one score per class (LinearSVC, SGD)
+        'ovo': one score per class pair (libsvm SVC)
+    
+    Calibrations:
+        'libsvm': pairwise Platt scaling + coupling, voting for the label
+        'sigmoid': per-class sigmoid, normalized (CalibratedClassifierCV or
+                   fitted on a held-out split by the trainer)
+        'logistic': per-class logistic, normalized (SGD with log loss)
+        'temperature': softmax of the class scores with a fitted temperature
+    """
+    
+    def __init__(self, classes, vocabulary, idf, coef, intercept, scheme,
+                 calibration, calibration_params, token_pattern=DEFAULT_TOKEN_PATTERN,
+                 lowercase=True, sublinear_tf=False, norm='l2', backend=None,
+                 fitted_calibration=False, stem_table=None):
+        self.classes = np.asarray(classes)
+        self.vocabulary = vocabulary
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.scheme = scheme
+        self.calibration = calibration
+        self.calibration_params = {
+            name: np.asarray(value, dtype=np.float64)
+            for name, value in calibration_params.items()
+        }
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.backend = backend
+        self.fitted_calibration = fitted_calibration
+        self.stem_table = stem_table or {}
+        
+        self._token_regex = re.compile(token_pattern)
+        self._coef_t = np.ascontiguousarray(self.coef.T)
+        self._fingerprint = None
+    
+    def fingerprint(self):
+        """Content hash of everything that affects predictions, used as model version"""
+        if self._fingerprint is not None:
+            return self._fingerprint
+        
+        digest = hashlib.sha256()
+        settings = [self.scheme, self.calibration, self.token_pattern, self.lowercase,
+                    self.sublinear_tf, self.norm, sorted(self.vocabulary.items())]
+        digest.update(json.dumps(settings).encode())
+        for array in (self.classes.astype(str), self.idf, self.coef, self.intercept):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        for name in sorted(self.calibration_params):
+            digest.update(name.encode())
+            digest.update(np.ascontiguousarray(self.calibration_params[name]).tobytes())
+        self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+    
+    @property
+    def n_features(self):
+        return self.coef.shape[1]
+    
+    @classmethod
+    def from_sklearn(cls, vectorizer, model, backend=None, calibration=None, stem_table=None):
+        """
+        Compiles a fitted TfidfVectorizer and backend classifier
+        
+        Args:
+            vectorizer: Fitted TfidfVectorizer
+            model: Fitted SVC, CalibratedClassifierCV or SGDClassifier
+            backend (str): Backend name kept as metadata
+            calibration (dict): Fitted {'kind', 'params'} replacing the
+                model's own probabilities, None to compile them
+            stem_table (dict): Precomputed word -> stem table shipped along
+        
+        Returns:
+            CompiledModel
+        """
+        if vectorizer.analyzer != 'word' or tuple(vectorizer.ngram_range) != (1, 1):
+            raise ValueError("Only word unigram vectorizers can be compiled")
+        if vectorizer.stop_words is not None or vectorizer.binary or not vectorizer.use_idf:
+            raise ValueError("Unsupported vectorizer options for compilation")
+        
+        vocabulary = {term: int(index) for term, index in vectorizer.vocabulary_.items()}
+        model_name = type(model).__name__
+        
+        if model_name == 'SVC':
+            if getattr(model, 'kernel', None) != 'linear':
+                raise ValueError("Only linear SVC models can be compiled")
+            coef = _dense(model.coef_)
+            intercept = np.asarray(model.intercept_, dtype=np.float64)
+            if len(model.classes_) == 2:
+                # sklearn flips the sign of binary models, libsvm does not
+                coef, intercept = -coef, -intercept
+            scheme = 'ovo'
+            if model._probA.size:
+                native_calibration = ('libsvm', {'prob_a': model._probA, 'prob_b': model._probB})
+            else:
+                native_calibration = None
+        
+        elif model_name == 'CalibratedClassifierCV':
+            if len(model.calibrated_classifiers_) != 1 or model.method != 'sigmoid':
+                raise ValueError("Only sigmoid calibration with ensemble=False can be compiled")
+            calibrated = model.calibrated_classifiers_[0]
+            coef = _dense(calibrated.estimator.coef_)
+            intercept = np.asarray(calibrated.estimator.intercept_, dtype=np.float64)
+            scheme = 'ovr'
+            native_calibration = ('sigmoid', {
+                'a': [calibrator.a_ for calibrator in calibrated.calibrators],
+                'b': [calibrator.b_ for calibrator in calibrated.calibrators]
+            })
+        
+        elif model_name in ('SGDClassifier', 'LinearSVC'):
+            coef = _dense(model.coef_)
+            intercept = np.asarray(model.intercept_, dtype=np.float64)
+            scheme = 'ovr'
+            if getattr(model, 'loss', None) == 'log_loss':
+                native_calibration = ('logistic', {})
+            else:
+                native_calibration = None
+        
+        else:
+            raise ValueError(f"Model type {model_name} cannot be compiled")
+        
+        fitted_calibration = calibration is not None
+        if fitted_calibration:
+            native_calibration = (calibration['kind'], calibration['params'])
+        if native_calibration is None:
+            raise ValueError(f"Model type {model_name} has no probability calibration")
+        calibration, calibration_params = native_calibration
+        
+        return cls(
+            classes=model.classes_,
+            vocabulary=vocabulary,
+            idf=vectorizer.idf_,
+            coef=coef,
+            intercept=intercept,
+            scheme=scheme,
+            calibration=calibration,
+            calibration_params=calibration_params,
+            token_pattern=vectorizer.token_pattern,
+            lowercase=vectorizer.lowercase,
+            sublinear_tf=vectorizer.sublinear_tf,
+            norm=vectorizer.norm,
+            backend=backend,
+            fitted_calibration=fitted_calibration,
+            stem_table=stem_table
+        )
+    
+    def transform(self, processed_texts):
+        """
+        Builds the TF-IDF rows of a batch in CSR form
+        
+        Args:
+            processed_texts (list): Preprocessed texts
+        
+        Returns:
+            tuple: (indptr, indices, data) arrays
+        """
+        token_lists = []
+        for text in processed_texts:
+            if self.lowercase:
+                text = text.lower()
+            token_lists.append(self._token_regex.findall(text))
+        return self.transform_tokens(token_lists)
+    
+    def transform_words(self, word_lists):
+        """
+        Builds the TF-IDF rows straight from preprocessed word lists
+        
+        Skips joining the words and re-tokenizing them. Preprocessed words
+        are lowercase letters only, so with the default token pattern the
+        vectorizer's tokens are exactly the words of two or more letters.
+        """
+        if self.token_pattern != DEFAULT_TOKEN_PATTERN:
+            return self.transform([' '.join(words) for words in word_lists])
+        
+        return self.transform_tokens([
+            [word for word in words if len(word) > 1]
+            for words in word_lists
+        ])
+    
+    def transform_tokens(self, token_lists):
+        """Builds the TF-IDF rows of already tokenized texts in CSR form"""
+        vocabulary = self.vocabulary
+        indptr = [0]
+        indices = []
+        counts = []
+        
+        for tokens in token_lists:
+            row = {}
+            for token in tokens:
+                index = vocabulary.get(token)
+                if index is not None:
+                    row[index] = row.get(index, 0) + 1
+            for index in sorted(row):
+                indices.append(index)
+                counts.append(row[index])
+            indptr.append(len(indices))
+        
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        data = np.asarray(counts, dtype=np.float64)
+        
+        if self.sublinear_tf:
+            data = np.log(data) + 1
+        data *= self.idf[indices]
+        
+        if self.norm is not None:
+            row_ids = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+            if self.norm == 'l2':
+                norms = np.sqrt(np.bincount(row_ids, weights=data * data, minlength=len(indptr) - 1))
+            else:
+                norms = np.bincount(row_ids, weights=np.abs(data), minlength=len(indptr) - 1)
+            norms[norms == 0] = 1
+            data /= norms[row_ids]
+        
+        return indptr, indices, data
+    
+    def decision_function(self, rows):
+        """
+        Raw linear scores: one sparse dot product against the coefficients
+        
+        Args:
+            rows (tuple): (indptr, indices, data) CSR arrays
+        
+        Returns:
+            ndarray: (n_samples, n_outputs) scores
+        """
+        indptr, indices, data = rows
+        n_samples = len(indptr) - 1
+        row_ids = np.repeat(np.arange(n_samples), np.diff(indptr))
+        contributions = self._coef_t[indices] * data[:, None]
+        
+        scores = np.empty((n_samples, self._coef_t.shape[1]))
+        for k in range(scores.shape[1]):
+            scores[:, k] = np.bincount(row_ids, weights=contributions[:, k], minlength=n_samples)
+        return scores + self.intercept
+    
+    def class_scores(self, decisions):
+        """
+        Per-class scores in the same form as the sklearn decision_function
+        
+        One-vs-one decisions are turned into one-vs-rest scores (votes plus
+        bounded confidences, as sklearn does); binary models keep a single
+        column for the positive class.
+        """
+        if self.scheme == 'ovr':
+            return decisions
+        
+        n_classes = len(self.classes)
+        if n_classes == 2:
+            return -decisions
+        
+        n_samples = decisions.shape[0]
+        votes = np.zeros((n_samples, n_classes))
+        confidences = np.zeros((n_samples, n_classes))
+        k = 0
+        for i in range(n_classes):
+            for j in range(i + 1, n_classes):
+                confidences[:, i] += decisions[:, k]
+                confidences[:, j] -= decisions[:, k]
+                votes[:, i] += decisions[:, k] >= 0
+                votes[:, j] += decisions[:, k] < 0
+                k += 1
+        return votes + confidences / (3 * (np.abs(confidences) + 1))
+    
+    def predict_scores(self, rows):
+        """
+        Predicts labels and class probabilities
+        
+        Args:
+            rows (tuple): (indptr, indices, data) CSR arrays
+        
+        Returns:
+            tuple: (labels, probabilities)
+        """
+        decisions = self.decision_function(rows)
+        
+        if self.calibration == 'libsvm':
+            return self._predict_libsvm(decisions)
+        
+        scores = self.class_scores(decisions)
+        probabilities = apply_calibration(
+            self.calibration, self.calibration_params, scores, len(self.classes)
+        )
+        
+        if self.calibration == 'logistic' and scores.shape[1] > 1:
+            labels = self.classes[np.argmax(scores, axis=1)]
+        else:
+            labels = self.classes[np.argmax(probabilities, axis=1)]
+        return labels, probabilities
+    
+    def _predict_libsvm(self, decisions):
+        """libsvm one-vs-one voting and pairwise-coupled probabilities"""
+        n_samples = decisions.shape[0]
+        n_classes = len(self.classes)
+        
+        fApB = decisions * self.calibration_params['prob_a'] + self.calibration_params['prob_b']
+        estimates = np.clip(expit(-fApB), LIBSVM_MIN_PROB, 1 - LIBSVM_MIN_PROB)
+        
+        votes = np.zeros((n_samples, n_classes), dtype=np.int64)
+        pairwise = np.zeros((n_samples, n_classes, n_classes))
+        k = 0
+        for i in range(n_classes):
+            for j in range(i + 1, n_classes):
+                wins = decisions[:, k] > 0
+                votes[:, i] += wins
+                votes[:, j] += ~wins
+                pairwise[:, i, j] = estimates[:, k]
+                pairwise[:, j, i] = 1 - estimates[:, k]
+                k += 1
+        
+        labels = self.classes[np.argmax(votes, axis=1)]
+        
+        if n_classes == 2:
+            probabilities = np.column_stack([pairwise[:, 0, 1], pairwise[:, 1, 0]])
+        else:
+            probabilities = libsvm_pairwise_coupling(pairwise, n_classes)
+        return labels, probabilities
+    
+    def save(self, path):
+        """
+        Saves the compiled model as an artifact directory
+        
+        Layout:
+            manifest.json       format version, settings, classes, fingerprint
+            vocabulary.txt      one term per line, line number = feature index
+            idf.npy             (n_features,)
+            coef_t.npy          (n_features, n_scores), transposed for scoring
+            intercept.npy       (n_scores,)
+            calibration_*.npy   calibration parameters
+            stem_table.tsv      word<TAB>stem, optional
+        
+        The directory is written next to path as <name>@<fingerprint>, and
+        path is a relative symlink to it, replaced atomically. Readers
+        resolve the link once, so they load either the previous artifact
+        or the new one, never a mix or nothing. The previous target is
+        kept for readers still loading it, older ones are deleted. A plain
+        directory left at path by an older version is moved away first,
+        the only moment path is missing.
+        """
+        path = Path(path)
+        target = path.with_name(f'{path.name}@{self.fingerprint()}')
+        tmp_path = path.with_name(f'{target.name}.tmp-{os.getpid()}')
+        if tmp_path.exists():
+            shutil.rmtree(tmp_path)
+        tmp_path.mkdir(parents=True)
+        
+        terms = [None] * len(self.vocabulary)
+        for term, index in self.vocabulary.items():
+            terms[index] = term
+        (tmp_path / 'vocabulary.txt').write_text('\n'.join(terms) + '\n', encoding='utf-8')
+        
+        arrays = {
+            'idf': self.idf,
+            'coef_t': self._coef_t,
+            'intercept': self.intercept,
+            **{f'calibration_{name}': value for name, value in self.calibration_params.items()}
+        }
+        for name, value in arrays.items():
+            np.save(tmp_path / f'{name}.npy', np.ascontiguousarray(value), allow_pickle=False)
+        
+        if self.stem_table:
+            lines = (f'{word}\t{stem}' for word, stem in self.stem_table.items())
+            (tmp_path / 'stem_table.tsv').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        
+        manifest = {
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'fingerprint': self.fingerprint(),
+            'classes': [str(label) for label in self.classes],
+            'scheme': self.scheme,
+            'calibration': self.calibration,
+            'calibration_params': sorted(self.calibration_params),
+            'token_pattern': self.token_pattern,
+            'lowercase': self.lowercase,
+            'sublinear_tf': self.sublinear_tf,
+            'norm': self.norm,
+            'backend': self.backend,
+            'fitted_calibration': self.fitted_calibration
+        }
+        (tmp_path / 'manifest.json').write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        
+        try:
+            tmp_path.rename(target)
+        except OSError:
+            # Same content already saved
+            shutil.rmtree(tmp_path)
+        
+        previous = None
+        if path.is_symlink():
+            previous = os.readlink(path)
+        elif path.is_dir():
+            legacy_path = path.with_name(f'{path.name}.old-{os.getpid()}')
+            path.rename(legacy_path)
+            shutil.rmtree(legacy_path)
+        
+        link_path = path.with_name(f'{path.name}.link-{os.getpid()}')
+        if link_path.is_symlink():
+            link_path.unlink()
+        os.symlink(target.name, link_path)
+        os.replace(link_path, path)
+        
+        # Another process may have saved in the meantime, its target stays
+        keep = {target.name, previous, os.readlink(path)}
+        for stale in path.parent.glob(f'{path.name}@*'):
+            if stale.name not in keep and '.tmp-' not in stale.name:
+                shutil.rmtree(stale, ignore_errors=True)
+    
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Loads a compiled model saved with save()
+        
+        With mmap the arrays are memory-mapped read-only, so every worker
+        process loading the same artifact shares its physical pages.
+        """
+        # Every file is read from the directory the link points to now
+        path = Path(path).resolve(strict=True)
+        
+        manifest = json.loads((path / 'manifest.json').read_text(encoding='utf-8'))
+        if manifest['format_version'] != ARTIFACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model version: {manifest['format_version']}")
+        
+        mmap_mode = 'r' if mmap else None
+        
+        def load_array(name):
+            return np.load(path / f'{name}.npy', mmap_mode=mmap_mode, allow_pickle=False)
+        
+        terms = (path / 'vocabulary.txt').read_text(encoding='utf-8').splitlines()
+        
+        stem_table = {}
+        stem_path = path / 'stem_table.tsv'
+        if stem_path.exists():
+            for line in stem_path.read_text(encoding='utf-8').splitlines():
+                word, stem = line.split('\t')
+                stem_table[word] = stem
+        
+        compiled = cls(
+            classes=np.array(manifest['classes']),
+            vocabulary={term: index for index, term in enumerate(terms)},
+            idf=load_array('idf'),
+            # Transposed view of the C-contiguous file, so no copy is made
+            coef=load_array('coef_t').T,
+            intercept=load_array('intercept'),
+            scheme=manifest['scheme'],
+            calibration=manifest['calibration'],
+            calibration_params={
+                name: load_array(f'calibration_{name}')
+                for name in manifest['calibration_params']
+            },
+            token_pattern=manifest['token_pattern'],
+            lowercase=manifest['lowercase'],
+            sublinear_tf=manifest['sublinear_tf'],
+            norm=manifest['norm'],
+            backend=manifest.get('backend'),
+            fitted_calibration=manifest.get('fitted_calibration', False),
+            stem_table=stem_table
+        )
+        compiled._fingerprint = manifest.get('fingerprint')
+        return compiled
+
+def _dense(matrix):
+    """Converts a possibly sparse coefficient matrix to a dense array"""
+    if hasattr(matrix, 'toarray'):
+        matrix = matrix.toarray()
+    return np.asarray(matrix, dtype=np.float64)
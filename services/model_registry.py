@@ -0,0 +1,222 @@
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from config import MODEL_CONFIG
+from utils.file_lock import FileLock
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Versions are model fingerprints (hex content hashes)
+VERSION_PATTERN = re.compile(r'^[0-9a-f]{8,64}$')
+
+class ModelRegistry:
+    """
+    Directory of versioned model artifacts
+    
+    Layout:
+        <root>/<version>/model/              compiled artifact (memory-mapped)
+        <root>/<version>/sentiment_model.pkl sklearn model
+        <root>/<version>/metadata.json       training time, dataset hash, metrics
+        <root>/ACTIVE                        version served by every worker
+        <root>/SHADOW                        candidate scored in shadow mode
+        <root>/history.json                  activations, newest last
+        <root>/.lock                         held while pointers are updated
+    
+    The version is the model's content hash, so registering the same model
+    twice is a no-op. Activating a version only rewrites the ACTIVE pointer:
+    running workers notice it and swap the model in without a restart.
+    Pointer and history updates take a file lock, so concurrent activations
+    from several server processes never lose a history entry.
+    """
+    
+    def __init__(self, root):
+        self.root = Path(root)
+    
+    def path(self, version):
+        """Directory of a version"""
+        if not VERSION_PATTERN.match(version or ''):
+            raise ValueError(f"Invalid model version: {version}")
+        return self.root / version
+    
+    def register(self, analyzer, metrics=None, dataset_hash=None):
+        """
+        Saves a trained analyzer as a new version
+        
+        Args:
+            analyzer (SentimentAnalyzer): Trained and compiled
+            metrics (dict): Training metrics
+            dataset_hash (str): Fingerprint of the training data
+        
+        Returns:
+            dict: Metadata of the version
+        """
+        version = analyzer.model_version
+        path = self.path(version)
+        if path.exists():
+            return self.get(version)
+        
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / f'.{version}.tmp-{os.getpid()}'
+        if tmp_path.exists():
+            shutil.rmtree(tmp_path)
+        tmp_path.mkdir()
+        
+        analyzer.save_model(tmp_path / 'sentiment_model.pkl', tmp_path / 'model')
+        info = analyzer.get_model_info()
+        metadata = {
+            'version': version,
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()),
+            'backend': info['backend'],
+            'calibration': info['calibration'],
+            'classes': info['classes'],
+            'dataset_hash': dataset_hash,
+            'metrics': metrics
+        }
+        (tmp_path / 'metadata.json').write_text(json.dumps(metadata, indent=2, default=str), encoding='utf-8')
+        
+        try:
+            tmp_path.rename(path)
+        except OSError:
+            # Registered concurrently by another process
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        
+        logger.info(f"Model version {version} registered in {self.root}")
+        return metadata
+    
+    def get(self, version):
+        """Returns the metadata of a version, None when unknown"""
+        try:
+            metadata_path = self.path(version) / 'metadata.json'
+        except ValueError:
+            return None
+        if not metadata_path.exists():
+            return None
+        return json.loads(metadata_path.read_text(encoding='utf-8'))
+    
+    def list(self):
+        """Returns the metadata of every version, newest first"""
+        if not self.root.exists():
+            return []
+        
+        active = self.active_version()
+        versions = []
+        for path in self.root.iterdir():
+            if path.is_dir() and VERSION_PATTERN.match(path.name):
+                metadata = self.get(path.name)
+                if metadata is not None:
+                    metadata['active'] = path.name == active
+                    versions.append(metadata)
+        versions.sort(key=lambda metadata: metadata['created_at'], reverse=True)
+        return versions
+    
+    def active_version(self):
+        """Version in the ACTIVE pointer, None when nothing was activated"""
+        try:
+            version = (self.root / 'ACTIVE').read_text(encoding='utf-8').strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+    
+    def activate(self, version):
+        """
+        Points every worker at a version
+        
+        Raises:
+            ValueError: Unknown version
+        """
+        with self._locked():
+            return self._activate(version)
+    
+    def rollback(self):
+        """
+        Activates the version that was active before the current one
+        
+        Raises:
+            ValueError: Nothing to roll back to
+        """
+        with self._locked():
+            history = self.history()
+            if not history or not history[-1]['previous']:
+                raise ValueError("No previous model version to roll back to")
+            return self._activate(history[-1]['previous'])
+    
+    def shadow(self):
+        """Shadow settings ({'version', 'sample_rate'}), None when disabled"""
+        try:
+            return json.loads((self.root / 'SHADOW').read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return None
+    
+    def set_shadow(self, version, sample_rate=None):
+        """
+        Points every worker's shadow scoring at a version
+        
+        Args:
+            version (str): Registered version, None to disable shadow scoring
+            sample_rate (float): Fraction of requests scored by the shadow
+        
+        Raises:
+            ValueError: Unknown version or sample rate outside (0, 1]
+        """
+        if version is None:
+            with self._locked():
+                (self.root / 'SHADOW').unlink(missing_ok=True)
+            logger.info("Shadow scoring disabled")
+            return None
+        
+        if self.get(version) is None:
+            raise ValueError(f"Unknown model version: {version}")
+        if sample_rate is None or not 0 < sample_rate <= 1:
+            raise ValueError("Sample rate must be in (0, 1]")
+        
+        shadow = {'version': version, 'sample_rate': sample_rate}
+        with self._locked():
+            self._write('SHADOW', json.dumps(shadow))
+        
+        logger.info(f"Shadow scoring of model version {version} at sample rate {sample_rate}")
+        return shadow
+    
+    def history(self):
+        """Activations, oldest first"""
+        try:
+            return json.loads((self.root / 'history.json').read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return []
+    
+    def _activate(self, version):
+        """Rewrites ACTIVE and appends to the history, under the registry lock"""
+        metadata = self.get(version)
+        if metadata is None:
+            raise ValueError(f"Unknown model version: {version}")
+        
+        previous = self.active_version()
+        self._write('ACTIVE', version)
+        
+        history = self.history()
+        history.append({
+            'version': version,
+            'previous': previous,
+            'activated_at': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        })
+        self._write('history.json', json.dumps(history, indent=2))
+        
+        logger.info(f"Model version {version} activated (was {previous})")
+        return metadata
+    
+    def _locked(self):
+        """Lock of the registry pointers, shared by every server process"""
+        return FileLock(self.root / '.lock')
+    
+    def _write(self, name, content):
+        """Replaces a registry file atomically"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / f'.{name}.tmp-{os.getpid()}'
+        tmp_path.write_text(content, encoding='utf-8')
+        os.replace(tmp_path, self.root / name)
+
+# Global instance
+model_registry = ModelRegistry(MODEL_CONFIG['registry_path'])
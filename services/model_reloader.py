@@ -0,0 +1,128 @@
+import os
+import threading
+from config import MODEL_CONFIG
+from services.sentiment_analyzer import sentiment_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ModelReloader:
+    """
+    Keeps a worker's analyzer on the registry's active version
+    
+    A background thread checks the registry's ACTIVE pointer every
+    interval seconds, or at once after reload_now(), and loads a new
+    version off the request path. The analyzer swaps it in atomically,
+    so activating or rolling back a version never restarts a worker.
+    The registry's shadow settings are followed the same way.
+    """
+    
+    def __init__(self, analyzer, interval=2.0):
+        self.analyzer = analyzer
+        self.interval = interval
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        # Versions that failed to load, per pointer, not retried until it changes
+        self._failed_active = None
+        self._failed_shadow = None
+        self.reloads = 0
+        self.last_error = None
+    
+    def ensure_started(self):
+        """Starts the checking thread, again in a forked worker"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='model-reloader', daemon=True)
+                self._thread.start()
+    
+    def reload_now(self):
+        """Checks the active version right away, in the background"""
+        self.ensure_started()
+        self._wake.set()
+    
+    def check(self):
+        """
+        Loads the active version when it differs from the loaded one
+        
+        Returns:
+            bool: A new version was swapped in
+        """
+        version = self.analyzer.registry.active_version()
+        if version is None or version == self.analyzer.model_version or version == self._failed_active:
+            return False
+        
+        try:
+            self.analyzer.load_version(version)
+        except Exception as e:
+            # Not retried until another version is activated
+            self._failed_active = version
+            self.last_error = f"{version}: {e}"
+            logger.error(f"Error when loading model version {version}: {e}")
+            return False
+        
+        self._failed_active = None
+        self.reloads += 1
+        logger.info(f"Worker {os.getpid()} switched to model version {version}")
+        return True
+    
+    def check_shadow(self):
+        """
+        Starts, changes or stops shadow scoring to match the registry
+        
+        Returns:
+            bool: Shadow scoring was changed
+        """
+        settings = self.analyzer.registry.shadow()
+        shadow = self.analyzer.shadow
+        
+        if settings is None:
+            self._failed_shadow = None
+            if shadow is None:
+                return False
+            self.analyzer.stop_shadow()
+            return True
+        
+        if shadow is not None and (shadow.version, shadow.sample_rate) == (settings['version'], settings['sample_rate']):
+            return False
+        if settings['version'] == self._failed_shadow:
+            return False
+        
+        try:
+            self.analyzer.start_shadow(settings['version'], settings['sample_rate'])
+        except Exception as e:
+            self._failed_shadow = settings['version']
+            self.last_error = f"{settings['version']}: {e}"
+            logger.error(f"Error when loading shadow model version {settings['version']}: {e}")
+            return False
+        
+        self._failed_shadow = None
+        return True
+    
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.check()
+                self.check_shadow()
+            except Exception as e:
+                logger.error(f"Model reloader error: {e}")
+    
+    def stats(self):
+        """Returns the loaded and active versions"""
+        return {
+            'loaded_version': self.analyzer.model_version,
+            'active_version': self.analyzer.registry.active_version(),
+            'reloads': self.reloads,
+            'last_error': self.last_error,
+            'interval': self.interval
+        }
+
+# Global instance
+model_reloader = ModelReloader(sentiment_analyzer, MODEL_CONFIG['reload_interval'])
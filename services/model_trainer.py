@@ -1,23 +1,47 @@
+import hashlib
+import time
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+import numpy as np
+from services.sentiment_analyzer import BACKENDS, build_model, build_vectorizer
+from services.calibration import fit_calibration, brier_score, expected_calibration_error
+from services.feature_cache import FeatureCache
+from services import dataset_loader
 from utils.text_processor import text_processor
-from utils.print_metrics import print_metrics
-from config import MODEL_CONFIG, DATASET_CONFIG
+from utils.print_metrics import print_metrics, print_backend_comparison
+from config import MODEL_CONFIG, DATASET_CONFIG, TRAINING_CONFIG
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Stages reported to the progress callback of ModelTrainer.train, in order
+TRAINING_STAGES = ('loading_dataset', 'preprocessing', 'vectorizing', 'fitting', 'evaluating', 'saving')
+
+def dataset_hash(df):
+    """Content hash of the labelled texts of a dataset, independent of the file"""
+    rows = pd.util.hash_pandas_object(df[['sentiment', 'tweet']], index=False)
+    return hashlib.sha256(rows.to_numpy().tobytes()).hexdigest()[:16]
+
 class ModelTrainer:
     """Class for training the sentiment-analysis model"""
     
     def __init__(self, analyzer):
         self.analyzer = analyzer
+        
+        if TRAINING_CONFIG['feature_cache']:
+            self.feature_cache = FeatureCache(
+                TRAINING_CONFIG['feature_cache_dir'],
+                TRAINING_CONFIG['feature_cache_size'],
+                TRAINING_CONFIG['feature_cache_min_rows']
+            )
+        else:
+            self.feature_cache = None
     
     def create_sample_dataset(self):
         """Creates a example dataset for demostration"""
         sample_data = {
-            'text': [
+            'tweet': [
                 'I love this product, it is amazing and fantastic!',
                 'This is the worst experience ever, terrible service',
                 'Great quality, highly recommend to everyone',
@@ -64,9 +88,12 @@ class ModelTrainer:
         """
         Loads dataset from a CSV file
         
+        Only the sentiment and tweet columns are loaded, from the CSV's
+        columnar copy when it is up to date.
+        
         Args:
             dataset_path (str)
-            
+        
         Returns:
             DataFrame: Loaded dataset
         """
@@ -74,39 +101,125 @@ class ModelTrainer:
             dataset_path = DATASET_CONFIG['path']
         
         try:
-            df = pd.read_csv(dataset_path, names=["id", "entity", "sentiment", "tweet"])
-            df = df.dropna(subset=['tweet'])
-            df = df[df['sentiment'].str.lower() != 'irrelevant']
+            df = dataset_loader.load_dataset(dataset_path)
             logger.info(f"Dataset loaded from {dataset_path}")
             return df
         except FileNotFoundError:
             logger.warning(f"Dataset not found in {dataset_path}, using example dataset")
             return self.create_sample_dataset()
     
-    def train(self, dataset_path=None, save_model=True):
+    def build_features(self, df, stage=None):
+        """
+        Preprocesses a dataset and fits the TF-IDF vectorizer on it
+        
+        The result is read from the feature cache when the same data was
+        already preprocessed with the same settings, and stored in it
+        otherwise.
+        
+        Args:
+            df (DataFrame): Dataset with a tweet column
+            stage (callable): Called with 'preprocessing' and 'vectorizing'
+        
+        Returns:
+            dict: stem_table, processed_texts, vectorizer, X, dataset_hash
+            and feature_cache ('hit', 'miss' or 'disabled')
+        """
+        def report(name):
+            if stage is not None:
+                stage(name)
+        
+        data_hash = dataset_hash(df)
+        cache = self.feature_cache
+        if cache is not None and len(df) < cache.min_rows:
+            cache = None
+        
+        if cache is not None:
+            key = cache.key(data_hash)
+            start = time.perf_counter()
+            features = cache.load(key, len(df))
+            if features is not None:
+                report('preprocessing')
+                report('vectorizing')
+                load_seconds = time.perf_counter() - start
+                logger.info(
+                    f"Feature cache hit {key}: loaded in {load_seconds:.2f}s instead of "
+                    f"{features['build_seconds']:.2f}s ({features['build_seconds'] - load_seconds:.2f}s saved)"
+                )
+                features.update(dataset_hash=data_hash, feature_cache='hit')
+                return features
+        
+        start = time.perf_counter()
+        report('preprocessing')
+        logger.info("Building stem table...")
+        stem_table = text_processor.build_stem_table(df['tweet'])
+        text_processor.set_stem_table(stem_table)
+        logger.info(f"Stem table: {len(stem_table)} words")
+        
+        logger.info("Preprocessing texts...")
+        processed_texts = text_processor.preprocess_parallel(
+            df['tweet'],
+            progress=lambda done, total: logger.info(f"Preprocessed {done}/{total} texts")
+        )
+        
+        report('vectorizing')
+        logger.info("Vectorizing texts...")
+        vectorizer = build_vectorizer()
+        X = vectorizer.fit_transform(processed_texts)
+        build_seconds = time.perf_counter() - start
+        
+        features = {
+            'stem_table': stem_table,
+            'processed_texts': processed_texts,
+            'vectorizer': vectorizer,
+            'X': X,
+            'dataset_hash': data_hash,
+            'feature_cache': 'disabled'
+        }
+        
+        if cache is not None:
+            logger.info(f"Feature cache miss {key}, features built in {build_seconds:.2f}s")
+            try:
+                cache.save(key, data_hash, features, build_seconds)
+                features['feature_cache'] = 'miss'
+            except Exception as e:
+                logger.warning(f"Feature cache entry {key} not stored: {e}")
+        
+        return features
+    
+    def train(self, dataset_path=None, save_model=True, progress=None):
         """
         Trains the model with the provided dataset
         
         Args:
             dataset_path (str)
             save_model (bool): Save model after training
-            
+            progress (callable): Called with each stage name of TRAINING_STAGES
+        
         Returns:
             dict: Training metrics
         """
+        def stage(name):
+            if progress is not None:
+                progress(name)
+        
         logger.info("Initializing training model...")
         
+        stage('loading_dataset')
         df = self.load_dataset(dataset_path)
         
         logger.info(f"Dataset loaded: {len(df)} examples")
         logger.info(f"Dataset columns: {df.columns}")
         logger.info(f"Class distribution:\n{df['sentiment'].value_counts()}")
         
-        logger.info("Preprocessing texts...")
-        df['processed_text'] = df['tweet'].apply(text_processor.preprocess)
+        features = self.build_features(df, stage)
+        self.analyzer.stem_table = features['stem_table']
+        text_processor.set_stem_table(self.analyzer.stem_table)
+        self.analyzer.vectorizer = features['vectorizer']
         
-        logger.info("Vectorizing texts...")
-        X = self.analyzer.vectorizer.fit_transform(df['processed_text'])
+        calibration = MODEL_CONFIG['calibration']
+        self.analyzer.model = build_model(self.analyzer.backend, calibration)
+        self.analyzer.calibration = None
+        X = features['X']
         y = df['sentiment']
         
         X_train, X_test, y_train, y_test = train_test_split(
@@ -116,18 +229,50 @@ class ModelTrainer:
             stratify=y
         )
         
+        if calibration != 'native':
+            # Held-out split of the training set to fit the calibration
+            X_train, X_calibration, y_train, y_calibration = train_test_split(
+                X_train, y_train,
+                test_size=MODEL_CONFIG['calibration_size'],
+                random_state=MODEL_CONFIG['random_state'],
+                stratify=y_train
+            )
+            logger.info(f"Calibration set: {X_calibration.shape[0]} examples")
+        
         logger.info(f"Training set: {X_train.shape[0]} examples")
         logger.info(f"Testing set: {X_test.shape[0]} examples")
         
-        logger.info("Training SVM model...")
+        stage('fitting')
+        logger.info(f"Training {self.analyzer.backend} model...")
+        start = time.perf_counter()
         self.analyzer.model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+        
+        classes = self.analyzer.model.classes_
         
-        y_pred_train = self.analyzer.model.predict(X_train)
-        y_pred_test = self.analyzer.model.predict(X_test)
+        if calibration != 'native':
+            logger.info(f"Fitting {calibration} calibration...")
+            decisions = self.analyzer.model.decision_function(X_calibration)
+            self.analyzer.calibration = {
+                'kind': calibration,
+                'params': fit_calibration(
+                    calibration,
+                    np.asarray(decisions).reshape(X_calibration.shape[0], -1),
+                    np.searchsorted(classes, y_calibration)
+                )
+            }
+        
+        stage('evaluating')
+        y_pred_train, _ = self.analyzer.predict_matrix(X_train)
+        y_pred_test, test_probabilities = self.analyzer.predict_matrix(X_test)
         
         train_accuracy = accuracy_score(y_train, y_pred_train)
         test_accuracy = accuracy_score(y_test, y_pred_test)
         
+        y_test_index = np.searchsorted(classes, y_test)
+        test_brier = brier_score(test_probabilities, y_test_index)
+        test_ece = expected_calibration_error(test_probabilities, y_test_index)
+        
         report = classification_report(
             y_test, y_pred_test,
             output_dict=True,
@@ -136,52 +281,132 @@ class ModelTrainer:
         
         conf_matrix = confusion_matrix(y_test, y_pred_test)
         
+        self.analyzer.compile()
         self.analyzer.is_trained = True
         
-        if save_model:
-            self.analyzer.save_model()
-        
         metrics = {
             'train_accuracy': float(train_accuracy),
             'test_accuracy': float(test_accuracy),
+            'test_brier': test_brier,
+            'test_ece': test_ece,
+            'calibration': calibration,
             'train_samples': int(X_train.shape[0]),
             'test_samples': int(X_test.shape[0]),
+            'backend': self.analyzer.backend,
+            'fit_seconds': fit_seconds,
             'classes': list(self.analyzer.model.classes_),
             'classification_report': report,
-            'confusion_matrix': conf_matrix.tolist()
+            'confusion_matrix': conf_matrix.tolist(),
+            'dataset_hash': features['dataset_hash'],
+            'feature_cache': features['feature_cache']
         }
         
+        if save_model:
+            stage('saving')
+            registry = self.analyzer.registry
+            registry.activate(registry.register(self.analyzer, metrics, metrics['dataset_hash'])['version'])
+        
         print_metrics(metrics)
         
         return metrics
     
+    def compare_backends(self, dataset_path=None, backends=BACKENDS):
+        """
+        Trains every backend on the same split and compares training time
+        
+        The analyzer is not modified, a fresh vectorizer and model are
+        built for the comparison.
+        
+        Args:
+            dataset_path (str)
+            backends (tuple): Backend names to compare
+        
+        Returns:
+            list: One dict per backend with timings and accuracy
+        """
+        df = self.load_dataset(dataset_path)
+        
+        logger.info(f"Comparing backends on {len(df)} examples: {', '.join(backends)}")
+        X = self.build_features(df)['X']
+        y = df['sentiment']
+        
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y,
+            test_size=MODEL_CONFIG['test_size'],
+            random_state=MODEL_CONFIG['random_state'],
+            stratify=y
+        )
+        
+        results = []
+        for backend in backends:
+            model = build_model(backend)
+            
+            start = time.perf_counter()
+            model.fit(X_train, y_train)
+            fit_seconds = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            y_pred = model.predict(X_test)
+            model.predict_proba(X_test)
+            predict_seconds = time.perf_counter() - start
+            
+            results.append({
+                'backend': backend,
+                'fit_seconds': fit_seconds,
+                'predict_seconds': predict_seconds,
+                'test_accuracy': float(accuracy_score(y_test, y_pred)),
+                'train_samples': int(X_train.shape[0]),
+                'test_samples': int(X_test.shape[0])
+            })
+            logger.info(f"Backend {backend} trained in {fit_seconds:.2f}s")
+        
+        print_backend_comparison(results)
+        
+        return results
+    
     def evaluate_predictions(self, texts, true_sentiments):
         """
         Evaluates model predictions
         
+        Texts the analyzer rejects (empty or not a string) get no
+        prediction, they are left out of the metrics and counted in
+        'unscored'.
+        
         Args:
             texts (list)
             true_sentiments (list)
-            
+        
         Returns:
             dict: Evaluation metrics
+        
+        Raises:
+            ValueError: No text could be scored
         """
-        predictions = [
-            self.analyzer.analyze(text)['sentiment']
-            for text in texts
-        ]
+        y_true = []
+        y_pred = []
+        unscored = 0
+        for result, true_sentiment in zip(self.analyzer.analyze_batch(list(texts)), true_sentiments):
+            if 'error' in result:
+                unscored += 1
+                continue
+            y_true.append(true_sentiment)
+            y_pred.append(result['sentiment'])
         
-        accuracy = accuracy_score(true_sentiments, predictions)
+        if not y_pred:
+            raise ValueError("No text could be scored")
+        
+        accuracy = accuracy_score(y_true, y_pred)
         report = classification_report(
-            true_sentiments,
-            predictions,
+            y_true,
+            y_pred,
             output_dict=True,
             zero_division=0
         )
         
         return {
             'accuracy': float(accuracy),
-            'classification_report': report
+            'classification_report': report,
+            'unscored': unscored
         }
 
 def train_model(dataset_path=None):
@@ -190,4 +415,11 @@ def train_model(dataset_path=None):
     
     trainer = ModelTrainer(sentiment_analyzer)
     metrics = trainer.train(dataset_path)
-    return metrics
\ No newline at end of file
+    return metrics
+
+def compare_backends(dataset_path=None):
+    """Helper function for comparing training backends"""
+    from services.sentiment_analyzer import sentiment_analyzer
+    
+    trainer = ModelTrainer(sentiment_analyzer)
+    return trainer.compare_backends(dataset_path)
\ No newline at end of file
@@ -1,25 +1,158 @@
+import os
 import pickle
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.svm import SVC
+import threading
+import numpy as np
+from services.linear_kernel import CompiledModel, apply_calibration
+from services.model_registry import model_registry
+from services.result_cache import ResultCache
+from services.shared_cache import SharedResultCache
+from services.shadow_scorer import ShadowScorer
 from utils.text_processor import text_processor
-from config import MODEL_CONFIG
+from config import MODEL_CONFIG, CACHE_CONFIG, SHADOW_CONFIG
 import logging
 
 logger = logging.getLogger(__name__)
 
-class SentimentAnalyzer:
-    """Service for sentiment analysis using SVM"""
+BACKENDS = ('svc', 'linear_svc', 'sgd')
+
+def build_vectorizer():
+    """Builds an unfitted TF-IDF vectorizer"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
     
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(
-            max_features=MODEL_CONFIG['max_features']
-        )
-        self.model = SVC(
+    return TfidfVectorizer(
+        max_features=MODEL_CONFIG['max_features']
+    )
+
+def build_model(backend, calibration='native'):
+    """
+    Builds an untrained linear classifier for the given backend
+    
+    With native calibration every backend exposes predict and
+    predict_proba, so analyze() keeps the same output contract whichever
+    one is used. Otherwise the bare classifier is built and the trainer
+    fits a closed-form calibration on its decision function.
+    
+    Args:
+        backend (str): 'svc', 'linear_svc' or 'sgd'
+        calibration (str): 'native', 'temperature' or 'sigmoid'
+    
+    Returns:
+        Untrained sklearn classifier
+    """
+    random_state = MODEL_CONFIG['random_state']
+    native = calibration == 'native'
+    
+    if backend == 'svc':
+        from sklearn.svm import SVC
+        
+        # libsvm: roughly quadratic in samples, Platt scaling adds an internal CV
+        return SVC(
             kernel='linear',
-            probability=True,
-            random_state=MODEL_CONFIG['random_state']
+            probability=native,
+            random_state=random_state
         )
+    
+    if backend == 'linear_svc':
+        from sklearn.svm import LinearSVC
+        from sklearn.calibration import CalibratedClassifierCV
+        
+        if not native:
+            return LinearSVC(random_state=random_state)
+        
+        # liblinear SVM, probabilities from a sigmoid fitted on CV predictions
+        return CalibratedClassifierCV(
+            LinearSVC(random_state=random_state),
+            method='sigmoid',
+            cv=3,
+            ensemble=False
+        )
+    
+    if backend == 'sgd':
+        from sklearn.linear_model import SGDClassifier
+        
+        # Logistic loss gives probabilities directly
+        return SGDClassifier(
+            loss='log_loss',
+            random_state=random_state
+        )
+    
+    raise ValueError(f"Unknown model backend: {backend}")
+
+def predict_with(model, calibration, X):
+    """
+    Predicts labels and class probabilities for a TF-IDF matrix
+    
+    Without a fitted calibration the model's own predict_proba is used,
+    otherwise probabilities come in closed form from decision_function.
+    """
+    if calibration is None:
+        return model.predict(X), model.predict_proba(X)
+    
+    decisions = model.decision_function(X)
+    scores = np.asarray(decisions).reshape(X.shape[0], -1)
+    probabilities = apply_calibration(
+        calibration['kind'], calibration['params'], scores, len(model.classes_)
+    )
+    return model.classes_[np.argmax(probabilities, axis=1)], probabilities
+
+class ActiveModel:
+    """
+    Everything scoring needs, replaced as a whole when the model changes
+    
+    Requests read the analyzer's active model once and use it until they
+    finish, so swapping it is a single assignment: requests in flight end
+    on the old model, new ones get the new model, and no lock is taken.
+    """
+    
+    def __init__(self, compiled, model=None, vectorizer=None, calibration=None):
+        self.compiled = compiled
+        self.model = model
+        self.vectorizer = vectorizer
+        self.calibration = calibration
+        self.version = compiled.fingerprint()
+        self.classes = [str(label) for label in compiled.classes]
+
+class SentimentAnalyzer:
+    """Service for sentiment analysis using SVM"""
+    
+    def __init__(self, backend=None):
+        self.backend = backend or MODEL_CONFIG['backend']
+        self.vectorizer = None
+        self.model = None
+        self.calibration = None
+        self.stem_table = {}
+        self.compiled = None
+        self.active = None
         self.is_trained = False
+        self.registry = model_registry
+        self.shadow = None
+        self._load_lock = threading.Lock()
+        
+        if CACHE_CONFIG['enabled']:
+            self.result_cache = ResultCache(CACHE_CONFIG['maxsize'], CACHE_CONFIG['ttl'])
+        else:
+            self.result_cache = None
+        
+        self.shared_cache = None
+        if CACHE_CONFIG['shared_enabled']:
+            try:
+                self.shared_cache = SharedResultCache(
+                    CACHE_CONFIG['shared_path'], CACHE_CONFIG['shared_maxsize']
+                )
+            except Exception as e:
+                logger.warning(f"Shared result cache disabled: {e}")
+    
+    @property
+    def classes(self):
+        """Sentiment labels in probability column order"""
+        if self.active is not None:
+            return self.active.classes
+        return [str(label) for label in self.model.classes_]
+    
+    @property
+    def model_version(self):
+        """Content hash of the active model, None before training"""
+        return self.active.version if self.active is not None else None
     
     def analyze(self, text):
         """
@@ -27,72 +160,241 @@ class SentimentAnalyzer:
         
         Args:
             text (str)
-            
+        
         Returns:
             dict: Dict with sentiment, confidence and probabilities
         """
-        if not self.is_trained:
+        active = self.active
+        if not self.is_trained or active is None:
             raise Exception("The model hasn't trained yet")
         
-        processed_text = text_processor.preprocess(text)
+        words = text_processor.tokenize_fused(text)
+        processed_text = ' '.join(words)
         
-        X = self.vectorizer.transform([processed_text])
+        sentiments, probabilities = self._score_cached(active, [words], [processed_text])
+        result = self._build_result(active, text, processed_text, sentiments[0], probabilities[0])
         
-        sentiment = self.model.predict(X)[0]
-        probabilities = self.model.predict_proba(X)[0]
-        confidence = max(probabilities)
+        shadow = self.shadow
+        if shadow is not None and shadow.sample():
+            shadow.offer(active, [words], sentiments)
+        
+        logger.info(f"Analysis completed: {result['sentiment']} ({result['confidence']:.2%})")
+        return result
+    
+    def analyze_batch(self, texts):
+        """
+        Analizes multiple texts with a single vectorizer and model call
+        
+        Invalid items (non-string or empty texts) get an 'error' entry
+        instead of failing the whole batch.
+        
+        Args:
+            texts (list)
+        
+        Returns:
+            list: One dict per text, in the same order
+        """
+        active = self.active
+        if not self.is_trained or active is None:
+            raise Exception("The model hasn't trained yet")
+        
+        results = [None] * len(texts)
+        valid_indexes = []
+        word_lists = []
+        
+        for i, text in enumerate(texts):
+            if not isinstance(text, str):
+                results[i] = {'original_text': text, 'error': 'Text must be a string'}
+            elif not text.strip():
+                results[i] = {'original_text': text, 'error': 'Text cannot be empty'}
+            else:
+                valid_indexes.append(i)
+                word_lists.append(text_processor.tokenize_fused(text))
+        
+        if valid_indexes:
+            processed_texts = [' '.join(words) for words in word_lists]
+            sentiments, probabilities = self._score_cached(active, word_lists, processed_texts)
+            
+            for row, i in enumerate(valid_indexes):
+                results[i] = self._build_result(
+                    active, texts[i], processed_texts[row], sentiments[row], probabilities[row]
+                )
+            
+            shadow = self.shadow
+            if shadow is not None and shadow.sample():
+                shadow.offer(active, word_lists, sentiments)
+        
+        logger.info(f"Batch analysis completed: {len(valid_indexes)}/{len(texts)} texts analyzed")
+        return results
+    
+    def _score_cached(self, active, word_lists, processed_texts):
+        """
+        Scores preprocessed texts, reusing cached results
+        
+        The cache key is the model version plus the processed text, so
+        texts that preprocess to the same words share one entry. Lookups
+        go to the in-process cache first, then to the shared cache, and
+        only the remaining misses go through the model, in a single batch.
+        """
+        if self.result_cache is None and self.shared_cache is None:
+            return self._score(active, word_lists, processed_texts)
         
+        version = active.version
+        
+        sentiments = [None] * len(processed_texts)
+        probabilities = [None] * len(processed_texts)
+        missing = []
+        
+        for i, processed_text in enumerate(processed_texts):
+            cached = None
+            if self.result_cache is not None:
+                cached = self.result_cache.get((version, processed_text))
+            if cached is None:
+                missing.append(i)
+            else:
+                sentiments[i], probabilities[i] = cached
+        
+        if missing and self.shared_cache is not None:
+            shared = self.shared_cache.get_many(
+                version, [processed_texts[i] for i in missing]
+            )
+            still_missing = []
+            for i in missing:
+                cached = shared.get(processed_texts[i])
+                if cached is None:
+                    still_missing.append(i)
+                    continue
+                sentiments[i], probabilities[i] = cached
+                if self.result_cache is not None:
+                    self.result_cache.set((version, processed_texts[i]), cached)
+            missing = still_missing
+        
+        if missing:
+            scored_sentiments, scored_probabilities = self._score(
+                active,
+                [word_lists[i] for i in missing],
+                [processed_texts[i] for i in missing]
+            )
+            computed = {}
+            for i, sentiment, row in zip(missing, scored_sentiments, scored_probabilities):
+                sentiments[i] = str(sentiment)
+                probabilities[i] = tuple(float(prob) for prob in row)
+                computed[processed_texts[i]] = (sentiments[i], probabilities[i])
+                if self.result_cache is not None:
+                    self.result_cache.set((version, processed_texts[i]), computed[processed_texts[i]])
+            
+            if self.shared_cache is not None:
+                self.shared_cache.set_many(version, computed)
+        
+        return sentiments, probabilities
+    
+    def _score(self, active, word_lists, processed_texts):
+        """
+        Predicts labels and class probabilities for preprocessed texts
+        
+        Uses the compiled linear kernel when available, building the TF-IDF
+        rows straight from the word lists, otherwise the sklearn vectorizer
+        and model on the processed texts.
+        """
+        if MODEL_CONFIG['inference'] == 'compiled' or active.model is None:
+            rows = active.compiled.transform_words(word_lists)
+            return active.compiled.predict_scores(rows)
+        
+        X = active.vectorizer.transform(processed_texts)
+        return predict_with(active.model, active.calibration, X)
+    
+    def predict_matrix(self, X):
+        """Predicts labels and class probabilities with the model being trained"""
+        return predict_with(self.model, self.calibration, X)
+    
+    def _build_result(self, active, text, processed_text, sentiment, probabilities):
+        """Builds the analysis dict for a single text"""
         prob_dict = {
-            label: float(prob)
-            for label, prob in zip(self.model.classes_, probabilities)
+            str(label): float(prob)
+            for label, prob in zip(active.classes, probabilities)
         }
         
-        result = {
-            'sentiment': sentiment,
-            'confidence': float(confidence),
+        return {
+            'sentiment': str(sentiment),
+            'confidence': float(max(probabilities)),
             'probabilities': prob_dict,
             'original_text': text,
-            'processed_text': processed_text
+            'processed_text': processed_text,
+            'model_version': active.version
         }
-        
-        logger.info(f"Analysis completed: {sentiment} ({confidence:.2%})")
-        return result
     
-    def analyze_batch(self, texts):
+    def compile(self):
+        """Compiles the trained sklearn model into the linear scoring kernel"""
+        self.compiled = CompiledModel.from_sklearn(
+            self.vectorizer, self.model, self.backend, self.calibration, self.stem_table
+        )
+        logger.info(f"Model compiled: {self.compiled.scheme} scheme, {self.compiled.calibration} calibration")
+        self._model_changed()
+        return self.compiled
+    
+    def _model_changed(self):
+        """Swaps in the current model and invalidates cached results"""
+        self.active = ActiveModel(self.compiled, self.model, self.vectorizer, self.calibration)
+        if self.result_cache is not None:
+            self.result_cache.clear()
+        logger.info(f"Model version: {self.model_version}")
+    
+    def save_model(self, model_path=None, compiled_path=None):
         """
-        Analizes multiple texts
+        Saves the model and vectorizer, plus the compiled artifact
         
         Args:
-            texts (list)
-            
-        Returns:
-            list
+            model_path (Path): Pickle file, MODEL_CONFIG['model_path'] by default
+            compiled_path (Path): Artifact directory, MODEL_CONFIG['compiled_path'] by default
         """
-        return [self.analyze(text) for text in texts]
-    
-    def save_model(self):
-        """Saves the model and vectorizer"""
+        model_path = model_path or MODEL_CONFIG['model_path']
+        compiled_path = compiled_path or MODEL_CONFIG['compiled_path']
         model_data = {
             'model': self.model,
             'vectorizer': self.vectorizer,
+            'backend': self.backend,
+            'calibration': self.calibration,
+            'stem_table': self.stem_table,
             'is_trained': self.is_trained
         }
         
-        with open(MODEL_CONFIG['model_path'], 'wb') as f:
+        with open(model_path, 'wb') as f:
             pickle.dump(model_data, f)
         
-        logger.info(f"Model saved in {MODEL_CONFIG['model_path']}")
+        logger.info(f"Model saved in {model_path}")
+        
+        if self.compiled is not None:
+            self.compiled.save(compiled_path)
+            logger.info(f"Compiled model saved in {compiled_path}")
     
     def load_model(self):
-        """Loads a previously trained model"""
+        """
+        Loads a previously trained model
+        
+        The registry's active version comes first. Without one, the model
+        saved at the MODEL_CONFIG paths is loaded. With compiled inference
+        the compiled artifact is memory-mapped on its own, so sklearn is
+        never imported. Otherwise, or if the artifact is missing, the
+        pickled sklearn model is loaded.
+        """
+        version = self.registry.active_version()
+        if version is not None:
+            try:
+                self.load_version(version)
+                return True
+            except Exception as e:
+                logger.error(f"Error when loading model version {version}: {e}")
+        
+        if MODEL_CONFIG['inference'] == 'compiled' and MODEL_CONFIG['compiled_path'].exists():
+            try:
+                self.load_compiled(MODEL_CONFIG['compiled_path'])
+                logger.info(f"Compiled model loaded from {MODEL_CONFIG['compiled_path']}")
+                return True
+            except Exception as e:
+                logger.error(f"Error when loading compiled model: {e}")
+        
         try:
-            with open(MODEL_CONFIG['model_path'], 'rb') as f:
-                model_data = pickle.load(f)
-            
-            self.model = model_data['model']
-            self.vectorizer = model_data['vectorizer']
-            self.is_trained = model_data.get('is_trained', True)
-            
+            self.load_pickle(MODEL_CONFIG['model_path'])
             logger.info(f"Model loaded from {MODEL_CONFIG['model_path']}")
             return True
         except FileNotFoundError:
@@ -102,6 +404,98 @@ class SentimentAnalyzer:
             logger.error(f"Error when loading model: {e}")
             return False
     
+    def load_version(self, version):
+        """
+        Loads a version of the model registry and swaps it in
+        
+        Args:
+            version (str): Registered model version
+        """
+        path = self.registry.path(version)
+        # Loads build the next active model from the analyzer's attributes
+        with self._load_lock:
+            if MODEL_CONFIG['inference'] == 'compiled' and (path / 'model').exists():
+                self.load_compiled(path / 'model')
+            else:
+                self.load_pickle(path / 'sentiment_model.pkl')
+        logger.info(f"Model version {version} loaded from the registry")
+    
+    def start_shadow(self, version, sample_rate=None):
+        """
+        Scores a sample of requests with a registered version in the background
+        
+        The shadow model gets the words preprocessed for the primary one,
+        and only its compiled artifact is loaded, so the primary model and
+        the text processor are left untouched. Responses always come from
+        the primary model.
+        
+        Args:
+            version (str): Registered model version
+            sample_rate (float): Fraction of requests, SHADOW_CONFIG by default
+        
+        Raises:
+            ValueError: Unknown version
+        """
+        if self.registry.get(version) is None:
+            raise ValueError(f"Unknown model version: {version}")
+        
+        model = ActiveModel(CompiledModel.load(self.registry.path(version) / 'model'))
+        shadow = ShadowScorer(
+            model,
+            SHADOW_CONFIG['sample_rate'] if sample_rate is None else sample_rate,
+            queue_size=SHADOW_CONFIG['queue_size'],
+            max_batch_size=SHADOW_CONFIG['max_batch_size']
+        )
+        
+        previous, self.shadow = self.shadow, shadow
+        if previous is not None:
+            previous.stop()
+        logger.info(f"Shadow scoring with model version {version} ({shadow.sample_rate:.0%} of requests)")
+        return shadow
+    
+    def stop_shadow(self):
+        """Stops shadow scoring"""
+        previous, self.shadow = self.shadow, None
+        if previous is not None:
+            previous.stop()
+            logger.info(f"Shadow scoring with model version {previous.version} stopped")
+    
+    def get_shadow_stats(self):
+        """Returns the shadow comparison statistics"""
+        shadow = self.shadow
+        if shadow is None:
+            return {'enabled': False}
+        return shadow.stats()
+    
+    def load_compiled(self, path):
+        """Loads a compiled model artifact, memory-mapped, without sklearn"""
+        compiled = CompiledModel.load(path)
+        self.compiled = compiled
+        self.backend = compiled.backend or self.backend
+        self.stem_table = compiled.stem_table
+        text_processor.set_stem_table(self.stem_table)
+        self.model = None
+        self.vectorizer = None
+        self.calibration = None
+        self._model_changed()
+        self.is_trained = True
+    
+    def load_pickle(self, path):
+        """Loads a pickled sklearn model and compiles it"""
+        with open(path, 'rb') as f:
+            model_data = pickle.load(f)
+        
+        self.model = model_data['model']
+        self.vectorizer = model_data['vectorizer']
+        self.backend = model_data.get('backend', 'svc')
+        self.calibration = model_data.get('calibration')
+        self.stem_table = model_data.get('stem_table', {})
+        text_processor.set_stem_table(self.stem_table)
+        self.is_trained = model_data.get('is_trained', True)
+        self.compiled = None
+        
+        self.compile()
+    
     def get_model_info(self):
         """Returns information from model"""
         if not self.is_trained:
@@ -110,12 +504,43 @@ class SentimentAnalyzer:
                 'message': 'The model has not trained yet'
             }
         
+        if self.vectorizer is not None:
+            n_features = self.vectorizer.max_features
+        else:
+            n_features = self.compiled.n_features
+        
         return {
             'is_trained': True,
-            'classes': list(self.model.classes_),
-            'n_features': self.vectorizer.max_features,
-            'kernel': self.model.kernel
+            'classes': self.classes,
+            'n_features': n_features,
+            'kernel': 'linear',
+            'model_version': self.model_version,
+            'backend': self.backend,
+            'calibration': self._calibration_name(),
+            'stem_cache': text_processor.stem_stats(),
+            'inference': 'compiled' if self.compiled is not None else 'sklearn'
         }
+    
+    def get_cache_stats(self):
+        """Returns in-process and shared result cache statistics, counted by this process"""
+        if self.result_cache is None:
+            stats = {'enabled': False}
+        else:
+            stats = self.result_cache.stats()
+            stats['enabled'] = True
+        
+        stats['pid'] = os.getpid()
+        stats['model_version'] = self.model_version
+        stats['shared'] = self.shared_cache.stats() if self.shared_cache is not None else {'enabled': False}
+        return stats
+    
+    def _calibration_name(self):
+        """Name of the calibration used for probabilities"""
+        if self.calibration is not None:
+            return self.calibration['kind']
+        if self.compiled is not None and self.compiled.fitted_calibration:
+            return self.compiled.calibration
+        return 'native'
 
 # Global instance
-sentiment_analyzer = SentimentAnalyzer()
\ No newline at end of file
+sentiment_analyzer = SentimentAnalyzer()
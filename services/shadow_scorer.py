@@ -0,0 +1,211 @@
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+from itertools import groupby
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Recent per-text latencies kept for the percentiles
+LATENCY_WINDOW = 10000
+
+class ShadowScorer:
+    """
+    Scores a sample of live requests with a candidate model, off the request path
+    
+    After answering a request the analyzer offers its preprocessed words
+    and primary labels if sample() picks it. They go to a bounded buffer
+    that a background thread drains in batches, scoring them with the
+    shadow model and comparing its labels with the primary's. The
+    primary model scores the same batch again there, so both latencies
+    are measured on the same uncached path: the request's own time would
+    include result cache hits and, with the inference pool, preprocessing
+    and process round trips. offer()
+    never waits: when the buffer is full the sample is dropped, so a
+    slow shadow model can not build backpressure on the callers.
+    """
+    
+    def __init__(self, model, sample_rate, queue_size=2048, max_batch_size=256):
+        self.model = model
+        self.version = model.version
+        self.sample_rate = sample_rate
+        self.queue_size = queue_size
+        self.max_batch_size = max_batch_size
+        self._pending = deque()
+        self._queued = 0
+        self._busy = False
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._started_at = time.time()
+        self._sampled = 0
+        self._dropped = 0
+        self._scored = 0
+        self._agreed = 0
+        self._flips = Counter()
+        self._errors = 0
+        self._last_error = None
+        self._primary_version = None
+        self._primary_latencies = deque(maxlen=LATENCY_WINDOW)
+        self._shadow_latencies = deque(maxlen=LATENCY_WINDOW)
+    
+    def sample(self):
+        """Whether the current request is scored by the shadow model"""
+        return random.random() < self.sample_rate
+    
+    def offer(self, primary, word_lists, sentiments):
+        """
+        Queues a sampled request for shadow scoring
+        
+        Args:
+            primary (ActiveModel): Model that answered the request
+            word_lists (list): Preprocessed words of each text
+            sentiments (list): Primary model labels
+        """
+        if not word_lists:
+            return
+        
+        self._ensure_worker()
+        with self._condition:
+            if self._stopped:
+                return
+            self._sampled += 1
+            if self._queued + len(word_lists) > self.queue_size:
+                self._dropped += len(word_lists)
+                return
+            self._pending.append((primary, word_lists, sentiments))
+            self._queued += len(word_lists)
+            self._condition.notify()
+    
+    def _ensure_worker(self):
+        """Starts the scoring thread, again in a forked child"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='shadow-scorer', daemon=True)
+                self._thread.start()
+    
+    def _run(self):
+        """Worker loop: take up to max_batch_size texts, score and compare them"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                
+                batch = []
+                size = 0
+                while self._pending and size < self.max_batch_size:
+                    entry = self._pending.popleft()
+                    batch.append(entry)
+                    size += len(entry[1])
+                self._queued -= size
+                self._busy = True
+            
+            try:
+                self._process(batch)
+            except Exception as e:
+                with self._lock:
+                    self._errors += 1
+                    self._last_error = str(e)
+                logger.error(f"Shadow scoring error: {e}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+    
+    def _process(self, batch):
+        """Scores one batch with both models and aggregates the comparison"""
+        word_lists = [words for _, entry_words, _ in batch for words in entry_words]
+        
+        started = time.perf_counter()
+        rows = self.model.compiled.transform_words(word_lists)
+        shadow_sentiments, _ = self.model.compiled.predict_scores(rows)
+        shadow_latency = (time.perf_counter() - started) / len(word_lists)
+        
+        # Consecutive entries answered by the same primary model are timed together
+        primary_latencies = []
+        for primary, entries in groupby(batch, key=lambda entry: entry[0]):
+            primary_words = [words for _, entry_words, _ in entries for words in entry_words]
+            started = time.perf_counter()
+            primary.compiled.predict_scores(primary.compiled.transform_words(primary_words))
+            primary_latencies.append((time.perf_counter() - started) / len(primary_words))
+        
+        with self._lock:
+            row = 0
+            for primary, _, sentiments in batch:
+                self._primary_version = primary.version
+                for sentiment in sentiments:
+                    shadow_sentiment = str(shadow_sentiments[row])
+                    row += 1
+                    if shadow_sentiment == sentiment:
+                        self._agreed += 1
+                    else:
+                        self._flips[f'{sentiment}->{shadow_sentiment}'] += 1
+            self._scored += len(word_lists)
+            self._primary_latencies.extend(primary_latencies)
+            self._shadow_latencies.append(shadow_latency)
+    
+    def drain(self, timeout=None):
+        """
+        Waits until every queued sample is scored
+        
+        Returns:
+            bool: False when the timeout expired first
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+    
+    def stop(self):
+        """Stops the scoring thread, discarding queued samples"""
+        with self._condition:
+            self._stopped = True
+            self._pending.clear()
+            self._queued = 0
+            self._condition.notify_all()
+    
+    def stats(self):
+        """Returns agreement, label flips and per-text latency of both models, for this process"""
+        def latency_stats(latencies):
+            latencies = sorted(latencies)
+            if not latencies:
+                return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0}
+            
+            def percentile(q):
+                return round(latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1e6, 2)
+            
+            return {
+                'mean': round(sum(latencies) / len(latencies) * 1e6, 2),
+                'p50': percentile(0.5),
+                'p95': percentile(0.95)
+            }
+        
+        with self._lock:
+            return {
+                'enabled': True,
+                'pid': os.getpid(),
+                'shadow_version': self.version,
+                'primary_version': self._primary_version,
+                'sample_rate': self.sample_rate,
+                'started_at': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(self._started_at)),
+                'sampled_requests': self._sampled,
+                'scored': self._scored,
+                'dropped': self._dropped,
+                'queued': self._queued,
+                'agreement_rate': round(self._agreed / self._scored, 4) if self._scored else None,
+                'flips': dict(self._flips.most_common()),
+                'latency_us_per_text': {
+                    'primary': latency_stats(self._primary_latencies),
+                    'shadow': latency_stats(self._shadow_latencies)
+                },
+                'errors': self._errors,
+                'last_error': self._last_error
+            }
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of host parameters of a single statement
+LOOKUP_CHUNK_SIZE = 500
+
+def text_hash(processed_text):
+    """Stable hash of a processed text, the same in every process"""
+    return hashlib.blake2b(processed_text.encode('utf-8'), digest_size=16).hexdigest()
+
+class SharedResultCache:
+    """
+    Analysis result cache shared by every worker process through SQLite
+    
+    Entries are keyed by (model_version, text hash) and stored in a WAL
+    mode database, so readers never block the writer and the cache
+    survives restarts. Eviction is first-in first-out: rows are numbered
+    by rowid and anything older than the last maxsize rows is deleted.
+    Database errors are logged and treated as misses, the cache never
+    fails an analysis.
+    """
+    
+    def __init__(self, path, maxsize, busy_timeout_ms=2000):
+        self.path = str(path)
+        self.maxsize = maxsize
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+        self._init_database()
+    
+    def _connect(self):
+        """Opens a connection with the cache pragmas"""
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+        return conn
+    
+    def _connection(self):
+        """Per-thread connection, reopened after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    def _init_database(self):
+        """Creates the results table"""
+        conn = self._connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY,
+                model_version TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                sentiment TEXT NOT NULL,
+                probabilities TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                UNIQUE (model_version, text_hash)
+            )
+        ''')
+    
+    def get_many(self, model_version, processed_texts):
+        """
+        Looks up several processed texts
+        
+        Args:
+            model_version (str)
+            processed_texts (list)
+        
+        Returns:
+            dict: Processed text to (sentiment, probabilities) for every hit
+        """
+        hashes = {text_hash(text): text for text in processed_texts}
+        found = {}
+        
+        try:
+            conn = self._connection()
+            keys = list(hashes)
+            for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+                chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f'SELECT text_hash, sentiment, probabilities FROM results '
+                    f'WHERE model_version = ? AND text_hash IN ({placeholders})',
+                    [model_version, *chunk]
+                ).fetchall()
+                for key, sentiment, probabilities in rows:
+                    found[hashes[key]] = (sentiment, tuple(json.loads(probabilities)))
+        except sqlite3.Error as e:
+            self._error('lookup', e)
+            found = {}
+        
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+    
+    def set_many(self, model_version, results):
+        """
+        Stores several results in one transaction and evicts old rows
+        
+        Args:
+            model_version (str)
+            results (dict): Processed text to (sentiment, probabilities)
+        """
+        if not results or self.maxsize <= 0:
+            return
+        
+        now = time.time()
+        rows = [
+            (model_version, text_hash(text), sentiment, json.dumps(list(probabilities)), now)
+            for text, (sentiment, probabilities) in results.items()
+        ]
+        
+        try:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO results '
+                    '(model_version, text_hash, sentiment, probabilities, created_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    rows
+                )
+                conn.execute(
+                    'DELETE FROM results WHERE id <= (SELECT MAX(id) FROM results) - ?',
+                    (self.maxsize,)
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            self._error('write', e)
+            return
+        
+        with self._lock:
+            self.writes += len(rows)
+    
+    def clear(self):
+        """Deletes every stored result, for every model version"""
+        try:
+            self._connection().execute('DELETE FROM results')
+        except sqlite3.Error as e:
+            self._error('clear', e)
+    
+    def stats(self):
+        """Returns size and this process's hit/miss counters"""
+        try:
+            size = self._connection().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        except sqlite3.Error as e:
+            self._error('stats', e)
+            size = None
+        
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'size': size,
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'writes': self.writes,
+                'errors': self.errors
+            }
+    
+    def _error(self, operation, error):
+        """Counts and logs a database error"""
+        with self._lock:
+            self.errors += 1
+        logger.warning(f"Shared result cache {operation} failed: {error}")
@@ -0,0 +1,202 @@
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+from config import MODEL_CONFIG, TRAINING_CONFIG
+from services.sentiment_analyzer import sentiment_analyzer
+from utils.file_lock import FileLock
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{12}$')
+
+def now():
+    """UTC timestamp in the database format"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+
+def write_job(jobs_dir, job):
+    """Writes a job status file atomically, so readers never see half of it"""
+    path = Path(jobs_dir) / f"{job['id']}.json"
+    tmp_path = path.with_name(f'{path.name}.tmp-{os.getpid()}')
+    tmp_path.write_text(json.dumps(job, indent=2, default=str), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+def read_job(jobs_dir, job_id):
+    """Reads a job status file, None for an unknown or malformed id"""
+    if not JOB_ID_PATTERN.match(job_id or ''):
+        return None
+    try:
+        return json.loads((Path(jobs_dir) / f'{job_id}.json').read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return None
+
+def run_training_job(jobs_dir, job_id, registry_path, dataset_path=None):
+    """
+    Body of the training process
+    
+    Trains a private analyzer, so nothing the server is using is touched,
+    and registers the model as a new version. The server process
+    activates it once this process has exited.
+    """
+    from services.sentiment_analyzer import SentimentAnalyzer
+    from services.model_registry import ModelRegistry
+    from services.model_trainer import ModelTrainer, TRAINING_STAGES
+    
+    job = read_job(jobs_dir, job_id)
+    job.update(status='running', started_at=now())
+    write_job(jobs_dir, job)
+    
+    def progress(stage):
+        job.update(stage=stage, progress=round(TRAINING_STAGES.index(stage) / len(TRAINING_STAGES), 2))
+        write_job(jobs_dir, job)
+    
+    try:
+        analyzer = SentimentAnalyzer(backend=job['backend'])
+        metrics = ModelTrainer(analyzer).train(dataset_path, save_model=False, progress=progress)
+        
+        progress('saving')
+        ModelRegistry(registry_path).register(analyzer, metrics, metrics['dataset_hash'])
+        
+        job.update(status='trained', progress=1.0, model_version=analyzer.model_version, metrics=metrics)
+    except Exception as e:
+        job.update(status='failed', error=str(e), finished_at=now())
+    write_job(jobs_dir, job)
+
+class TrainingJobManager:
+    """
+    Runs model training in a separate process and hot-swaps the result
+    
+    The job's status file is updated by the training process as it goes,
+    so any server process can report progress. When training succeeds the
+    new version is activated in the model registry and swapped into the
+    analyzer atomically: requests in flight finish on the old model. One
+    job runs at a time across all server processes: the submitting process
+    holds the running.lock file lock, which records the job id, until the
+    watcher has activated the model.
+    """
+    
+    def __init__(self, analyzer, jobs_dir=None):
+        self.analyzer = analyzer
+        self.registry = analyzer.registry
+        self.jobs_dir = Path(jobs_dir or TRAINING_CONFIG['jobs_dir'])
+        self._watchers = {}
+    
+    def submit(self, backend=None, dataset_path=None):
+        """
+        Starts a training job
+        
+        Args:
+            backend (str): Model backend, MODEL_CONFIG['backend'] by default
+            dataset_path (str): CSV dataset, DATASET_CONFIG path by default
+        
+        Returns:
+            dict: The queued job
+        
+        Raises:
+            RuntimeError: A job is already running
+        """
+        # Held until the watcher has activated the model
+        lock = FileLock(self.jobs_dir / 'running.lock')
+        if not lock.acquire(blocking=False):
+            running = lock.read() or 'of another process'
+            raise RuntimeError(f"Training job {running} is already running")
+        
+        try:
+            job = {
+                'id': uuid.uuid4().hex[:12],
+                'status': 'queued',
+                'stage': None,
+                'progress': 0.0,
+                'backend': backend or MODEL_CONFIG['backend'],
+                'created_at': now(),
+                'started_at': None,
+                'finished_at': None,
+                'model_version': None,
+                'metrics': None,
+                'error': None
+            }
+            lock.write(job['id'])
+            write_job(self.jobs_dir, job)
+            
+            # spawn: the training process shares no state with the server
+            process = multiprocessing.get_context('spawn').Process(
+                target=run_training_job,
+                args=(str(self.jobs_dir), job['id'], str(self.registry.root), dataset_path),
+                name=f"training-{job['id']}"
+            )
+            process.start()
+        except Exception:
+            lock.release()
+            raise
+        
+        watcher = threading.Thread(target=self._watch, args=(job['id'], process, lock), daemon=True)
+        self._watchers[job['id']] = watcher
+        watcher.start()
+        
+        logger.info(f"Training job {job['id']} started ({job['backend']})")
+        return job
+    
+    def _watch(self, job_id, process, lock):
+        """Waits for the training process, activates its model, then releases the job lock"""
+        try:
+            self._finish(job_id, process)
+        finally:
+            lock.release()
+    
+    def _finish(self, job_id, process):
+        """Activates the model of a trained job and records its final status"""
+        process.join()
+        job = read_job(self.jobs_dir, job_id)
+        
+        if job['status'] == 'trained':
+            try:
+                self._activate(job)
+                job.update(status='succeeded', activated=True)
+                logger.info(f"Training job {job_id} succeeded, model {job['model_version']} active")
+            except Exception as e:
+                job.update(status='failed', error=f"Activation failed: {e}")
+        elif job['status'] != 'failed':
+            job.update(status='failed', error=f"Training process exited with code {process.exitcode}")
+        
+        if job['status'] == 'failed':
+            logger.error(f"Training job {job_id} failed: {job['error']}")
+        
+        job['finished_at'] = now()
+        write_job(self.jobs_dir, job)
+    
+    def _activate(self, job):
+        """Activates the job's version for every worker, then swaps it in here"""
+        self.registry.activate(job['model_version'])
+        self.analyzer.load_version(job['model_version'])
+    
+    def wait(self, job_id, timeout=None):
+        """Blocks until a job started by this process is finished and activated"""
+        watcher = self._watchers.get(job_id)
+        if watcher is not None:
+            watcher.join(timeout)
+        return self.get(job_id)
+    
+    def get(self, job_id):
+        """Returns a job, None when unknown"""
+        return read_job(self.jobs_dir, job_id)
+    
+    def list(self, limit=20):
+        """Returns the most recent jobs, newest first"""
+        if not self.jobs_dir.exists():
+            return []
+        
+        jobs = []
+        for path in self.jobs_dir.glob('*.json'):
+            job = read_job(self.jobs_dir, path.stem)
+            if job is not None:
+                jobs.append(job)
+        jobs.sort(key=lambda job: job['created_at'], reverse=True)
+        return jobs[:limit]
+
+# Global instance
+training_jobs = TrainingJobManager(sentiment_analyzer)
@@ -1,17 +1,27 @@
 let allComments = [];
         let currentFilter = 'all';
+        const COMMENTS_PAGE_SIZE = 100;
         
         // Load users on start
         async function loadUsers() {
             try {
-                const response = await fetch('/api/users');
-                const data = await response.json();
+                // Follow the pagination cursors to fill the whole list
+                const users = [];
+                let cursor = null;
+                do {
+                    const url = '/api/users?limit=500' + (cursor ? `&after=${cursor}` : '');
+                    const response = await fetch(url);
+                    const data = await response.json();
+                    users.push(...data.users);
+                    cursor = data.next_cursor;
+                } while (cursor);
+                
                 const select = document.getElementById('userId');
                 select.innerHTML = '<option value="">-- Seleccionar Usuario --</option>';
-                data.users.forEach(user => {
+                users.forEach(user => {
                     select.innerHTML += `<option value="${user.id}">${user.name} (${user.email})</option>`;
                 });
-                document.getElementById('totalUsers').textContent = data.users.length;
+                document.getElementById('totalUsers').textContent = users.length;
             } catch (error) {
                 console.error('Error loading users:', error);
             }
@@ -20,7 +30,8 @@ let allComments = [];
         // Load comments
         async function loadComments() {
             try {
-                const response = await fetch('/api/comments');
+                // Latest page only, totals come from the statistics endpoint
+                const response = await fetch(`/api/comments?limit=${COMMENTS_PAGE_SIZE}`);
                 const data = await response.json();
                 allComments = data.comments;
                 
@@ -32,22 +43,27 @@ let allComments = [];
         }
         
         // Update statistics
-        function updateStatistics() {
-            const total = allComments.length;
-            document.getElementById('totalComments').textContent = total;
-            
-            if (total === 0) {
-                document.getElementById('avgConfidence').textContent = '0%';
-                document.getElementById('positivePercent').textContent = '0%';
-                return;
+        async function updateStatistics() {
+            try {
+                const response = await fetch('/api/comments/statistics');
+                const stats = await response.json();
+                const total = stats.total_comments;
+                document.getElementById('totalComments').textContent = total;
+                
+                if (total === 0) {
+                    document.getElementById('avgConfidence').textContent = '0%';
+                    document.getElementById('positivePercent').textContent = '0%';
+                    return;
+                }
+                
+                document.getElementById('avgConfidence').textContent = stats.average_confidence.toFixed(1) + '%';
+                
+                const positives = stats.by_sentiment.positive ? stats.by_sentiment.positive.total : 0;
+                const positivePercent = (positives / total * 100).toFixed(0);
+                document.getElementById('positivePercent').textContent = positivePercent + '%';
+            } catch (error) {
+                console.error('Error loading statistics:', error);
             }
-            
-            const avgConf = allComments.reduce((sum, c) => sum + c.confidence, 0) / total;
-            document.getElementById('avgConfidence').textContent = avgConf.toFixed(1) + '%';
-            
-            const positives = allComments.filter(c => c.sentiment.toLowerCase() === 'positive').length;
-            const positivePercent = (positives / total * 100).toFixed(0);
-            document.getElementById('positivePercent').textContent = positivePercent + '%';
         }
         
         // Display comments
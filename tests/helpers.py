@@ -0,0 +1,10 @@
+from services.sentiment_analyzer import SentimentAnalyzer
+
+def train_sample_analyzer(backend=None):
+    """Trains a private analyzer on the example dataset"""
+    from services.model_trainer import ModelTrainer
+    
+    analyzer = SentimentAnalyzer(backend=backend)
+    trainer = ModelTrainer(analyzer)
+    trainer.train(dataset_path='missing_dataset.csv', save_model=False)
+    return analyzer
@@ -0,0 +1,41 @@
+from config import MODEL_CONFIG
+from services.sentiment_analyzer import BACKENDS, SentimentAnalyzer
+from services.model_trainer import ModelTrainer
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+def test_backends_keep_analysis_contract():
+    """Tests that every backend returns sentiment, confidence and probabilities"""
+    logger.info("Test: training backends")
+    
+    for backend in BACKENDS:
+        analyzer = train_sample_analyzer(backend)
+        result = analyzer.analyze('Absolutely fantastic, best purchase I ever made')
+        
+        assert result['sentiment'] in ['positive', 'negative', 'neutral']
+        assert set(result['probabilities']) == {'positive', 'negative', 'neutral'}
+        assert abs(sum(result['probabilities'].values()) - 1) < 1e-6
+        assert result['confidence'] == max(result['probabilities'].values())
+        assert analyzer.get_model_info()['backend'] == backend
+        
+        logger.info(f"Backend {backend}: {result['sentiment']} ({result['confidence']:.2%})")
+
+def test_closed_form_calibrations(monkeypatch):
+    """Tests the temperature and sigmoid calibrations fitted by the trainer"""
+    logger.info("Test: closed-form calibrations")
+    
+    for calibration in ('temperature', 'sigmoid'):
+        monkeypatch.setitem(MODEL_CONFIG, 'calibration', calibration)
+        analyzer = SentimentAnalyzer(backend='linear_svc')
+        metrics = ModelTrainer(analyzer).train(dataset_path='missing_dataset.csv', save_model=False)
+        
+        assert 0 <= metrics['test_brier'] <= 2
+        assert 0 <= metrics['test_ece'] <= 1
+        assert analyzer.get_model_info()['calibration'] == calibration
+        
+        result = analyzer.analyze('Terrible quality, very disappointed with purchase')
+        assert abs(sum(result['probabilities'].values()) - 1) < 1e-6
+        
+        logger.info(f"Calibration {calibration}: Brier {metrics['test_brier']:.4f}, ECE {metrics['test_ece']:.4f}")
@@ -0,0 +1,63 @@
+import pytest
+from services.model_trainer import ModelTrainer
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+def test_batch_matches_single_analysis():
+    """Tests that the vectorized batch gives the same results as analyze()"""
+    logger.info("Test: vectorized batch analysis")
+    
+    analyzer = train_sample_analyzer()
+    texts = [
+        'I absolutely love this product, it is amazing!',
+        'This is terrible, worst experience ever',
+        'It is okay, nothing special',
+        'Excellent service, highly recommend!'
+    ]
+    
+    batch_results = analyzer.analyze_batch(texts)
+    
+    assert len(batch_results) == len(texts)
+    for text, batch_result in zip(texts, batch_results):
+        single_result = analyzer.analyze(text)
+        assert batch_result['sentiment'] == single_result['sentiment']
+        assert abs(batch_result['confidence'] - single_result['confidence']) < 1e-9
+        assert batch_result['processed_text'] == single_result['processed_text']
+    
+    logger.info(f"Batch of {len(texts)} texts matches single analysis")
+
+def test_batch_handles_invalid_items():
+    """Tests that invalid items do not fail the whole batch"""
+    logger.info("Test: invalid items in batch")
+    
+    analyzer = train_sample_analyzer()
+    results = analyzer.analyze_batch(['Great quality, love it', '', None, '   '])
+    
+    assert 'sentiment' in results[0]
+    assert results[1]['error'] == 'Text cannot be empty'
+    assert results[2]['error'] == 'Text must be a string'
+    assert results[3]['error'] == 'Text cannot be empty'
+    assert analyzer.analyze_batch([]) == []
+    
+    logger.info("Invalid items reported per item")
+
+def test_evaluate_skips_unscored_texts():
+    """Tests that texts without a prediction are left out of the metrics"""
+    logger.info("Test: evaluation with empty texts")
+    
+    analyzer = train_sample_analyzer()
+    trainer = ModelTrainer(analyzer)
+    texts = ['Great quality, love it', '', 'This is terrible, worst experience ever', '   ']
+    predicted = [result['sentiment'] for result in analyzer.analyze_batch([texts[0], texts[2]])]
+    
+    metrics = trainer.evaluate_predictions(texts, [predicted[0], 'Positive', predicted[1], 'Negative'])
+    
+    assert metrics['accuracy'] == 1.0
+    assert metrics['unscored'] == 2
+    assert metrics['classification_report']['weighted avg']['support'] == 2
+    with pytest.raises(ValueError):
+        trainer.evaluate_predictions([''], ['Positive'])
+    
+    logger.info("Unscored texts excluded and counted")
@@ -0,0 +1,124 @@
+import pytest
+import controllers.comment_controller as comment_controller
+import models.comment as comment_model
+import models.user as user_model
+from controllers.comment_controller import CommentController
+from database.db_manager import DatabaseManager
+from models.comment import Comment
+from models.user import User
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Points the models at an empty database"""
+    manager = DatabaseManager(tmp_path / 'test.db')
+    monkeypatch.setattr(comment_model, 'db_manager', manager)
+    monkeypatch.setattr(user_model, 'db_manager', manager)
+    yield manager
+    manager.close()
+
+def test_create_many(temp_db):
+    """Tests bulk insertion with per-row user and text validation"""
+    logger.info("Test: Comment.create_many")
+    
+    user = User.create("Batch User", "batch@test.com")
+    results = Comment.create_many([
+        (user.id, 'First comment', 'positive', 0.9),
+        (999, 'Unknown user', 'negative', 0.8),
+        (user.id, 'Hi', 'neutral', 0.5),
+        (user.id, 'Second comment', 'neutral', 0.6)
+    ])
+    
+    assert isinstance(results[0], Comment)
+    assert results[0].text == 'First comment'
+    assert results[0].analysis_date is not None
+    assert results[1] == "User not found"
+    assert "at least 3 characters" in results[2]
+    assert results[3].id == results[0].id + 1
+    assert len(Comment.get_all()) == 2
+    assert Comment.create_many([]) == []
+
+def test_create_comments_controller(temp_db, monkeypatch):
+    """Tests the batch endpoint controller with one analyzer call"""
+    logger.info("Test: CommentController.create_comments")
+    
+    analyzer = train_sample_analyzer()
+    monkeypatch.setattr(comment_controller, 'sentiment_analyzer', analyzer)
+    
+    batch_calls = []
+    analyze_batch = analyzer.analyze_batch
+    monkeypatch.setattr(analyzer, 'analyze_batch', lambda texts: batch_calls.append(texts) or analyze_batch(texts))
+    
+    user = User.create("Batch User", "batch@test.com")
+    result = CommentController.create_comments([
+        {'user_id': user.id, 'text': 'Great service, highly recommend'},
+        {'user_id': user.id, 'text': 'Terrible experience, very disappointed'},
+        {'user_id': 999, 'text': 'Nobody wrote this one'},
+        {'user_id': user.id, 'text': 'ok'},
+        {'text': 'Missing user'},
+        'not a dict'
+    ])
+    
+    assert result['success']
+    assert result['created'] == 2
+    assert result['failed'] == 4
+    assert len(batch_calls) == 1
+    
+    items = result['data']
+    assert [item['index'] for item in items] == list(range(6))
+    assert items[0]['success'] and items[0]['analysis']['sentiment'] == items[0]['data']['sentiment']
+    assert items[2]['error'] == 'User not found'
+    assert items[3]['error'] == 'Text must be at least 3 characters'
+    assert items[4]['error'] == 'user_id and text are required'
+    assert items[5]['error'] == 'user_id and text are required'
+    assert len(Comment.get_all()) == 2
+
+def test_create_comments_user_ids(temp_db, monkeypatch):
+    """Tests that user ids sent as text or floats reach the same user, and others are rejected"""
+    logger.info("Test: CommentController.create_comments user ids")
+    
+    monkeypatch.setattr(comment_controller, 'sentiment_analyzer', train_sample_analyzer())
+    
+    user = User.create("Batch User", "batch@test.com")
+    result = CommentController.create_comments([
+        {'user_id': f'0{user.id}', 'text': 'Id sent as text'},
+        {'user_id': float(user.id), 'text': 'Id sent as a float'},
+        {'user_id': True, 'text': 'Id sent as a boolean'},
+        {'user_id': user.id + 0.5, 'text': 'Id with a fraction'},
+        {'user_id': 'abc', 'text': 'Id that is not a number'}
+    ])
+    
+    items = result['data']
+    assert result['created'] == 2
+    assert [item['data']['user_id'] for item in items[:2]] == [user.id, user.id]
+    assert [item['error'] for item in items[2:]] == ['user_id must be an integer'] * 3
+
+def test_create_single_statement(temp_db, monkeypatch):
+    """Tests that Comment.create runs one statement and maps unknown users"""
+    logger.info("Test: Comment.create with RETURNING")
+    
+    user = User.create("Single User", "single@test.com")
+    
+    statements = []
+    acquire = temp_db.pool.acquire
+    
+    def traced_acquire():
+        conn = acquire()
+        conn.set_trace_callback(statements.append)
+        return conn
+    
+    monkeypatch.setattr(temp_db.pool, 'acquire', traced_acquire)
+    comment = Comment.create(user.id, 'Great service, highly recommend', 'positive', 0.91)
+    
+    assert [sql for sql in statements if 'comments' in sql and 'INSERT' in sql]
+    assert not [sql for sql in statements if sql.lstrip().startswith('SELECT')]
+    assert comment.id is not None
+    assert comment.analysis_date is not None
+    assert comment.confidence == 0.91
+    assert Comment.get_by_id(comment.id).text == 'Great service, highly recommend'
+    
+    with pytest.raises(ValueError, match='User not found'):
+        Comment.create(999, 'Nobody wrote this one', 'neutral', 0.5)
@@ -0,0 +1,91 @@
+import pytest
+import models.comment as comment_model
+import models.user as user_model
+from database.db_manager import DatabaseManager
+from models.comment import Comment
+from models.user import User
+import logging
+
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Points the models at an empty database"""
+    manager = DatabaseManager(tmp_path / 'test.db')
+    monkeypatch.setattr(comment_model, 'db_manager', manager)
+    monkeypatch.setattr(user_model, 'db_manager', manager)
+    yield manager
+    manager.close()
+
+def full_aggregate(manager):
+    """Statistics computed with the original GROUP BY query"""
+    rows = manager.execute_query('''
+        SELECT sentiment, COUNT(*) AS total, AVG(confidence) AS confidence_mean
+        FROM comments
+        WHERE sentiment IS NOT NULL
+        GROUP BY sentiment
+    ''')
+    return {
+        row['sentiment']: {'total': row['total'], 'confidence_mean': round(row['confidence_mean'] * 100, 2)}
+        for row in rows
+    }
+
+def test_rollup_follows_writes(temp_db):
+    """Tests that the rollup matches the full aggregate after every kind of write"""
+    logger.info("Test: comment statistics rollup")
+    
+    user = User.create("Stats User", "stats@test.com")
+    other = User.create("Other User", "other@test.com")
+    
+    first = Comment.create(user.id, 'Great product', 'positive', 0.9)
+    Comment.create(user.id, 'Awful service', 'negative', 0.7)
+    Comment.create_many([
+        (other.id, 'Love it', 'positive', 0.8),
+        (other.id, 'It is fine', 'neutral', 0.6),
+        (other.id, 'Not scored yet', None, None)
+    ])
+    assert Comment.get_statistics() == full_aggregate(temp_db)
+    assert Comment.get_statistics()['positive']['total'] == 2
+    
+    # Re-score
+    temp_db.execute_update('UPDATE comments SET sentiment = ?, confidence = ? WHERE id = ?', ('neutral', 0.55, first.id))
+    assert Comment.get_statistics() == full_aggregate(temp_db)
+    
+    # Deleting a user's comments, then the user
+    temp_db.execute_delete('DELETE FROM comments WHERE user_id = ?', (other.id,))
+    assert User.delete(other.id)
+    assert Comment.get_statistics() == full_aggregate(temp_db)
+    assert set(Comment.get_statistics()) == {'negative', 'neutral'}
+    assert temp_db.verify_comment_stats() == []
+
+def test_verify_and_rebuild(temp_db):
+    """Tests that verify reports drift and rebuild repairs it"""
+    logger.info("Test: comment statistics verify and rebuild")
+    
+    user = User.create("Stats User", "stats@test.com")
+    Comment.create(user.id, 'Great product', 'positive', 0.9)
+    
+    temp_db.execute_update('UPDATE comment_stats SET total = 5 WHERE sentiment = ?', ('positive',))
+    mismatches = temp_db.verify_comment_stats()
+    assert len(mismatches) == 1
+    assert mismatches[0]['rollup']['total'] == 5
+    assert mismatches[0]['actual']['total'] == 1
+    
+    temp_db.rebuild_comment_stats()
+    assert temp_db.verify_comment_stats() == []
+
+def test_existing_database_is_backfilled(tmp_path):
+    """Tests that a database created before the rollup is backfilled once"""
+    logger.info("Test: comment statistics backfill")
+    
+    manager = DatabaseManager(tmp_path / 'test.db')
+    with manager.get_connection() as conn:
+        conn.execute("INSERT INTO users (name, email) VALUES ('Old', 'old@test.com')")
+        conn.execute("INSERT INTO comments (user_id, _text, sentiment, confidence) VALUES (1, 'Old comment', 'positive', 0.5)")
+        conn.execute('DROP TABLE comment_stats')
+    manager.close()
+    
+    reopened = DatabaseManager(tmp_path / 'test.db')
+    assert reopened.verify_comment_stats() == []
+    assert reopened.execute_query('SELECT total FROM comment_stats')[0]['total'] == 1
+    reopened.close()
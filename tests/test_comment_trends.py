@@ -0,0 +1,89 @@
+from datetime import datetime
+import pytest
+import models.comment as comment_model
+import models.user as user_model
+from database.db_manager import DatabaseManager, TREND_BUCKETS
+from models.comment import Comment
+from utils.time_buckets import parse_trend_args
+import logging
+
+logger = logging.getLogger(__name__)
+
+COMMENTS = [
+    ('positive', 0.9, '2025-03-01 10:00:05'),
+    ('positive', 0.7, '2025-03-01 10:00:50'),
+    ('negative', 0.8, '2025-03-01 10:01:10'),
+    ('neutral', 0.6, '2025-03-01 11:30:00'),
+    ('positive', 0.5, '2025-03-02 09:00:00')
+]
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Points the models at a database with comments on two days"""
+    manager = DatabaseManager(tmp_path / 'test.db')
+    monkeypatch.setattr(comment_model, 'db_manager', manager)
+    monkeypatch.setattr(user_model, 'db_manager', manager)
+    
+    with manager.get_connection() as conn:
+        conn.execute("INSERT INTO users (name, email) VALUES ('Trends', 'trends@test.com')")
+        conn.executemany(
+            'INSERT INTO comments (user_id, _text, sentiment, confidence, analysis_date) VALUES (1, ?, ?, ?, ?)',
+            [(f'Comment {i}', *comment) for i, comment in enumerate(COMMENTS)]
+        )
+    
+    yield manager
+    manager.close()
+
+def test_trends_per_bucket(temp_db):
+    """Tests minute, hour and day trends read from the rollups"""
+    logger.info("Test: sentiment trends")
+    
+    minutes = Comment.get_trends('minute', '2025-03-01 10:00:30', '2025-03-01 10:59:00')
+    assert [b['bucket_start'] for b in minutes] == ['2025-03-01 10:00:00', '2025-03-01 10:01:00']
+    assert minutes[0]['by_sentiment']['positive'] == {'total': 2, 'confidence_mean': 80.0}
+    
+    hours = Comment.get_trends('hour', '2025-03-01 00:00:00', '2025-03-03 00:00:00')
+    assert [(b['bucket_start'], b['total']) for b in hours] == [
+        ('2025-03-01 10:00:00', 3), ('2025-03-01 11:00:00', 1), ('2025-03-02 09:00:00', 1)
+    ]
+    
+    days = Comment.get_trends('day', '2025-03-01 00:00:00', '2025-03-02 00:00:00')
+    assert [(b['bucket_start'], b['total']) for b in days] == [
+        ('2025-03-01 00:00:00', 4), ('2025-03-02 00:00:00', 1)
+    ]
+
+def test_trend_rollups_follow_writes(temp_db):
+    """Tests that the rollups stay consistent after re-scores and deletes"""
+    logger.info("Test: trend rollups maintenance")
+    
+    temp_db.execute_update("UPDATE comments SET sentiment = 'negative' WHERE id = 1", ())
+    temp_db.execute_update("UPDATE comments SET analysis_date = '2025-03-04 08:00:00' WHERE id = 4", ())
+    temp_db.execute_delete('DELETE FROM comments WHERE id = 5', ())
+    
+    for bucket in TREND_BUCKETS:
+        assert temp_db.verify_rollup(f'comment_trends_{bucket}') == []
+    
+    days = Comment.get_trends('day', '2025-03-01 00:00:00', '2025-03-05 00:00:00')
+    assert [(b['bucket_start'], b['total']) for b in days] == [
+        ('2025-03-01 00:00:00', 3), ('2025-03-04 00:00:00', 1)
+    ]
+    
+    temp_db.execute_update('DELETE FROM comment_trends_hour', ())
+    assert temp_db.verify_rollup('comment_trends_hour') != []
+    temp_db.rebuild_rollups(['comment_trends_hour'])
+    assert temp_db.verify_rollup('comment_trends_hour') == []
+
+def test_trend_args_validation():
+    """Tests bucket and date range validation"""
+    logger.info("Test: trend arguments")
+    
+    now = datetime(2025, 3, 2, 12, 0, 0)
+    assert parse_trend_args({}, now=now) == ('hour', '2025-02-28 12:00:00', '2025-03-02 12:00:00')
+    assert parse_trend_args({'bucket': 'day', 'from': '2025-03-01', 'to': '2025-03-02T10:00'}) == (
+        'day', '2025-03-01 00:00:00', '2025-03-02 10:00:00'
+    )
+    
+    for args in ({'bucket': 'week'}, {'from': 'yesterday'}, {'from': '2025-03-02', 'to': '2025-03-01'},
+                 {'bucket': 'minute', 'from': '2020-01-01', 'to': '2025-01-01'}):
+        with pytest.raises(ValueError):
+            parse_trend_args(args)
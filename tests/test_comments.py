@@ -17,7 +17,7 @@ def test_comment_operations():
     
     with db_manager.get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM comentarios WHERE user_id = ?", (user.id,))
+        cursor.execute("DELETE FROM comments WHERE user_id = ?", (user.id,))
     
     try:
         analysis = sentiment_analyzer.analyze("This is an amazing product!")
@@ -0,0 +1,142 @@
+import threading
+import numpy as np
+from config import MODEL_CONFIG
+from services.sentiment_analyzer import BACKENDS, SentimentAnalyzer
+from services.calibration import CALIBRATIONS
+from services.linear_kernel import CompiledModel
+from services.model_registry import ModelRegistry
+from utils.text_processor import text_processor
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Maximum absolute difference allowed between compiled and sklearn probabilities
+PROBABILITY_TOLERANCE = 1e-6
+
+TEST_TEXTS = [
+    'I absolutely love this product, it is amazing!',
+    'This is terrible, worst experience ever',
+    'It is okay, nothing special',
+    'Excellent service, highly recommend!',
+    'Horrible quality, very disappointed',
+    'Decent value, it does the job',
+    'zzz qqq unknown words only',
+    'Great great great great quality but awful service'
+]
+
+def assert_matches_sklearn(analyzer, compiled):
+    """Compares the compiled kernel against the sklearn predict/predict_proba path"""
+    processed_texts = text_processor.preprocess_batch(TEST_TEXTS)
+    X = analyzer.vectorizer.transform(processed_texts)
+    
+    labels, probabilities = compiled.predict_scores(compiled.transform(processed_texts))
+    expected_labels, expected_probabilities = analyzer.predict_matrix(X)
+    
+    assert list(labels) == list(expected_labels)
+    assert np.max(np.abs(probabilities - expected_probabilities)) < PROBABILITY_TOLERANCE
+
+def is_memory_mapped(array):
+    """Whether an array is a view of a memory-mapped file"""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+def test_compiled_model_matches_sklearn(tmp_path, monkeypatch):
+    """Tests that the compiled kernel reproduces every backend and calibration within tolerance"""
+    logger.info("Test: compiled linear kernel")
+    
+    for calibration in CALIBRATIONS:
+        monkeypatch.setitem(MODEL_CONFIG, 'calibration', calibration)
+        
+        for backend in BACKENDS:
+            analyzer = train_sample_analyzer(backend)
+            assert_matches_sklearn(analyzer, analyzer.compiled)
+            
+            path = tmp_path / f'{backend}_{calibration}'
+            analyzer.compiled.save(path)
+            loaded = CompiledModel.load(path)
+            
+            assert is_memory_mapped(loaded._coef_t)
+            assert is_memory_mapped(loaded.idf)
+            assert loaded.fingerprint() == analyzer.compiled.fingerprint()
+            assert loaded.backend == backend
+            assert loaded.fitted_calibration == (calibration != 'native')
+            assert_matches_sklearn(analyzer, loaded)
+            
+            logger.info(f"Backend {backend} ({calibration}): compiled predictions match sklearn")
+
+def test_convert_pickled_model(tmp_path, monkeypatch):
+    """Tests converting a pickled model into the artifact directory and loading it"""
+    logger.info("Test: pickle to artifact conversion")
+    
+    monkeypatch.setitem(MODEL_CONFIG, 'model_path', tmp_path / 'model.pkl')
+    monkeypatch.setitem(MODEL_CONFIG, 'compiled_path', tmp_path / 'model')
+    # Legacy paths are only used when the registry has no active version
+    monkeypatch.setattr('services.sentiment_analyzer.model_registry', ModelRegistry(tmp_path / 'models'))
+    
+    analyzer = train_sample_analyzer()
+    analyzer.save_model()
+    # Saving again replaces the previous artifact directory
+    analyzer.save_model()
+    
+    converted = SentimentAnalyzer()
+    converted.load_pickle(MODEL_CONFIG['model_path'])
+    converted.compiled.save(tmp_path / 'converted')
+    
+    loaded = SentimentAnalyzer()
+    assert loaded.load_model()
+    assert loaded.model is None
+    assert loaded.model_version == analyzer.model_version == converted.model_version
+    assert CompiledModel.load(tmp_path / 'converted').fingerprint() == analyzer.model_version
+    
+    text = TEST_TEXTS[0]
+    assert loaded.analyze(text)['probabilities'] == analyzer.analyze(text)['probabilities']
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([
+        'converted', f'converted@{analyzer.model_version}',
+        'model', f'model@{analyzer.model_version}', 'model.pkl'
+    ])
+
+def test_save_swaps_atomically(tmp_path):
+    """Tests that readers always load a whole artifact while it is being replaced"""
+    logger.info("Test: atomic artifact replacement")
+    
+    models = [train_sample_analyzer(backend).compiled for backend in BACKENDS]
+    path = tmp_path / 'model'
+    # Plain directory left by an older version
+    path.mkdir()
+    (path / 'manifest.json').write_text('{}')
+    models[0].save(path)
+    assert path.is_symlink()
+    
+    errors = []
+    done = threading.Event()
+    
+    def read():
+        while not done.is_set():
+            try:
+                loaded = CompiledModel.load(path)
+                version = loaded.fingerprint()
+                # Recomputed from the arrays, so a mix of two artifacts is caught
+                loaded._fingerprint = None
+                assert loaded.fingerprint() == version
+            except Exception as e:
+                errors.append(e)
+    
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(30):
+        models[i % 2].save(path)
+    done.set()
+    reader.join()
+    
+    assert errors == []
+    assert CompiledModel.load(path).fingerprint() == models[1].fingerprint()
+    
+    # The previous target is kept, older ones are deleted
+    models[2].save(path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([
+        'model', f'model@{models[1].fingerprint()}', f'model@{models[2].fingerprint()}'
+    ])
@@ -0,0 +1,104 @@
+import threading
+import pytest
+from database.connection_pool import ConnectionPool, PoolTimeoutError
+from database.db_manager import DatabaseManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+def test_pool_reuses_connections_with_pragmas(tmp_path):
+    """Tests that connections are reused and configured once"""
+    logger.info("Test: connection pool reuse and pragmas")
+    
+    manager = DatabaseManager(tmp_path / 'test.db')
+    
+    with manager.get_connection() as conn:
+        first = conn
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA foreign_keys').fetchone()[0] == 1
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1
+    
+    with manager.get_connection() as conn:
+        assert conn is first
+    
+    assert manager.health_check()['healthy']
+    assert manager.pool.stats()['open'] == 1
+    manager.close()
+
+def test_pool_enforces_foreign_keys(tmp_path):
+    """Tests that comments must reference an existing user"""
+    logger.info("Test: foreign keys")
+    
+    manager = DatabaseManager(tmp_path / 'test.db')
+    
+    with pytest.raises(Exception, match='FOREIGN KEY'):
+        manager.execute_insert('INSERT INTO comments (user_id, _text) VALUES (?, ?)', (999, 'text'))
+    
+    # The failed transaction was rolled back and the connection is usable
+    assert manager.execute_query('SELECT COUNT(*) AS total FROM comments')[0]['total'] == 0
+    manager.close()
+
+def test_pool_is_bounded(tmp_path):
+    """Tests that acquire waits for a free connection and times out"""
+    logger.info("Test: bounded pool")
+    
+    pool = ConnectionPool(str(tmp_path / 'test.db'), max_size=2, timeout=0.2)
+    first = pool.acquire()
+    second = pool.acquire()
+    
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    
+    pool.release(first)
+    assert pool.acquire() is first
+    
+    pool.release(first)
+    pool.release(second)
+    pool.close_all()
+    assert pool.stats()['open'] == 0
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+def test_pool_replaces_unhealthy_connections(tmp_path):
+    """Tests that a broken idle connection is replaced"""
+    logger.info("Test: connection health check")
+    
+    pool = ConnectionPool(str(tmp_path / 'test.db'), max_size=1, health_check_interval=0)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+    
+    replacement = pool.acquire()
+    assert replacement is not conn
+    assert replacement.execute('SELECT 1').fetchone()[0] == 1
+    pool.release(replacement)
+    pool.close_all()
+
+def test_concurrent_readers_and_writers(tmp_path):
+    """Tests many threads reading and writing through the pool"""
+    logger.info("Test: concurrent pool usage")
+    
+    manager = DatabaseManager(tmp_path / 'test.db')
+    errors = []
+    
+    def worker(n):
+        try:
+            for i in range(20):
+                manager.execute_insert(
+                    'INSERT INTO users (name, email) VALUES (?, ?)',
+                    (f'User {n}', f'user{n}_{i}@test.com')
+                )
+                manager.execute_query('SELECT COUNT(*) FROM users')
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert manager.execute_query('SELECT COUNT(*) AS total FROM users')[0]['total'] == 160
+    assert manager.pool.stats()['open'] <= manager.pool.max_size
+    manager.close()
@@ -0,0 +1,104 @@
+import csv
+import os
+import pandas as pd
+import pytest
+from config import DATASET_CONFIG
+from services import dataset_loader
+from services.model_trainer import ModelTrainer, dataset_hash
+from services.sentiment_analyzer import SentimentAnalyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROWS = [
+    (1, 'Amazon', 'Positive', 'I love this product, it is amazing!'),
+    (2, 'Amazon', 'Negative', 'Terrible, "quoted" and, commas'),
+    (3, 'Google', 'Irrelevant', 'Nothing to see here'),
+    (4, 'Google', 'Neutral', None),
+    (5, 'Nvidia', 'IRRELEVANT', 'Still irrelevant'),
+    (6, 'Nvidia', 'Neutral', 'Café naïve résumé 😀\nsecond line'),
+    (7, 'Xbox', 'Positive', 'Best purchase I have made this year'),
+    (8, 'Xbox', 'Negative', 'The support never answered my emails'),
+    (9, 'Xbox', None, 'A row without label')
+]
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = tmp_path / 'twitter_dataset.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows((row[0], row[1], row[2], row[3]) for row in ROWS * 50)
+    return path
+
+def legacy_load(path):
+    """The CSV loading the trainer used before, without unlabelled rows"""
+    df = pd.read_csv(path, names=['id', 'entity', 'sentiment', 'tweet'])
+    df = df.dropna(subset=['sentiment', 'tweet'])
+    return df[df['sentiment'].str.lower() != 'irrelevant']
+
+def test_loads_same_rows_as_before(dataset):
+    """Tests the pruned, categorical load against the previous loader"""
+    logger.info("Test: dataset ingestion")
+    
+    df = dataset_loader.read_csv(dataset)
+    legacy = legacy_load(dataset)
+    
+    assert list(df.columns) == ['sentiment', 'tweet']
+    assert isinstance(df['sentiment'].dtype, pd.CategoricalDtype)
+    assert list(df['sentiment'].cat.categories) == ['Negative', 'Neutral', 'Positive']
+    assert df['tweet'].tolist() == legacy['tweet'].tolist()
+    assert df['sentiment'].astype(object).tolist() == legacy['sentiment'].tolist()
+    assert dataset_hash(df) == dataset_hash(legacy)
+    
+    chunked = dataset_loader.read_csv(dataset, chunk_rows=7)
+    pd.testing.assert_frame_equal(chunked, df)
+
+def test_columnar_copy_is_reused_until_csv_changes(dataset, monkeypatch):
+    """Tests that later loads skip the CSV parser while the file is unchanged"""
+    logger.info("Test: columnar dataset copy")
+    
+    df = dataset_loader.load_dataset(dataset)
+    assert dataset_loader.columnar_path(dataset).exists()
+    
+    def no_csv(*args, **kwargs):
+        raise AssertionError("CSV parsed again")
+    
+    monkeypatch.setattr(dataset_loader.pd, 'read_csv', no_csv)
+    cached = dataset_loader.load_dataset(dataset)
+    pd.testing.assert_frame_equal(cached, df)
+    assert dataset_hash(cached) == dataset_hash(df)
+    monkeypatch.undo()
+    
+    with open(dataset, 'a', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow((10, 'Xbox', 'Positive', 'One more row'))
+    
+    reloaded = dataset_loader.load_dataset(dataset)
+    assert len(reloaded) == len(df) + 1
+    assert reloaded['tweet'].iloc[-1] == 'One more row'
+
+def test_damaged_copy_and_disabled_cache(dataset, monkeypatch):
+    """Tests that a damaged copy is rewritten and that the cache can be disabled"""
+    logger.info("Test: damaged columnar copy")
+    
+    df = dataset_loader.load_dataset(dataset)
+    copy_path = dataset_loader.columnar_path(dataset)
+    copy_path.write_bytes(b'corrupt')
+    os.utime(dataset)
+    
+    pd.testing.assert_frame_equal(dataset_loader.load_dataset(dataset), df)
+    assert copy_path.stat().st_size > len(b'corrupt')
+    
+    copy_path.unlink()
+    monkeypatch.setitem(DATASET_CONFIG, 'columnar_cache', False)
+    dataset_loader.load_dataset(dataset)
+    assert not copy_path.exists()
+
+def test_trains_on_categorical_labels(dataset):
+    """Tests training from the loaded CSV"""
+    logger.info("Test: training on an ingested dataset")
+    
+    analyzer = SentimentAnalyzer(backend='sgd')
+    metrics = ModelTrainer(analyzer).train(dataset_path=dataset, save_model=False)
+    
+    assert analyzer.classes == ['Negative', 'Neutral', 'Positive']
+    assert metrics['train_samples'] + metrics['test_samples'] == 250
+    assert analyzer.analyze('I love it')['sentiment'] in analyzer.classes
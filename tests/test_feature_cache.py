@@ -0,0 +1,102 @@
+import pytest
+from config import MODEL_CONFIG
+from services.feature_cache import FeatureCache
+from services.model_trainer import ModelTrainer
+from services.sentiment_analyzer import SentimentAnalyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def cache(tmp_path):
+    # The example dataset is far below the default min_rows
+    return FeatureCache(tmp_path / 'feature_cache', max_entries=4, min_rows=0)
+
+def train(cache, backend=None):
+    analyzer = SentimentAnalyzer(backend=backend)
+    trainer = ModelTrainer(analyzer)
+    trainer.feature_cache = cache
+    metrics = trainer.train(dataset_path='missing_dataset.csv', save_model=False)
+    return analyzer, metrics
+
+def test_retrain_hits_cache(cache):
+    """Tests that a retrain on the same data reuses the cached features"""
+    logger.info("Test: training feature cache")
+    
+    analyzer, metrics = train(cache)
+    assert metrics['feature_cache'] == 'miss'
+    assert len(list(cache.root.iterdir())) == 1
+    
+    cached, cached_metrics = train(cache)
+    assert cached_metrics['feature_cache'] == 'hit'
+    assert cached_metrics['dataset_hash'] == metrics['dataset_hash']
+    assert cached.stem_table == analyzer.stem_table
+    assert cached.vectorizer.vocabulary_ == analyzer.vectorizer.vocabulary_
+    assert cached.model_version == analyzer.model_version
+    
+    # Only the classifier changed: the features are still valid
+    _, sgd_metrics = train(cache, backend='sgd')
+    assert sgd_metrics['feature_cache'] == 'hit'
+
+def test_cached_features_match_fresh_ones(cache):
+    """Tests the stored matrix and texts against freshly built ones"""
+    logger.info("Test: cached features round trip")
+    
+    trainer = ModelTrainer(SentimentAnalyzer())
+    trainer.feature_cache = cache
+    df = trainer.create_sample_dataset()
+    
+    built = trainer.build_features(df)
+    loaded = trainer.build_features(df)
+    
+    assert loaded['feature_cache'] == 'hit'
+    assert loaded['processed_texts'] == built['processed_texts']
+    assert (loaded['X'] != built['X']).nnz == 0
+    assert loaded['X'].shape == built['X'].shape
+
+def test_settings_and_data_change_the_key(cache, monkeypatch):
+    """Tests that other preprocessing settings or data miss the cache"""
+    logger.info("Test: feature cache key")
+    
+    trainer = ModelTrainer(SentimentAnalyzer())
+    trainer.feature_cache = cache
+    df = trainer.create_sample_dataset()
+    trainer.build_features(df)
+    
+    assert trainer.build_features(df.iloc[:-1])['feature_cache'] == 'miss'
+    
+    monkeypatch.setitem(MODEL_CONFIG, 'max_features', 50)
+    features = trainer.build_features(df)
+    assert features['feature_cache'] == 'miss'
+    assert features['X'].shape[1] <= 50
+
+def test_unreadable_entry_is_rebuilt(cache):
+    """Tests that a damaged entry is a miss, not an error"""
+    logger.info("Test: damaged feature cache entry")
+    
+    trainer = ModelTrainer(SentimentAnalyzer())
+    trainer.feature_cache = cache
+    df = trainer.create_sample_dataset()
+    trainer.build_features(df)
+    
+    entry = next(cache.root.iterdir())
+    (entry / 'features.npz').write_bytes(b'corrupt')
+    
+    assert trainer.build_features(df)['feature_cache'] == 'miss'
+    assert trainer.build_features(df)['feature_cache'] == 'hit'
+
+def test_eviction_and_small_datasets(cache):
+    """Tests the entry limit and that small datasets skip the cache"""
+    logger.info("Test: feature cache eviction")
+    
+    cache.max_entries = 2
+    trainer = ModelTrainer(SentimentAnalyzer())
+    trainer.feature_cache = cache
+    df = trainer.create_sample_dataset()
+    
+    for rows in (30, 29, 28):
+        trainer.build_features(df.iloc[:rows])
+    assert len(list(cache.root.iterdir())) == 2
+    
+    cache.min_rows = 1000
+    assert trainer.build_features(df)['feature_cache'] == 'disabled'
@@ -0,0 +1,145 @@
+import os
+import signal
+import threading
+import time
+import pytest
+from config import MODEL_CONFIG
+from services.inference_pool import InferencePool
+from services.model_registry import ModelRegistry
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+TEXTS = [
+    "I love this product",
+    "Terrible experience, never again",
+    "It's okay I guess",
+    "Absolutely fantastic service",
+    "Worst purchase ever",
+    "",
+    "The delivery was fast and the quality is great"
+] * 10
+
+def assert_same_results(results, expected):
+    """Compares pool results with in-process ones"""
+    assert len(results) == len(expected)
+    for result, reference in zip(results, expected):
+        assert result.get('error') == reference.get('error')
+        assert result.get('sentiment') == reference.get('sentiment')
+        assert result['original_text'] == reference['original_text']
+        if 'probabilities' in reference:
+            assert result['probabilities'] == pytest.approx(reference['probabilities'])
+
+@pytest.fixture
+def analyzer():
+    return train_sample_analyzer()
+
+@pytest.fixture
+def pool(analyzer, tmp_path):
+    pool = InferencePool(analyzer, max_workers=2, artifact_dir=tmp_path, min_chunk_size=4)
+    yield pool
+    pool.shutdown()
+
+def test_results_in_request_order(pool, analyzer):
+    """Tests that chunks scored by several workers come back in order"""
+    logger.info("Test: inference pool order")
+    
+    results = pool.analyze_batch(TEXTS)
+    
+    assert_same_results(results, analyzer.analyze_batch(TEXTS))
+    assert pool.stats()['texts'] == len(TEXTS)
+    assert pool.analyze_batch([]) == []
+
+def test_restart_after_worker_crash(pool, analyzer):
+    """Tests that a killed worker is replaced and the batch still succeeds"""
+    logger.info("Test: inference pool crash recovery")
+    
+    pool.analyze_batch(TEXTS)
+    for pid in list(pool._executor._processes):
+        os.kill(pid, signal.SIGKILL)
+    
+    results = pool.analyze_batch(TEXTS)
+    
+    assert_same_results(results, analyzer.analyze_batch(TEXTS))
+    assert pool.stats()['restarts'] == 1
+
+def test_restart_on_model_change(pool):
+    """Tests that workers pick up a new model version"""
+    logger.info("Test: inference pool model swap")
+    
+    pool.analyze_batch(TEXTS[:5])
+    first_version = pool.stats()['model_version']
+    
+    pool.analyzer = train_sample_analyzer(backend='sgd')
+    results = pool.analyze_batch(TEXTS)
+    
+    assert pool.stats()['model_version'] == pool.analyzer.model_version != first_version
+    assert_same_results(results, pool.analyzer.analyze_batch(TEXTS))
+
+def test_model_change_during_batch(pool, analyzer):
+    """Tests that a batch queued on the previous pool finishes after a model swap"""
+    logger.info("Test: inference pool model swap during a batch")
+    
+    # Busy workers keep the batch's chunks queued on the old pool
+    executor = pool._get_executor()
+    for _ in range(pool.max_workers + 1):
+        executor.submit(time.sleep, 1)
+    
+    outcome = {}
+    def run_batch():
+        try:
+            outcome['results'] = pool.analyze_batch(TEXTS)
+        except Exception as e:
+            outcome['error'] = e
+    
+    thread = threading.Thread(target=run_batch)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while len(executor._pending_work_items) <= pool.max_workers + 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    
+    pool.analyzer = train_sample_analyzer(backend='sgd')
+    swapped = pool.analyze_batch(TEXTS[:8])
+    thread.join(timeout=60)
+    
+    assert 'error' not in outcome
+    assert_same_results(outcome['results'], analyzer.analyze_batch(TEXTS))
+    assert_same_results(swapped, pool.analyzer.analyze_batch(TEXTS[:8]))
+    assert pool.stats()['restarts'] == 0
+
+def test_artifact_paths(analyzer, tmp_path, monkeypatch):
+    """Tests that workers map registered versions in place and never write the shared artifact"""
+    logger.info("Test: inference pool artifact paths")
+    
+    monkeypatch.setitem(MODEL_CONFIG, 'compiled_path', tmp_path / 'shared')
+    registry = ModelRegistry(tmp_path / 'models')
+    monkeypatch.setattr(analyzer, 'registry', registry)
+    pool = InferencePool(analyzer, max_workers=2, artifact_dir=tmp_path / 'pool', min_chunk_size=4)
+    try:
+        pool.analyze_batch(TEXTS[:8])
+        unregistered = pool._artifact_path
+        assert unregistered.parent.parent == tmp_path / 'pool'
+        assert unregistered.name == analyzer.model_version
+        
+        # A new model replaces the saved artifact of the previous one
+        retrained = train_sample_analyzer(backend='sgd')
+        monkeypatch.setattr(retrained, 'registry', registry)
+        pool.analyzer = retrained
+        pool.analyze_batch(TEXTS[:8])
+        deadline = time.monotonic() + 10
+        while unregistered.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not unregistered.exists()
+        assert pool._artifact_path.name == retrained.model_version
+        
+        version = registry.register(analyzer)['version']
+        pool.analyzer = analyzer
+        results = pool.analyze_batch(TEXTS)
+        assert pool._artifact_path == registry.path(version) / 'model'
+        assert_same_results(results, analyzer.analyze_batch(TEXTS))
+    finally:
+        pool.shutdown()
+    
+    assert not (tmp_path / 'shared').exists()
+    assert list((tmp_path / 'pool').iterdir()) == []
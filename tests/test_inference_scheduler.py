@@ -0,0 +1,103 @@
+import threading
+import pytest
+from services.inference_scheduler import InferenceScheduler
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+class EchoAnalyzer:
+    """Records batch sizes and echoes every text back"""
+    
+    def __init__(self, fail=False):
+        self.batch_sizes = []
+        self.fail = fail
+    
+    def analyze_batch(self, texts):
+        self.batch_sizes.append(len(texts))
+        if self.fail:
+            raise Exception("The model hasn't trained yet")
+        return [{'original_text': text} for text in texts]
+
+def run_concurrently(scheduler, texts):
+    """Submits every text from its own thread at the same time"""
+    barrier = threading.Barrier(len(texts))
+    results = [None] * len(texts)
+    
+    def worker(i):
+        barrier.wait()
+        results[i] = scheduler.analyze(texts[i], timeout=5)
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_requests_are_batched():
+    """Tests that concurrent callers share batches and get their own results"""
+    logger.info("Test: micro-batching of concurrent requests")
+    
+    analyzer = EchoAnalyzer()
+    scheduler = InferenceScheduler(analyzer, max_batch_size=8, max_wait_ms=50)
+    texts = [f"text {i}" for i in range(32)]
+    
+    results = run_concurrently(scheduler, texts)
+    
+    assert [result['original_text'] for result in results] == texts
+    assert sum(analyzer.batch_sizes) == 32
+    assert max(analyzer.batch_sizes) <= 8
+    assert len(analyzer.batch_sizes) < 32
+    
+    stats = scheduler.stats()
+    assert stats['requests'] == 32
+    assert stats['batches'] == len(analyzer.batch_sizes)
+    assert sum(stats['batch_size_histogram'].values()) == stats['batches']
+    assert stats['queue_delay_ms']['max'] >= stats['queue_delay_ms']['p50'] >= 0
+
+def test_single_request_flushes_after_max_wait():
+    """Tests that a lone request is scored without waiting for a full batch"""
+    logger.info("Test: micro-batching max wait")
+    
+    analyzer = EchoAnalyzer()
+    scheduler = InferenceScheduler(analyzer, max_batch_size=64, max_wait_ms=1)
+    
+    assert scheduler.analyze("alone", timeout=5) == {'original_text': 'alone'}
+    assert analyzer.batch_sizes == [1]
+    assert scheduler.stats()['batch_size_histogram']['1'] == 1
+
+def test_errors_reach_every_caller():
+    """Tests that a failing batch raises in each waiting caller"""
+    logger.info("Test: micro-batching errors")
+    
+    scheduler = InferenceScheduler(EchoAnalyzer(fail=True), max_wait_ms=1)
+    
+    with pytest.raises(Exception, match="hasn't trained"):
+        scheduler.analyze("text", timeout=5)
+    
+    scheduler = InferenceScheduler(EchoAnalyzer(), max_wait_ms=1)
+    scheduler.analyzer.analyze_batch = lambda texts: [{'error': 'Text cannot be empty'} for _ in texts]
+    with pytest.raises(ValueError, match="empty"):
+        scheduler.analyze("   ", timeout=5)
+
+def test_matches_direct_analysis():
+    """Tests that batched results equal single-text analysis"""
+    logger.info("Test: micro-batching matches analyze")
+    
+    analyzer = train_sample_analyzer()
+    scheduler = InferenceScheduler(analyzer, max_batch_size=4, max_wait_ms=20)
+    texts = [
+        "I love this product",
+        "Terrible experience, never again",
+        "It's okay I guess",
+        "Absolutely fantastic service",
+        "Worst purchase ever"
+    ]
+    
+    results = run_concurrently(scheduler, texts)
+    
+    for text, result in zip(texts, results):
+        expected = analyzer.analyze(text)
+        assert result['sentiment'] == expected['sentiment']
+        assert result['probabilities'] == pytest.approx(expected['probabilities'])
@@ -0,0 +1,148 @@
+import multiprocessing
+import pytest
+from config import MODEL_CONFIG
+from services.model_registry import ModelRegistry
+from services.model_reloader import ModelReloader
+from services.sentiment_analyzer import SentimentAnalyzer
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(tmp_path / 'models')
+
+@pytest.fixture
+def versions(registry):
+    """Two registered versions, the first one active"""
+    first = train_sample_analyzer()
+    second = train_sample_analyzer(backend='sgd')
+    registry.register(first, {'test_accuracy': 0.5}, 'abc123')
+    registry.register(second, {'test_accuracy': 0.6}, 'abc123')
+    registry.activate(first.model_version)
+    return first.model_version, second.model_version
+
+def test_register_and_list(registry, versions):
+    """Tests versioned artifacts with metadata and the active flag"""
+    logger.info("Test: model registry")
+    
+    first, second = versions
+    listed = {metadata['version']: metadata for metadata in registry.list()}
+    
+    assert set(listed) == {first, second}
+    assert listed[first]['active'] and not listed[second]['active']
+    assert listed[second]['backend'] == 'sgd'
+    assert listed[second]['dataset_hash'] == 'abc123'
+    assert listed[second]['metrics'] == {'test_accuracy': 0.6}
+    assert (registry.path(first) / 'model' / 'manifest.json').exists()
+    assert registry.get('../etc') is None
+    with pytest.raises(ValueError):
+        registry.activate('0123456789abcdef')
+
+def test_hot_reload_and_rollback(registry, versions, monkeypatch):
+    """Tests that a running analyzer follows activations and rollbacks"""
+    logger.info("Test: model hot reload")
+    
+    first, second = versions
+    analyzer = SentimentAnalyzer()
+    analyzer.registry = registry
+    assert analyzer.load_model()
+    assert analyzer.model_version == first
+    assert analyzer.analyze('I love it')['model_version'] == first
+    
+    reloader = ModelReloader(analyzer, interval=60)
+    assert not reloader.check()
+    
+    registry.activate(second)
+    assert reloader.check()
+    assert analyzer.analyze('I love it')['model_version'] == second
+    
+    registry.rollback()
+    assert registry.active_version() == first
+    assert reloader.check()
+    assert analyzer.model_version == first
+    assert reloader.stats()['reloads'] == 2
+    
+    # Versions load from pickles with sklearn inference too
+    monkeypatch.setitem(MODEL_CONFIG, 'inference', 'sklearn')
+    registry.activate(second)
+    assert reloader.check()
+    assert analyzer.model is not None
+    assert analyzer.analyze('I love it')['model_version'] == second
+
+def test_broken_version_keeps_current_model(registry, versions):
+    """Tests that a version failing to load is skipped, not retried"""
+    logger.info("Test: broken model version")
+    
+    first, second = versions
+    analyzer = SentimentAnalyzer()
+    analyzer.registry = registry
+    analyzer.load_model()
+    
+    for path in (registry.path(second) / 'model').iterdir():
+        path.write_bytes(b'corrupt')
+    (registry.path(second) / 'sentiment_model.pkl').write_bytes(b'corrupt')
+    registry.activate(second)
+    
+    reloader = ModelReloader(analyzer, interval=60)
+    assert not reloader.check()
+    assert analyzer.model_version == first
+    assert second in reloader.stats()['last_error']
+
+def test_broken_pointer_does_not_affect_the_other(registry, versions, monkeypatch):
+    """Tests that a broken shadow version is not retried when the active one changes, and vice versa"""
+    logger.info("Test: broken active and shadow pointers")
+    
+    first, second = versions
+    broken = train_sample_analyzer(backend='linear_svc')
+    registry.register(broken)
+    broken = broken.model_version
+    for path in (registry.path(broken) / 'model').iterdir():
+        path.write_bytes(b'corrupt')
+    (registry.path(broken) / 'sentiment_model.pkl').write_bytes(b'corrupt')
+    
+    analyzer = SentimentAnalyzer()
+    analyzer.registry = registry
+    analyzer.load_model()
+    reloader = ModelReloader(analyzer, interval=60)
+    
+    attempts = []
+    start_shadow = analyzer.start_shadow
+    monkeypatch.setattr(analyzer, 'start_shadow', lambda *args: attempts.append(args[0]) or start_shadow(*args))
+    
+    # Broken shadow, healthy active: activations still load, the shadow is not retried
+    registry.set_shadow(broken, 0.5)
+    assert not reloader.check_shadow()
+    registry.activate(second)
+    assert reloader.check()
+    assert analyzer.model_version == second
+    assert not reloader.check_shadow()
+    assert attempts == [broken]
+    
+    # Broken active, healthy shadow: the shadow starts, the active is not retried
+    registry.activate(broken)
+    assert not reloader.check()
+    registry.set_shadow(first, 0.5)
+    assert reloader.check_shadow()
+    assert analyzer.shadow.version == first
+    assert not reloader.check()
+    assert analyzer.model_version == second
+    analyzer.stop_shadow()
+
+def test_concurrent_activations_keep_history(registry, versions):
+    """Tests that activations from several server processes all reach the history"""
+    logger.info("Test: concurrent activations")
+    
+    def activate_many():
+        for version in versions * 10:
+            ModelRegistry(registry.root).activate(version)
+    
+    processes = [multiprocessing.get_context('fork').Process(target=activate_many) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    
+    assert [process.exitcode for process in processes] == [0] * 4
+    assert len(registry.history()) == 1 + 4 * 20
@@ -0,0 +1,105 @@
+import pytest
+import models.comment as comment_model
+import models.user as user_model
+from controllers.comment_controller import CommentController
+from controllers.user_controller import UserController
+from database.db_manager import DatabaseManager
+from utils.pagination import decode_cursor, encode_cursor, parse_limit
+import logging
+
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Points the models at a database with 2 users and 25 comments"""
+    manager = DatabaseManager(tmp_path / 'test.db')
+    monkeypatch.setattr(comment_model, 'db_manager', manager)
+    monkeypatch.setattr(user_model, 'db_manager', manager)
+    
+    with manager.get_connection() as conn:
+        conn.executemany(
+            'INSERT INTO users (name, email, register_date) VALUES (?, ?, ?)',
+            [('First', 'first@test.com', '2025-01-01 10:00:00'), ('Second', 'second@test.com', '2025-01-01 10:00:00')]
+        )
+        # Several comments share a date, the id breaks the tie
+        conn.executemany(
+            'INSERT INTO comments (user_id, _text, sentiment, confidence, analysis_date) VALUES (?, ?, ?, ?, ?)',
+            [
+                (1 + i % 2, f'Comment {i}', ('positive', 'negative')[i % 3 == 0], 0.8, f'2025-01-0{1 + i // 10} 12:00:00')
+                for i in range(25)
+            ]
+        )
+    
+    yield manager
+    manager.close()
+
+def walk(list_page, limit):
+    """Follows next_cursor until the last page"""
+    items = []
+    after = None
+    while True:
+        result = list_page(limit, after)
+        assert result['success']
+        assert result['count'] <= limit
+        items.extend(result['data'])
+        if result['next_cursor'] is None:
+            return items
+        after = decode_cursor(result['next_cursor'])
+
+def test_pages_cover_every_row_once(temp_db):
+    """Tests that following the cursors returns every row once, newest first"""
+    logger.info("Test: keyset pagination")
+    
+    comments = walk(CommentController.get_all_comments, 4)
+    keys = [(c['analysis_date'], c['id']) for c in comments]
+    assert len(comments) == 25
+    assert keys == sorted(keys, reverse=True)
+    assert comments[0]['user']['name'] in ('First', 'Second')
+    
+    negatives = walk(lambda limit, after: CommentController.get_comments_by_sentiment('negative', limit, after), 3)
+    assert [c['id'] for c in negatives] == [i + 1 for i in reversed(range(25)) if i % 3 == 0]
+    
+    by_user = walk(lambda limit, after: CommentController.get_user_comments(2, limit, after), 5)
+    assert len(by_user) == 12
+    assert all(c['user_id'] == 2 for c in by_user)
+    
+    users = walk(UserController.get_all_users, 1)
+    assert [u['id'] for u in users] == [2, 1]
+    
+    result = CommentController.get_all_comments()
+    assert result['count'] == 25
+    assert result['next_cursor'] is None
+
+def test_cursor_and_limit_validation():
+    """Tests that malformed cursors and limits are rejected"""
+    logger.info("Test: pagination arguments")
+    
+    cursor = encode_cursor('2025-01-01 12:00:00', 7)
+    assert decode_cursor(cursor) == ('2025-01-01 12:00:00', 7)
+    assert decode_cursor(None) is None
+    
+    for invalid in ('not-a-cursor', encode_cursor(5, 'x')):
+        with pytest.raises(ValueError):
+            decode_cursor(invalid)
+    
+    assert parse_limit(None) == 50
+    assert parse_limit('10') == 10
+    for invalid in ('0', '100000', 'ten'):
+        with pytest.raises(ValueError):
+            parse_limit(invalid)
+
+def test_pages_use_indexes(temp_db):
+    """Tests that listing pages are index searches without a sort step"""
+    logger.info("Test: pagination query plans")
+    
+    queries = [
+        ('SELECT * FROM comments WHERE (analysis_date, id) < (?, ?) ORDER BY analysis_date DESC, id DESC LIMIT 5', ['2025-01-02', 9]),
+        ('SELECT * FROM comments WHERE sentiment = ? AND (analysis_date, id) < (?, ?) ORDER BY analysis_date DESC, id DESC LIMIT 5', ['positive', '2025-01-02', 9]),
+        ('SELECT * FROM comments WHERE user_id = ? AND 1 = 1 ORDER BY analysis_date DESC, id DESC LIMIT 5', [1]),
+        ('SELECT * FROM users WHERE 1 = 1 ORDER BY register_date DESC, id DESC LIMIT 5', [])
+    ]
+    
+    for query, params in queries:
+        plan = ' '.join(row[3] for row in temp_db.execute_query('EXPLAIN QUERY PLAN ' + query, params))
+        assert 'INDEX' in plan
+        assert 'TEMP B-TREE' not in plan
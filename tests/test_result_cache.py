@@ -0,0 +1,78 @@
+import os
+from services.result_cache import ResultCache
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+class FakeClock:
+    """Manually advanced clock for TTL tests"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+def test_lru_eviction():
+    """Tests that the least recently used entry is evicted first"""
+    logger.info("Test: result cache LRU eviction")
+    
+    cache = ResultCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    
+    stats = cache.stats()
+    assert stats['size'] == 2
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 3
+    assert stats['misses'] == 1
+
+def test_ttl_expiration():
+    """Tests that entries expire after the TTL"""
+    logger.info("Test: result cache TTL")
+    
+    clock = FakeClock()
+    cache = ResultCache(maxsize=10, ttl=5, clock=clock)
+    cache.set('a', 1)
+    
+    clock.now = 4.9
+    assert cache.get('a') == 1
+    clock.now = 5.0
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+def test_analyzer_cache_hits_and_invalidation():
+    """Tests cache hits for repeated texts and invalidation on model swap"""
+    logger.info("Test: analyzer result cache")
+    
+    analyzer = train_sample_analyzer()
+    assert analyzer.model_version is not None
+    
+    first = analyzer.analyze('I love this product!!')
+    # Same processed text, so it is served from the cache
+    second = analyzer.analyze('RT @user I LOVE this product')
+    
+    stats = analyzer.get_cache_stats()
+    assert stats['pid'] == os.getpid()
+    assert stats['hits'] == 1
+    assert stats['size'] == 1
+    assert second['probabilities'] == first['probabilities']
+    assert second['original_text'] == 'RT @user I LOVE this product'
+    
+    batch = analyzer.analyze_batch(['I love this product', 'Terrible quality'])
+    assert batch[0]['probabilities'] == first['probabilities']
+    assert analyzer.get_cache_stats()['size'] == 2
+    
+    analyzer.compile()
+    stats = analyzer.get_cache_stats()
+    assert stats['size'] == 0
+    assert stats['invalidations'] >= 2
+    
+    logger.info(f"Cache stats: {stats}")
@@ -0,0 +1,141 @@
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+import urllib.request
+from pathlib import Path
+import pytest
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Tiny app in place of the Flask one: reports its pid and the
+# generation set by the parent before forking. /slow answers after a
+# delay, to keep a request in flight
+SERVER_SCRIPT = textwrap.dedent('''
+    import json, os, sys, time
+    sys.path.insert(0, sys.argv[1])
+    from server import PreforkServer
+    
+    state = {'generation': 1}
+    SLOW_SECONDS = 1.5
+    
+    def app(environ, start_response):
+        if environ['PATH_INFO'] == '/slow':
+            time.sleep(SLOW_SECONDS)
+        body = json.dumps({'pid': os.getpid(), 'generation': state['generation']}).encode()
+        start_response('200 OK', [('Content-Type', 'application/json'), ('Connection', 'close')])
+        return [body]
+    
+    def reload():
+        state['generation'] += 1
+    
+    server = PreforkServer(app, '127.0.0.1', 0, workers=2, on_reload=reload, graceful_timeout=5)
+    print(server.port, flush=True)
+    server.run()
+''')
+
+def get(port, path='/'):
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=5) as response:
+        return json.loads(response.read())
+
+def collect(port, n=40):
+    """Responses of n separate connections"""
+    return [get(port) for _ in range(n)]
+
+def wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.1)
+    return False
+
+@pytest.fixture
+def server():
+    process = subprocess.Popen(
+        [sys.executable, '-c', SERVER_SCRIPT, str(ROOT)],
+        stdout=subprocess.PIPE, text=True
+    )
+    port = int(process.stdout.readline())
+    yield process, port
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="Pre-fork server needs os.fork")
+def test_prefork_reload_and_shutdown(server):
+    """Tests workers sharing the socket, SIGHUP reload, respawn and SIGTERM"""
+    logger.info("Test: pre-fork server")
+    
+    process, port = server
+    responses = collect(port)
+    worker_pids = {response['pid'] for response in responses}
+    assert process.pid not in worker_pids
+    assert {response['generation'] for response in responses} == {1}
+    
+    process.send_signal(signal.SIGHUP)
+    assert wait_for(lambda: {response['generation'] for response in collect(port, 10)} == {2})
+    new_pids = {response['pid'] for response in collect(port)}
+    assert not new_pids & worker_pids
+    
+    # A killed worker is replaced. Connections it had accepted are lost
+    victim = new_pids.pop()
+    os.kill(victim, signal.SIGKILL)
+    
+    def replaced():
+        try:
+            return len({response['pid'] for response in collect(port)} - {victim}) == 2
+        except (OSError, http.client.HTTPException):
+            return False
+    
+    assert wait_for(replaced)
+    
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=10) == 0
+
+def start_slow_request(port):
+    """Sends a /slow request from a thread, returns the thread and its result"""
+    result = {}
+    
+    def run():
+        try:
+            result['response'] = get(port, '/slow')
+        except Exception as e:
+            result['error'] = e
+    
+    thread = threading.Thread(target=run)
+    thread.start()
+    # Lets a worker accept it before the signal
+    time.sleep(0.5)
+    return thread, result
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="Pre-fork server needs os.fork")
+def test_prefork_finishes_in_flight_requests(server):
+    """Tests that reload and shutdown let in-flight requests complete"""
+    logger.info("Test: pre-fork server drains in-flight requests")
+    
+    process, port = server
+    worker_pids = {response['pid'] for response in collect(port)}
+    
+    thread, result = start_slow_request(port)
+    process.send_signal(signal.SIGHUP)
+    thread.join(timeout=10)
+    assert 'error' not in result, result.get('error')
+    assert result['response']['pid'] in worker_pids
+    assert result['response']['generation'] == 1
+    assert wait_for(lambda: not {response['pid'] for response in collect(port, 10)} & worker_pids)
+    
+    thread, result = start_slow_request(port)
+    process.send_signal(signal.SIGTERM)
+    thread.join(timeout=10)
+    assert 'error' not in result, result.get('error')
+    assert result['response']['generation'] == 2
+    assert process.wait(timeout=10) == 0
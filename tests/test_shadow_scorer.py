@@ -0,0 +1,143 @@
+import os
+import threading
+import pytest
+from services.model_registry import ModelRegistry
+from services.model_reloader import ModelReloader
+from services.shadow_scorer import ShadowScorer
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+TEXTS = [
+    'I love this product, it is amazing',
+    'Terrible quality, it broke in a day',
+    'It arrived on Tuesday',
+    'Best purchase I have made this year',
+    'The support never answered my emails',
+    'Not bad at all'
+] * 5
+
+@pytest.fixture
+def models(tmp_path):
+    """A primary analyzer and a registered candidate version"""
+    registry = ModelRegistry(tmp_path / 'models')
+    primary = train_sample_analyzer()
+    candidate = train_sample_analyzer(backend='sgd')
+    registry.register(candidate)
+    primary.registry = registry
+    yield primary, candidate
+    primary.stop_shadow()
+
+def test_shadow_compares_with_primary(models):
+    """Tests agreement and flips against the candidate's own answers"""
+    logger.info("Test: shadow scoring")
+    
+    primary, candidate = models
+    expected = primary.analyze_batch(TEXTS)
+    
+    shadow = primary.start_shadow(candidate.model_version, sample_rate=1.0)
+    results = primary.analyze_batch(TEXTS)
+    primary.analyze(TEXTS[0])
+    assert shadow.drain(timeout=10)
+    
+    # Responses still come from the primary model only
+    assert results == expected
+    
+    primary_labels = [result['sentiment'] for result in expected] + [expected[0]['sentiment']]
+    shadow_labels = [result['sentiment'] for result in candidate.analyze_batch(TEXTS + TEXTS[:1])]
+    flips = {}
+    for primary_label, shadow_label in zip(primary_labels, shadow_labels):
+        if primary_label != shadow_label:
+            key = f'{primary_label}->{shadow_label}'
+            flips[key] = flips.get(key, 0) + 1
+    
+    stats = primary.get_shadow_stats()
+    assert stats['pid'] == os.getpid()
+    assert stats['shadow_version'] == candidate.model_version
+    assert stats['primary_version'] == primary.model_version
+    assert stats['sampled_requests'] == 2
+    assert stats['scored'] == len(TEXTS) + 1
+    assert stats['dropped'] == 0
+    assert stats['flips'] == flips
+    assert stats['agreement_rate'] == round(1 - sum(flips.values()) / stats['scored'], 4)
+    assert stats['latency_us_per_text']['shadow']['mean'] > 0
+    
+    primary.stop_shadow()
+    assert primary.get_shadow_stats() == {'enabled': False}
+
+def test_primary_latency_excludes_cache_hits(models, monkeypatch):
+    """Tests that the primary is timed on the uncached path even when the request hit the cache"""
+    logger.info("Test: shadow primary latency")
+    
+    primary, candidate = models
+    if primary.result_cache is None:
+        pytest.skip("Result cache disabled")
+    primary.analyze_batch(TEXTS)
+    
+    calls = []
+    compiled = primary.active.compiled
+    predict_scores = compiled.predict_scores
+    monkeypatch.setattr(compiled, 'predict_scores', lambda rows: calls.append(rows) or predict_scores(rows))
+    
+    shadow = primary.start_shadow(candidate.model_version, sample_rate=1.0)
+    primary.analyze_batch(TEXTS)
+    assert shadow.drain(timeout=10)
+    
+    # The request was answered from the cache, the shadow thread scored the primary
+    assert len(calls) == 1
+    latency = shadow.stats()['latency_us_per_text']
+    assert latency['primary']['mean'] > 0
+    assert latency['shadow']['mean'] > 0
+
+def test_full_queue_drops_samples(models):
+    """Tests that a stalled shadow model drops samples instead of blocking"""
+    logger.info("Test: shadow queue overflow")
+    
+    primary, candidate = models
+    shadow = primary.start_shadow(candidate.model_version, sample_rate=1.0)
+    shadow.queue_size = len(TEXTS)
+    
+    # The shadow thread hangs on its first batch
+    release = threading.Event()
+    process = shadow._process
+    shadow._process = lambda batch: (release.wait(), process(batch))
+    
+    for _ in range(5):
+        primary.analyze_batch(TEXTS)
+    
+    release.set()
+    assert shadow.drain(timeout=10)
+    
+    stats = shadow.stats()
+    assert stats['sampled_requests'] == 5
+    assert stats['dropped'] > 0
+    assert stats['scored'] + stats['dropped'] == 5 * len(TEXTS)
+
+def test_sampling_rate():
+    """Tests that roughly sample_rate of the requests are picked"""
+    logger.info("Test: shadow sampling")
+    
+    shadow = ShadowScorer(train_sample_analyzer().active, sample_rate=0.25)
+    picked = sum(shadow.sample() for _ in range(4000))
+    assert 800 < picked < 1200
+
+def test_reloader_follows_registry_shadow(models):
+    """Tests that workers start and stop shadow scoring from the registry"""
+    logger.info("Test: shadow settings in the registry")
+    
+    primary, candidate = models
+    reloader = ModelReloader(primary, interval=60)
+    
+    with pytest.raises(ValueError):
+        primary.registry.set_shadow(candidate.model_version, 1.5)
+    
+    primary.registry.set_shadow(candidate.model_version, 0.5)
+    assert reloader.check_shadow()
+    assert primary.shadow.version == candidate.model_version
+    assert primary.shadow.sample_rate == 0.5
+    assert not reloader.check_shadow()
+    
+    primary.registry.set_shadow(None)
+    assert reloader.check_shadow()
+    assert primary.shadow is None
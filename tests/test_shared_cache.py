@@ -0,0 +1,79 @@
+import multiprocessing
+from services.shared_cache import SharedResultCache
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _write_results(path, worker, count):
+    """Writes results from a separate process"""
+    cache = SharedResultCache(path, maxsize=10000)
+    for i in range(count):
+        cache.set_many('v1', {f'worker{worker} text{i}': ('positive', (0.1, 0.2, 0.7))})
+
+def test_shared_cache_roundtrip(tmp_path):
+    """Tests lookups by model version across cache instances"""
+    logger.info("Test: shared cache roundtrip")
+    
+    path = tmp_path / 'cache.db'
+    writer = SharedResultCache(path, maxsize=100)
+    writer.set_many('v1', {'love product': ('positive', (0.1, 0.2, 0.7))})
+    
+    # A new instance stands for another worker or a restarted one
+    reader = SharedResultCache(path, maxsize=100)
+    assert reader.get_many('v1', ['love product', 'hate']) == {
+        'love product': ('positive', (0.1, 0.2, 0.7))
+    }
+    assert reader.get_many('v2', ['love product']) == {}
+    
+    stats = reader.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['size'] == 1
+
+def test_shared_cache_eviction(tmp_path):
+    """Tests that the oldest rows are evicted beyond maxsize"""
+    logger.info("Test: shared cache eviction")
+    
+    cache = SharedResultCache(tmp_path / 'cache.db', maxsize=5)
+    for i in range(12):
+        cache.set_many('v1', {f'text{i}': ('neutral', (0.3, 0.4, 0.3))})
+    
+    assert cache.stats()['size'] == 5
+    assert set(cache.get_many('v1', [f'text{i}' for i in range(12)])) == {
+        f'text{i}' for i in range(7, 12)
+    }
+
+def test_shared_cache_concurrent_writers(tmp_path):
+    """Tests concurrent writes from several processes"""
+    logger.info("Test: shared cache concurrent writers")
+    
+    path = tmp_path / 'cache.db'
+    SharedResultCache(path, maxsize=10000)
+    
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=_write_results, args=(path, w, 50)) for w in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+    
+    cache = SharedResultCache(path, maxsize=10000)
+    assert cache.stats()['size'] == 150
+    assert cache.stats()['errors'] == 0
+
+def test_analyzer_reads_shared_cache(tmp_path):
+    """Tests that the analyzer uses the shared cache after a local miss"""
+    logger.info("Test: analyzer shared cache")
+    
+    analyzer = train_sample_analyzer()
+    analyzer.shared_cache = SharedResultCache(tmp_path / 'cache.db', maxsize=100)
+    
+    first = analyzer.analyze('I love this product')
+    analyzer.result_cache.clear()
+    second = analyzer.analyze('I love this product')
+    
+    assert second['probabilities'] == first['probabilities']
+    assert analyzer.shared_cache.stats()['hits'] == 1
+    assert analyzer.get_cache_stats()['shared']['size'] == 1
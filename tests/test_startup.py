@@ -0,0 +1,95 @@
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def test_app_import_is_lazy():
+    """Tests that importing the app loads neither nltk nor the training stack"""
+    logger.info("Test: lazy imports")
+    
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import app; "
+        "print(sorted(m for m in ('nltk', 'pandas', 'sklearn', 'scipy', 'services.model_trainer') if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code, str(ROOT)], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    
+    assert output.strip().splitlines()[-1] == '[]'
+
+def test_serving_startup_is_lazy(tmp_path):
+    """Tests that loading a compiled model and stemming unknown words load neither nltk nor sklearn"""
+    logger.info("Test: lazy imports after startup")
+    
+    analyzer = train_sample_analyzer()
+    analyzer.compiled.save(tmp_path / 'sentiment_model')
+    
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); from pathlib import Path; "
+        "from config import MODEL_CONFIG; "
+        "MODEL_CONFIG['registry_path'] = Path(sys.argv[2]) / 'models'; "
+        "MODEL_CONFIG['compiled_path'] = Path(sys.argv[2]) / 'sentiment_model'; "
+        "import app; app.initialize_in_background().join(timeout=60); "
+        "assert app.startup_state['model'] == 'ready', app.startup_state; "
+        "print(app.sentiment_analyzer.analyze('Unheardofly wonderful zorbulations')['sentiment']); "
+        "print(sorted(m for m in ('nltk', 'pandas', 'sklearn', 'scipy', 'services.model_trainer') if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code, str(ROOT), str(tmp_path)], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    
+    assert output.strip().splitlines()[-1] == '[]'
+
+@pytest.fixture
+def app_module(monkeypatch):
+    import app as app_module
+    monkeypatch.setitem(app_module.startup_state, 'model', 'pending')
+    monkeypatch.setitem(app_module.startup_state, 'error', None)
+    monkeypatch.setitem(app_module.startup_state, 'ready_after', None)
+    return app_module
+
+def test_readiness_follows_background_load(app_module, monkeypatch):
+    """Tests that the server is live at once and ready after the model loads"""
+    logger.info("Test: liveness and readiness")
+    
+    analyzer = train_sample_analyzer()
+    monkeypatch.setattr(analyzer, 'load_model', lambda: True)
+    monkeypatch.setattr(app_module, 'sentiment_analyzer', analyzer)
+    client = app_module.create_app().test_client()
+    
+    assert client.get('/health/live').status_code == 200
+    response = client.get('/health/ready')
+    assert response.status_code == 503
+    assert response.get_json()['model_state'] == 'pending'
+    assert client.get('/health').get_json()['status'] == 'starting'
+    
+    app_module.initialize_in_background().join(timeout=60)
+    
+    response = client.get('/health/ready')
+    assert response.status_code == 200
+    assert response.get_json()['ready_after_seconds'] is not None
+    assert client.get('/health').get_json()['status'] == 'healthy'
+
+def test_failed_load_is_not_ready(app_module, monkeypatch):
+    """Tests that a model load error is reported by the health checks"""
+    logger.info("Test: failed model load")
+    
+    def broken_load():
+        raise OSError("artifact is corrupt")
+    
+    monkeypatch.setattr(app_module.sentiment_analyzer, 'load_model', broken_load)
+    client = app_module.create_app().test_client()
+    
+    app_module.initialize_in_background().join(timeout=60)
+    
+    response = client.get('/health/ready')
+    assert response.status_code == 503
+    assert response.get_json()['model_error'] == "artifact is corrupt"
+    assert client.get('/health').status_code == 503
+    assert client.get('/health/live').status_code == 200
@@ -0,0 +1,203 @@
+import random
+import threading
+import numpy as np
+import pytest
+from services.linear_kernel import CompiledModel
+from utils.porter_stemmer import PorterStemmer
+from utils.text_processor import StemCache, text_processor
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+EDGE_CASES = [
+    'I LOVE this product!!! http://t.co/abc #happy @shop',
+    '@foohttp://bar.com still counts',
+    '#awwwesome day at www.example.com/page',
+    '@user/http://x.com/@other and #tag.www',
+    'Hello,world... don\'t STOP me now',
+    'Café naïve résumé İstanbul K',
+    'tabs\tand\nnewlines\x1cand spaces',
+    'numbers 123 and h4x0r w0rds',
+    'http alone and www alone',
+    'ies ties flies dying happily',
+    '😀 emoji only 🎉',
+    '',
+    '   '
+]
+
+PIECES = [
+    'http', 'https://', 'www.', '@', '#', 'love', 'hate', 'great', 'product',
+    'running', 'ies', 'é', '😀', ' ', '  ', '\t', '\n', '.', ',', "'", '-',
+    '_', '1', 'A', 'Z', 'the', 'and', 'x', '/', ':', ' ', 'K'
+]
+
+def build_corpus(size=2000, seed=17):
+    """Edge cases plus random texts mixing URLs, tags, punctuation and unicode"""
+    rng = random.Random(seed)
+    corpus = list(EDGE_CASES)
+    for _ in range(size):
+        corpus.append(''.join(rng.choice(PIECES) for _ in range(rng.randint(1, 25))))
+    return corpus
+
+def test_fused_tokenizer_matches_pipeline():
+    """Tests that the fused tokenizer gives exactly the preprocess() output"""
+    logger.info("Test: fused tokenizer")
+    
+    corpus = build_corpus()
+    for text in corpus:
+        assert text_processor.preprocess_fast(text) == text_processor.preprocess(text), repr(text)
+    
+    logger.info(f"Fused tokenizer identical on {len(corpus)} texts")
+
+def test_fused_rows_match_vectorizer():
+    """Tests that the CSR rows built from words match TfidfVectorizer.transform"""
+    logger.info("Test: fused TF-IDF rows")
+    
+    analyzer = train_sample_analyzer()
+    corpus = build_corpus(size=500) + [
+        'Great quality, highly recommend to everyone',
+        'Terrible quality, very disappointed with purchase'
+    ]
+    
+    indptr, indices, data = analyzer.compiled.transform_words(
+        [text_processor.tokenize_fused(text) for text in corpus]
+    )
+    expected = analyzer.vectorizer.transform(text_processor.preprocess_batch(corpus))
+    expected.sort_indices()
+    
+    assert np.array_equal(indptr, expected.indptr)
+    assert np.array_equal(indices, expected.indices)
+    assert np.allclose(data, expected.data, rtol=0, atol=1e-12)
+    
+    logger.info(f"TF-IDF rows identical on {len(corpus)} texts")
+
+def test_stem_cache_is_bounded_and_counts():
+    """Tests LRU eviction and hit/miss counters of the stem cache"""
+    logger.info("Test: stem cache")
+    
+    stemmer = PorterStemmer()
+    cache = StemCache(stemmer.stem, maxsize=2)
+    
+    assert cache.stem('running') == 'run'
+    assert cache.stem('running') == 'run'
+    cache.stem('flies')
+    cache.stem('happily')
+    
+    stats = cache.stats()
+    assert stats == {'size': 2, 'maxsize': 2, 'hits': 1, 'misses': 3, 'hit_rate': 0.25}
+    
+    cache.stem('running')
+    assert cache.stats()['misses'] == 4
+    
+    words = ['connection', 'connected', 'connecting', 'relational', 'generously'] * 200
+    shared = StemCache(stemmer.stem, maxsize=3)
+    errors = []
+    
+    def stem_all():
+        for word in words:
+            if shared.stem(word) != stemmer.stem(word):
+                errors.append(word)
+    
+    threads = [threading.Thread(target=stem_all) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    stats = shared.stats()
+    assert not errors
+    assert stats['hits'] + stats['misses'] == len(words) * 8
+    assert stats['size'] <= 3
+    
+    logger.info("Stem cache bounded and thread-safe")
+
+def test_stem_table_shipped_with_model(tmp_path):
+    """Tests that training builds the stem table and the compiled model keeps it"""
+    logger.info("Test: precomputed stem table")
+    
+    analyzer = train_sample_analyzer()
+    
+    assert analyzer.stem_table['amazing'] == 'amaz'
+    assert text_processor.stem_table == analyzer.stem_table
+    
+    path = tmp_path / 'model'
+    analyzer.compiled.save(path)
+    assert CompiledModel.load(path).stem_table == analyzer.stem_table
+    
+    misses = text_processor.stem_cache.stats()['misses']
+    text_processor.tokenize_fused('amazing fantastic product')
+    assert text_processor.stem_cache.stats()['misses'] == misses
+    
+    logger.info(f"Stem table with {len(analyzer.stem_table)} words")
+
+
+def test_bundled_stopwords_match_nltk():
+    """Tests that the bundled stopword list is the NLTK corpus one"""
+    logger.info("Test: bundled stopwords")
+    
+    import nltk
+    from nltk.corpus import stopwords
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        pytest.skip("NLTK stopwords corpus not installed")
+    
+    assert text_processor.stop_words == set(stopwords.words('english'))
+
+# Suffixes handled by the steps of the Porter algorithm
+SUFFIXES = [
+    '', 's', 'es', 'ies', 'ied', 'ed', 'ing', 'eed', 'y', 'ly', 'ally', 'alli', 'bli', 'logi',
+    'ational', 'tional', 'enci', 'anci', 'izer', 'ization', 'ation', 'ator', 'alism', 'iveness',
+    'fulness', 'ousness', 'aliti', 'iviti', 'biliti', 'fulli', 'icate', 'ative', 'alize', 'iciti',
+    'ical', 'ful', 'ness', 'al', 'ance', 'ence', 'er', 'ic', 'able', 'ible', 'ant', 'ement', 'ment',
+    'ent', 'sion', 'tion', 'ou', 'ism', 'ate', 'iti', 'ous', 'ive', 'ize', 'e', 'll', 'ying', 'yy'
+]
+
+def test_porter_stemmer_matches_nltk():
+    """Tests that the standalone stemmer gives the stems of nltk's PorterStemmer"""
+    logger.info("Test: standalone Porter stemmer")
+    
+    from nltk.stem import PorterStemmer as NltkPorterStemmer
+    
+    rng = random.Random(5)
+    letters = 'abcdefghijklmnopqrstuvwxyz' + 'aeiouy' * 3
+    words = ['sky', 'skies', 'dying', 'news', 'innings', 'happy', 'enjoy', 'flies', 'dies', 'spied',
+             'died', 'geology', 'hopping', 'filing', 'controll', 'roll', 'Running', 'YYYY', 'by', 'a']
+    words += sorted(text_processor.stop_words)
+    for _ in range(20000):
+        stem = ''.join(rng.choice(letters) for _ in range(rng.randint(1, 9)))
+        words.append(stem + rng.choice(SUFFIXES))
+    
+    stemmer = PorterStemmer()
+    reference = NltkPorterStemmer()
+    mismatches = [word for word in words if stemmer.stem(word) != reference.stem(word)]
+    
+    assert mismatches == []
+    logger.info(f"{len(words)} words stemmed as nltk does")
+
+def test_parallel_preprocessing_is_identical():
+    """Tests that chunked, process-parallel preprocessing matches the serial path byte for byte"""
+    logger.info("Test: parallel preprocessing")
+    
+    corpus = build_corpus(size=3000)
+    expected = [text_processor.preprocess(text) for text in corpus]
+    updates = []
+    
+    processed = text_processor.preprocess_parallel(
+        corpus, workers=3, chunk_size=257,
+        progress=lambda done, total: updates.append((done, total))
+    )
+    
+    assert '\n'.join(processed).encode('utf-8') == '\n'.join(expected).encode('utf-8')
+    assert updates == [(min(done, len(corpus)), len(corpus)) for done in range(257, len(corpus) + 257, 257)]
+    
+    word_lists = text_processor.tokenize_parallel(corpus, workers=2, chunk_size=1000)
+    assert word_lists == [text_processor.tokenize_fused(text) for text in corpus]
+    
+    # A single chunk or worker stays in this process
+    assert text_processor.preprocess_parallel(corpus, workers=1) == expected
+    assert text_processor.preprocess_parallel(corpus[:10], workers=4) == expected[:10]
+    
+    with pytest.raises(ValueError):
+        text_processor.map_parallel('clean_text', corpus)
@@ -0,0 +1,114 @@
+import threading
+import pytest
+from config import MODEL_CONFIG
+from services.model_registry import ModelRegistry
+from services.sentiment_analyzer import SentimentAnalyzer
+from services.training_jobs import TrainingJobManager
+from tests.helpers import train_sample_analyzer
+import logging
+
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def model_paths(tmp_path, monkeypatch):
+    monkeypatch.setitem(MODEL_CONFIG, 'model_path', tmp_path / 'sentiment_model.pkl')
+    monkeypatch.setitem(MODEL_CONFIG, 'compiled_path', tmp_path / 'sentiment_model')
+    monkeypatch.setattr('services.sentiment_analyzer.model_registry', ModelRegistry(tmp_path / 'models'))
+    return tmp_path
+
+def test_job_trains_and_activates(model_paths):
+    """Tests a training job from submission to the hot-swapped model"""
+    logger.info("Test: background training job")
+    
+    analyzer = SentimentAnalyzer()
+    manager = TrainingJobManager(analyzer, model_paths / 'jobs')
+    
+    job = manager.submit(backend='sgd', dataset_path='missing_dataset.csv')
+    assert job['status'] == 'queued'
+    assert manager.get(job['id'])['backend'] == 'sgd'
+    
+    with pytest.raises(RuntimeError, match="already running"):
+        manager.submit(dataset_path='missing_dataset.csv')
+    
+    job = manager.wait(job['id'], timeout=300)
+    
+    assert job['status'] == 'succeeded', job['error']
+    assert job['progress'] == 1.0
+    assert job['metrics']['backend'] == 'sgd'
+    assert 0.0 <= job['metrics']['test_accuracy'] <= 1.0
+    assert analyzer.is_trained
+    assert analyzer.model_version == job['model_version']
+    assert analyzer.registry.active_version() == job['model_version']
+    assert analyzer.registry.get(job['model_version'])['dataset_hash'] == job['metrics']['dataset_hash']
+    assert analyzer.analyze('I love this product')['sentiment'] in analyzer.classes
+    assert manager.list()[0]['id'] == job['id']
+    assert manager.get('../../etc/passwd') is None
+
+def test_one_job_across_processes(model_paths):
+    """Tests that a job started by another server worker blocks new ones until it is activated"""
+    logger.info("Test: training job lock")
+    
+    jobs_dir = model_paths / 'jobs'
+    manager = TrainingJobManager(SentimentAnalyzer(), jobs_dir)
+    other_worker = TrainingJobManager(SentimentAnalyzer(), jobs_dir)
+    
+    job = manager.submit(backend='sgd', dataset_path='missing_dataset.csv')
+    with pytest.raises(RuntimeError, match=f"{job['id']} is already running"):
+        other_worker.submit(dataset_path='missing_dataset.csv')
+    assert manager.wait(job['id'], timeout=300)['status'] == 'succeeded'
+    
+    # Released by the watcher
+    job = other_worker.submit(backend='unknown', dataset_path='missing_dataset.csv')
+    assert other_worker.wait(job['id'], timeout=300)['status'] == 'failed'
+
+def test_failed_job_keeps_current_model(model_paths):
+    """Tests that a failing job leaves the active model in place"""
+    logger.info("Test: failed training job")
+    
+    analyzer = train_sample_analyzer()
+    version = analyzer.model_version
+    manager = TrainingJobManager(analyzer, model_paths / 'jobs')
+    
+    job = manager.wait(manager.submit(backend='unknown', dataset_path='missing_dataset.csv')['id'], timeout=300)
+    
+    assert job['status'] == 'failed'
+    assert 'unknown' in job['error']
+    assert analyzer.model_version == version
+    assert analyzer.registry.active_version() is None
+
+def test_swap_is_atomic_for_requests_in_flight():
+    """Tests that concurrent requests never see a half-swapped model"""
+    logger.info("Test: atomic model swap")
+    
+    analyzer = train_sample_analyzer()
+    replacement = train_sample_analyzer(backend='sgd')
+    texts = ['I love this product', 'Terrible quality', 'It is fine']
+    expected = {
+        version: [result['probabilities'] for result in model.analyze_batch(texts)]
+        for version, model in ((analyzer.model_version, analyzer), (replacement.model_version, replacement))
+    }
+    errors = []
+    stop = threading.Event()
+    
+    def client():
+        while not stop.is_set():
+            try:
+                results = analyzer.analyze_batch(texts)
+                probabilities = [result['probabilities'] for result in results]
+                if not any(probabilities == values for values in expected.values()):
+                    errors.append(probabilities)
+            except Exception as e:
+                errors.append(e)
+    
+    threads = [threading.Thread(target=client) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for _ in range(20):
+        for model in (replacement, analyzer):
+            analyzer.compiled = model.compiled
+            analyzer._model_changed()
+    stop.set()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
@@ -1,3 +1,6 @@
+import pytest
+from controllers.user_controller import UserController
+from models.comment import Comment
 from models.user import User
 from database.db_manager import db_manager
 import logging
@@ -71,4 +74,29 @@ def test_user_operations():
         return False
     
     logger.info("")
-    return True
\ No newline at end of file
+    return True
+def test_user_with_comments_is_not_deleted():
+    """Tests that deleting a user with comments is rejected, not cascaded"""
+    logger.info("Test: delete user with comments")
+    
+    with db_manager.get_connection() as conn:
+        conn.execute("DELETE FROM comments WHERE user_id IN (SELECT id FROM users WHERE email = 'delete@example.org')")
+        conn.execute("DELETE FROM users WHERE email = 'delete@example.org'")
+    
+    user = User.create("Delete Test", "delete@example.org")
+    comment = Comment.create(user.id, "A comment that keeps its author")
+    
+    with pytest.raises(ValueError, match="comments"):
+        User.delete(user.id)
+    assert User.get_by_id(user.id) is not None
+    assert Comment.get_by_id(comment.id) is not None
+    
+    result = UserController.delete_user(user.id)
+    assert not result['success']
+    assert result['error'] == "The user has comments"
+    
+    with db_manager.get_connection() as conn:
+        conn.execute('DELETE FROM comments WHERE id = ?', (comment.id,))
+    assert User.delete(user.id)
+    assert User.get_by_id(user.id) is None
+    assert not User.delete(user.id)
@@ -0,0 +1,53 @@
+import fcntl
+import os
+from pathlib import Path
+
+class FileLock:
+    """
+    Exclusive lock shared by every process using the same file
+    
+    Each acquisition opens its own descriptor and flocks it, so the lock
+    excludes other threads of the process as well as other processes, and
+    the kernel releases it when the holder dies. Not reentrant.
+    """
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self._fd = None
+    
+    def acquire(self, blocking=True):
+        """Takes the lock, False when not blocking and it is held elsewhere"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+    
+    def release(self):
+        """Releases the lock, closing the descriptor drops the flock"""
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
+    
+    def write(self, content):
+        """Replaces the lock file content while holding it"""
+        os.ftruncate(self._fd, 0)
+        os.pwrite(self._fd, content.encode('utf-8'), 0)
+    
+    def read(self):
+        """Content written by the holder, empty when none"""
+        try:
+            return self.path.read_text(encoding='utf-8').strip()
+        except FileNotFoundError:
+            return ''
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,114 @@
+import base64
+import json
+from config import PAGINATION_CONFIG
+
+def encode_cursor(sort_value, row_id):
+    """
+    Encodes the position after a row as an opaque cursor
+    
+    Args:
+        sort_value: Date the listing is ordered by
+        row_id (int): Row id, breaks ties between equal dates
+    
+    Returns:
+        str: URL-safe cursor
+    """
+    raw = json.dumps([sort_value, row_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor created by encode_cursor
+    
+    Returns:
+        tuple: (sort_value, row_id), or None for an empty cursor
+    
+    Raises:
+        ValueError: Malformed cursor
+    """
+    if not cursor:
+        return None
+    
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    
+    if not isinstance(sort_value, str) or not isinstance(row_id, int):
+        raise ValueError("Invalid cursor")
+    return sort_value, row_id
+
+def parse_limit(value):
+    """
+    Validates the page size of a listing request
+    
+    Returns:
+        int: Page size, the default when missing
+    
+    Raises:
+        ValueError: Not an integer or outside 1..max_limit
+    """
+    if value in (None, ''):
+        return PAGINATION_CONFIG['default_limit']
+    
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    
+    if limit < 1 or limit > PAGINATION_CONFIG['max_limit']:
+        raise ValueError(f"limit must be between 1 and {PAGINATION_CONFIG['max_limit']}")
+    return limit
+
+def paginate(rows, limit, cursor_fields):
+    """
+    Trims a limit + 1 query result to one page
+    
+    Args:
+        rows (list): Up to limit + 1 items in listing order
+        limit (int): Page size
+        cursor_fields (callable): Item -> (sort_value, row_id)
+    
+    Returns:
+        tuple: (page items, next cursor or None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    
+    page = rows[:limit]
+    return page, encode_cursor(*cursor_fields(page[-1]))
+
+def keyset_filter(after, date_column, id_column):
+    """
+    SQL condition selecting the rows after a cursor, newest first
+    
+    Args:
+        after (tuple): Decoded cursor, or None for the first page
+        date_column (str): Column the listing is ordered by
+        id_column (str): Row id column
+    
+    Returns:
+        tuple: (condition, params)
+    """
+    if after is None:
+        return '1 = 1', []
+    return f'({date_column}, {id_column}) < (?, ?)', list(after)
+
+def limit_clause(limit):
+    """LIMIT clause and params, empty when listing everything"""
+    if limit is None:
+        return '', []
+    return 'LIMIT ?', [limit]
+
+def parse_page_args(args):
+    """
+    Reads limit and after from request query arguments
+    
+    Returns:
+        tuple: (limit, decoded cursor)
+    
+    Raises:
+        ValueError: Invalid limit or cursor
+    """
+    return parse_limit(args.get('limit')), decode_cursor(args.get('after'))
@@ -0,0 +1,263 @@
+"""
+Standalone Porter stemmer
+
+A port of nltk.stem.porter.PorterStemmer in its default NLTK_EXTENSIONS
+mode (NLTK 3.x, Apache License 2.0), so that stemming words missing from
+the stem table does not import nltk, which pulls in scipy, sklearn and
+pandas. It must keep giving the same stems as NLTK: the stem tables and
+vocabularies of the trained models were built with it.
+
+    Porter, M. "An algorithm for suffix stripping."
+    Program 14.3 (1980): 130-137.
+"""
+
+VOWELS = frozenset('aeiou')
+
+# Irregular forms of the NLTK extensions, word -> stem
+IRREGULAR_FORMS = {
+    'sky': ['sky', 'skies'],
+    'die': ['dying'],
+    'lie': ['lying'],
+    'tie': ['tying'],
+    'news': ['news'],
+    'inning': ['innings', 'inning'],
+    'outing': ['outings', 'outing'],
+    'canning': ['cannings', 'canning'],
+    'howe': ['howe'],
+    'proceed': ['proceed'],
+    'exceed': ['exceed'],
+    'succeed': ['succeed']
+}
+
+class PorterStemmer:
+    """Porter stemmer with the NLTK extensions, same stems as nltk's default"""
+    
+    def __init__(self):
+        self.pool = {
+            form: stem
+            for stem, forms in IRREGULAR_FORMS.items()
+            for form in forms
+        }
+        
+        positive = self._has_positive_measure
+        self._step2_rules = [
+            ('ational', 'ate', positive),
+            ('tional', 'tion', positive),
+            ('enci', 'ence', positive),
+            ('anci', 'ance', positive),
+            ('izer', 'ize', positive),
+            ('bli', 'ble', positive),
+            ('alli', 'al', positive),
+            ('entli', 'ent', positive),
+            ('eli', 'e', positive),
+            ('ousli', 'ous', positive),
+            ('ization', 'ize', positive),
+            ('ation', 'ate', positive),
+            ('ator', 'ate', positive),
+            ('alism', 'al', positive),
+            ('iveness', 'ive', positive),
+            ('fulness', 'ful', positive),
+            ('ousness', 'ous', positive),
+            ('aliti', 'al', positive),
+            ('iviti', 'ive', positive),
+            ('biliti', 'ble', positive),
+            ('fulli', 'ful', positive)
+        ]
+        self._step3_rules = [
+            ('icate', 'ic', positive),
+            ('ative', '', positive),
+            ('alize', 'al', positive),
+            ('iciti', 'ic', positive),
+            ('ical', 'ic', positive),
+            ('ful', '', positive),
+            ('ness', '', positive)
+        ]
+        
+        def measure_gt_1(stem):
+            return self._measure(stem) > 1
+        
+        self._step4_rules = [
+            ('al', '', measure_gt_1),
+            ('ance', '', measure_gt_1),
+            ('ence', '', measure_gt_1),
+            ('er', '', measure_gt_1),
+            ('ic', '', measure_gt_1),
+            ('able', '', measure_gt_1),
+            ('ible', '', measure_gt_1),
+            ('ant', '', measure_gt_1),
+            ('ement', '', measure_gt_1),
+            ('ment', '', measure_gt_1),
+            ('ent', '', measure_gt_1),
+            ('ion', '', lambda stem: self._measure(stem) > 1 and stem[-1] in ('s', 't')),
+            ('ou', '', measure_gt_1),
+            ('ism', '', measure_gt_1),
+            ('ate', '', measure_gt_1),
+            ('iti', '', measure_gt_1),
+            ('ous', '', measure_gt_1),
+            ('ive', '', measure_gt_1),
+            ('ize', '', measure_gt_1)
+        ]
+    
+    def _is_consonant(self, word, i):
+        """Whether word[i] is a consonant: not a vowel, nor a y after a consonant"""
+        if word[i] in VOWELS:
+            return False
+        if word[i] == 'y':
+            # Resolves a run of y's iteratively
+            negate = False
+            while i > 0 and word[i] == 'y':
+                negate = not negate
+                i -= 1
+            return (word[i] not in VOWELS) != negate
+        return True
+    
+    def _consonant_flags(self, word):
+        """_is_consonant of every position in one pass"""
+        flags = []
+        for i, char in enumerate(word):
+            if char in VOWELS:
+                flags.append(False)
+            elif char == 'y':
+                flags.append(True if i == 0 else not flags[i - 1])
+            else:
+                flags.append(True)
+        return flags
+    
+    def _measure(self, stem):
+        """Number of vowel-consonant sequences, m in [C](VC){m}[V]"""
+        return ''.join('c' if flag else 'v' for flag in self._consonant_flags(stem)).count('vc')
+    
+    def _has_positive_measure(self, stem):
+        return self._measure(stem) > 0
+    
+    def _contains_vowel(self, stem):
+        return not all(self._consonant_flags(stem))
+    
+    def _ends_double_consonant(self, word):
+        """Condition *d: the word ends with a double consonant"""
+        return len(word) >= 2 and word[-1] == word[-2] and self._is_consonant(word, len(word) - 1)
+    
+    def _ends_cvc(self, word):
+        """Condition *o: consonant-vowel-consonant ending, the last not w, x or y"""
+        return (
+            len(word) >= 3
+            and self._is_consonant(word, len(word) - 3)
+            and not self._is_consonant(word, len(word) - 2)
+            and self._is_consonant(word, len(word) - 1)
+            and word[-1] not in ('w', 'x', 'y')
+        ) or (
+            len(word) == 2
+            and not self._is_consonant(word, 0)
+            and self._is_consonant(word, 1)
+        )
+    
+    def _apply_rule_list(self, word, rules):
+        """
+        Applies the first rule whose suffix matches the word
+        
+        Rules are (suffix, replacement, condition) with condition None
+        for unconditional rules. Once a suffix matches, no other rule is
+        tried even if the condition fails. The '*d' suffix matches a
+        double consonant ending.
+        """
+        for suffix, replacement, condition in rules:
+            if suffix == '*d' and self._ends_double_consonant(word):
+                stem = word[:-2]
+            elif word.endswith(suffix):
+                stem = word[:len(word) - len(suffix)]
+            else:
+                continue
+            if condition is None or condition(stem):
+                return stem + replacement
+            return word
+        return word
+    
+    def _step1a(self, word):
+        # 'flies' -> 'fli' but 'dies' -> 'die'
+        if word.endswith('ies') and len(word) == 4:
+            return word[:-3] + 'ie'
+        
+        return self._apply_rule_list(word, [
+            ('sses', 'ss', None),
+            ('ies', 'i', None),
+            ('ss', 'ss', None),
+            ('s', '', None)
+        ])
+    
+    def _step1b(self, word):
+        # 'spied' -> 'spi' but 'died' -> 'die'
+        if word.endswith('ied'):
+            return word[:-3] + ('ie' if len(word) == 4 else 'i')
+        
+        if word.endswith('eed'):
+            stem = word[:-3]
+            return stem + 'ee' if self._measure(stem) > 0 else word
+        
+        for suffix in ('ed', 'ing'):
+            if word.endswith(suffix):
+                stem = word[:-len(suffix)]
+                if self._contains_vowel(stem):
+                    break
+        else:
+            return word
+        
+        return self._apply_rule_list(stem, [
+            ('at', 'ate', None),
+            ('bl', 'ble', None),
+            ('iz', 'ize', None),
+            ('*d', stem[-1], lambda _: stem[-1] not in ('l', 's', 'z')),
+            ('', 'e', lambda stem: self._measure(stem) == 1 and self._ends_cvc(stem))
+        ])
+    
+    def _step1c(self, word):
+        # y -> i after a consonant, unless the stem is that single consonant
+        return self._apply_rule_list(word, [
+            ('y', 'i', lambda stem: len(stem) > 1 and self._is_consonant(stem, len(stem) - 1))
+        ])
+    
+    def _step2(self, word):
+        # alli -> al is tried first, and the result goes through step 2 again
+        if word.endswith('alli') and self._has_positive_measure(word[:-4]):
+            return self._step2(word[:-4] + 'al')
+        
+        # The l of logi stays with the stem, so 'geology' works like 'philology'
+        rules = self._step2_rules + [('logi', 'log', lambda _: self._has_positive_measure(word[:-3]))]
+        return self._apply_rule_list(word, rules)
+    
+    def _step3(self, word):
+        return self._apply_rule_list(word, self._step3_rules)
+    
+    def _step4(self, word):
+        return self._apply_rule_list(word, self._step4_rules)
+    
+    def _step5a(self, word):
+        # Both conditions are tried, unlike _apply_rule_list
+        if word.endswith('e'):
+            stem = word[:-1]
+            measure = self._measure(stem)
+            if measure > 1 or (measure == 1 and not self._ends_cvc(stem)):
+                return stem
+        return word
+    
+    def _step5b(self, word):
+        return self._apply_rule_list(word, [('ll', 'l', lambda _: self._measure(word[:-1]) > 1)])
+    
+    def stem(self, word):
+        """Returns the stem of a word, lowercased"""
+        stem = word.lower()
+        if stem in self.pool:
+            return self.pool[stem]
+        
+        # Words of one or two letters are not stemmed
+        if len(word) <= 2:
+            return stem
+        
+        stem = self._step1a(stem)
+        stem = self._step1b(stem)
+        stem = self._step1c(stem)
+        stem = self._step2(stem)
+        stem = self._step3(stem)
+        stem = self._step4(stem)
+        stem = self._step5a(stem)
+        stem = self._step5b(stem)
+        return stem
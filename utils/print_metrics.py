@@ -9,6 +9,18 @@ def print_metrics(metrics):
     print(f"   Training:  {metrics['train_accuracy']:.2%}")
     print(f"   Testing:   {metrics['test_accuracy']:.2%}")
     
+    # Calibration
+    if 'test_brier' in metrics:
+        print(f"\n🎯 CALIBRATION ({metrics['calibration']}):")
+        print(f"   Brier score: {metrics['test_brier']:.4f}")
+        print(f"   ECE:         {metrics['test_ece']:.4f}")
+    
+    # Model
+    if 'backend' in metrics:
+        print(f"\n⚙️  MODEL:")
+        print(f"   Backend:  {metrics['backend']}")
+        print(f"   Fit time: {metrics['fit_seconds']:.2f}s")
+    
     # Samples
     print(f"\n📈 DATASET:")
     print(f"   Training samples: {metrics['train_samples']}")
@@ -33,7 +45,8 @@ def print_metrics(metrics):
     cm = np.array(metrics['confusion_matrix'])
     
     # Header
-    print(f"{'Actual \\ Pred':<15}", end="")
+    header = 'Actual \\ Pred'
+    print(f"{header:<15}", end="")
     for cls in metrics['classes']:
         print(f"{cls:<12}", end="")
     print()
@@ -46,4 +59,22 @@ def print_metrics(metrics):
             print(f"{cm[i][j]:<12}", end="")
         print()
     
+    print("="*70 + "\n")
+
+def print_backend_comparison(results):
+    """Prints the training time comparison between backends."""
+    print("\n" + "="*70)
+    print(" "*23 + "BACKEND COMPARISON")
+    print("="*70)
+    
+    print(f"{'Backend':<15} {'Fit (s)':<12} {'Predict (s)':<14} {'Accuracy':<12} {'Samples':<10}")
+    print("-"*70)
+    
+    for result in results:
+        print(
+            f"{result['backend']:<15} {result['fit_seconds']:<12.3f} "
+            f"{result['predict_seconds']:<14.4f} {result['test_accuracy']:<12.2%} "
+            f"{result['train_samples']:<10}"
+        )
+    
     print("="*70 + "\n")
\ No newline at end of file
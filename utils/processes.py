@@ -0,0 +1,12 @@
+import multiprocessing
+
+# Imported once by the forkserver, so the workers it forks start warm
+FORKSERVER_PRELOAD = ['utils.text_processor']
+
+def pool_context():
+    """forkserver where available: fork is unsafe in a threaded server"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(FORKSERVER_PRELOAD)
+        return context
+    return multiprocessing.get_context('spawn')
@@ -1,20 +1,108 @@
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import PorterStemmer
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
 from config import NLP_CONFIG
+from utils.porter_stemmer import PorterStemmer
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
+# URLs, tags and hashtags removed in a single regex pass
+NOISE_PATTERN = re.compile(r'http\S+|www\S+|https\S+|@\w+|#\w+')
+
+# A tag or hashtag containing a URL start is cleaned differently when the
+# URL pass runs first, those texts use the sequential passes instead
+NESTED_NOISE_PATTERN = re.compile(r'[@#]\w*(?:http|www)')
+
+NON_LETTER_PATTERN = re.compile(r'[^a-zA-Z\s]')
+
+# Deletes every ASCII character that is not a letter or whitespace
+ASCII_NON_LETTERS = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128)
+    if not chr(c).isalpha() and not chr(c).isspace()
+))
+
+# Stopword lists shipped with the code, copied from the NLTK corpus
+STOPWORDS_DIR = Path(__file__).parent / 'stopwords'
+
+# Per-text methods that map_parallel can run on worker processes
+PARALLEL_METHODS = ('preprocess', 'preprocess_fast', 'tokenize_fused')
+
+def load_stopwords(language):
+    """
+    Loads the stopword list of a language
+    
+    The bundled list is used when there is one, so startup never needs
+    the NLTK corpus or the network. Other languages fall back to an
+    installed NLTK corpus.
+    """
+    bundled = STOPWORDS_DIR / f'{language}.txt'
+    if bundled.exists():
+        return set(bundled.read_text(encoding='utf-8').split())
+    
+    from nltk.corpus import stopwords
+    return set(stopwords.words(language))
+
+class StemCache:
+    """Bounded, thread-safe LRU memo of stems with hit/miss counters"""
+    
+    def __init__(self, stem_function, maxsize):
+        self._stem_function = stem_function
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def stem(self, word):
+        """Returns the cached stem of a word, stemming it on a miss"""
+        with self._lock:
+            stem = self._entries.get(word)
+            if stem is not None:
+                self._entries.move_to_end(word)
+                self.hits += 1
+                return stem
+            self.misses += 1
+        
+        stem = self._stem_function(word)
+        
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[word] = stem
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return stem
+    
+    def clear(self):
+        """Removes every cached stem and resets the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self):
+        """Returns size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
 
 class TextProcessor:
     """Class for text preprocessing"""
     
     def __init__(self):
+        # Standalone port of nltk's stemmer, importing nltk takes about 2s
         self.stemmer = PorterStemmer()
-        self.stop_words = set(stopwords.words(NLP_CONFIG['language']))
+        self.stop_words = load_stopwords(NLP_CONFIG['language'])
+        # Precomputed surface form -> stem table shipped with the model
+        self.stem_table = {}
+        self.stem_cache = StemCache(self._stem_word, NLP_CONFIG['stem_cache_size'])
+    
+    def _stem_word(self, word):
+        return self.stemmer.stem(word)
     
     def clean_text(self, text):
         """Cleans text from unnecessary characters"""
@@ -43,9 +131,46 @@ class TextProcessor:
         """Remove empty words (stopwords)"""
         return [word for word in words if word not in self.stop_words and len(word) > 2]
     
+    def stem(self, word):
+        """Stems a word: stem table first, then the memo cache"""
+        return self.stem_table.get(word) or self.stem_cache.stem(word)
+    
     def stem_words(self, words):
         """Applies stemming for words"""
-        return [self.stemmer.stem(word) for word in words]
+        return [self.stem(word) for word in words]
+    
+    def set_stem_table(self, stem_table):
+        """Replaces the precomputed stem table"""
+        self.stem_table = dict(stem_table or {})
+    
+    def build_stem_table(self, texts, max_size=None):
+        """
+        Builds the surface form -> stem table of a corpus
+        
+        Args:
+            texts (iterable): Raw texts
+            max_size (int): Keep only the most frequent words
+        
+        Returns:
+            dict: Word to stem
+        """
+        if max_size is None:
+            max_size = NLP_CONFIG['stem_table_size']
+        
+        counts = Counter()
+        for text in texts:
+            counts.update(self._filtered_words(text))
+        
+        return {
+            word: self.stemmer.stem(word)
+            for word, _ in counts.most_common(max_size)
+        }
+    
+    def stem_stats(self):
+        """Returns stem table size and memo cache counters"""
+        stats = self.stem_cache.stats()
+        stats['table_size'] = len(self.stem_table)
+        return stats
     
     def preprocess(self, text):
         """Complete preprocessing pipeline"""
@@ -64,9 +189,121 @@ class TextProcessor:
         # Return processed text
         return ' '.join(words)
     
+    def tokenize_fused(self, text):
+        """
+        Fused fast path: cleans, tokenizes, filters and stems in one pass
+        
+        Produces the same words as preprocess(text).split() without the
+        intermediate passes and joined string.
+        """
+        table_get = self.stem_table.get
+        cache_stem = self.stem_cache.stem
+        return [
+            table_get(word) or cache_stem(word)
+            for word in self._filtered_words(text)
+        ]
+    
+    def _filtered_words(self, text):
+        """Cleaned words without stopwords and short words, not stemmed"""
+        text = text.lower()
+        
+        if NESTED_NOISE_PATTERN.search(text):
+            text = re.sub(r'http\S+|www\S+|https\S+', '', text)
+            text = re.sub(r'@\w+|#\w+', '', text)
+        else:
+            text = NOISE_PATTERN.sub('', text)
+        
+        if text.isascii():
+            text = text.translate(ASCII_NON_LETTERS)
+        else:
+            text = NON_LETTER_PATTERN.sub('', text)
+        
+        stop_words = self.stop_words
+        return [
+            word
+            for word in text.split()
+            if len(word) > 2 and word not in stop_words
+        ]
+    
+    def preprocess_fast(self, text):
+        """Same output as preprocess() using the fused tokenizer"""
+        return ' '.join(self.tokenize_fused(text))
+    
     def preprocess_batch(self, texts):
         """Preprocess multiple texts"""
         return [self.preprocess(text) for text in texts]
+    
+    def map_parallel(self, method, texts, workers=None, chunk_size=None, progress=None):
+        """
+        Runs a per-text method over many texts on worker processes
+        
+        Texts are split into chunks of chunk_size, each worker gets this
+        processor's stem table once, and results come back in input
+        order, identical to calling the method on each text in this
+        process. Inputs of a single chunk, or a single worker, are
+        processed here without starting any process.
+        
+        Args:
+            method (str): One of PARALLEL_METHODS
+            texts (iterable): Raw texts
+            workers (int): Processes, NLP_CONFIG['preprocess_workers'] by default
+            chunk_size (int): Texts per task, NLP_CONFIG['preprocess_chunk_size'] by default
+            progress (callable): Called with (texts done, total) after each chunk
+        
+        Returns:
+            list: One result per text
+        """
+        if method not in PARALLEL_METHODS:
+            raise ValueError(f"Unknown preprocessing method: {method}")
+        
+        texts = list(texts)
+        workers = workers or NLP_CONFIG['preprocess_workers']
+        chunk_size = chunk_size or NLP_CONFIG['preprocess_chunk_size']
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        workers = min(workers, len(chunks))
+        
+        results = []
+        if workers <= 1:
+            function = getattr(self, method)
+            for chunk in chunks:
+                results.extend(function(text) for text in chunk)
+                if progress is not None:
+                    progress(len(results), len(texts))
+            return results
+        
+        from concurrent.futures import ProcessPoolExecutor
+        from utils.processes import pool_context
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=pool_context(),
+            initializer=_init_worker,
+            initargs=(self.stem_table,)
+        ) as executor:
+            # map yields in submission order whatever the completion order
+            for chunk_results in executor.map(_process_chunk, [method] * len(chunks), chunks):
+                results.extend(chunk_results)
+                if progress is not None:
+                    progress(len(results), len(texts))
+        
+        return results
+    
+    def preprocess_parallel(self, texts, workers=None, chunk_size=None, progress=None):
+        """preprocess() of many texts on worker processes, see map_parallel"""
+        return self.map_parallel('preprocess', texts, workers, chunk_size, progress)
+    
+    def tokenize_parallel(self, texts, workers=None, chunk_size=None, progress=None):
+        """tokenize_fused() of many texts on worker processes, see map_parallel"""
+        return self.map_parallel('tokenize_fused', texts, workers, chunk_size, progress)
+
+def _init_worker(stem_table):
+    """Gives a preprocessing worker process the parent's stem table"""
+    text_processor.set_stem_table(stem_table)
+
+def _process_chunk(method, texts):
+    """Runs a TextProcessor method over a chunk in a worker process"""
+    function = getattr(text_processor, method)
+    return [function(text) for text in texts]
 
 # Global instance
 text_processor = TextProcessor()
\ No newline at end of file
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+from config import TRENDS_CONFIG
+
+# Formats accepted for the from/to parameters
+DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M', '%Y-%m-%d')
+
+BUCKET_SECONDS = {
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400
+}
+
+def parse_date(value):
+    """
+    Parses a UTC date parameter
+    
+    Raises:
+        ValueError: Unknown format
+    """
+    value = value.strip().rstrip('Z')
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {value}, expected YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS")
+
+def parse_trend_args(args, now=None):
+    """
+    Reads bucket, from and to from request query arguments
+    
+    Missing dates default to the last TRENDS_CONFIG['default_buckets']
+    buckets. Comment dates are stored in UTC, so are the bounds.
+    
+    Returns:
+        tuple: (bucket, start, end) with the dates as 'YYYY-MM-DD HH:MM:SS'
+    
+    Raises:
+        ValueError: Unknown bucket, invalid date or too many buckets
+    """
+    bucket = args.get('bucket', 'hour')
+    if bucket not in BUCKET_SECONDS:
+        raise ValueError(f"bucket must be one of: {', '.join(BUCKET_SECONDS)}")
+    
+    step = timedelta(seconds=BUCKET_SECONDS[bucket])
+    
+    if args.get('to'):
+        end = parse_date(args['to'])
+    else:
+        end = (now or datetime.now(timezone.utc)).replace(tzinfo=None, microsecond=0)
+    
+    if args.get('from'):
+        start = parse_date(args['from'])
+    else:
+        start = end - step * TRENDS_CONFIG['default_buckets']
+    
+    if start > end:
+        raise ValueError("from must be before to")
+    
+    if (end - start) / step > TRENDS_CONFIG['max_buckets']:
+        raise ValueError(f"{TRENDS_CONFIG['max_buckets']} {bucket} buckets maximum per request")
+    
+    return bucket, start.strftime('%Y-%m-%d %H:%M:%S'), end.strftime('%Y-%m-%d %H:%M:%S')
@@ -29,6 +29,27 @@ def validate_text_length(text):
 
     return True, "Valid text length"
 
+def parse_user_id(value):
+    """
+    Normalizes a user id sent in a JSON body
+    
+    Integers, integral floats and decimal strings are accepted, so 1, 1.0
+    and "01" are the same user.
+    
+    Returns:
+        int
+    
+    Raises:
+        ValueError: Not an integral value
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().isdecimal():
+        return int(value.strip())
+    raise ValueError("user_id must be an integer")
+
 def validate_name(name):
     """Validates username"""
     if not name or not isinstance(name, str):